@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Solveur A* avec bases de motifs additives pour la Tour de Hanoï à plusieurs bâtonnets
+Résout optimalement depuis n'importe quel état, quel que soit le nombre de bâtonnets
+"""
+
+import heapq
+from array import array
+from itertools import count
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from distance_table import DistanceTable, expand_codes
+from state_space import CANCEL_CHECK_INTERVAL, SearchCancelled, StateSpace
+from stats import SolverStats
+
+# Nombre maximal d'états d'une base de motifs (4^12 : 16 Mio à un octet par entrée)
+MAX_PATTERN_STATES = 1 << 24
+
+# Bases déjà chargées dans ce processus
+_databases: Dict[Tuple[int, int], "PatternDatabase"] = {}
+
+
+def build_last_move_table(table: DistanceTable) -> np.ndarray:
+    """
+    Construit la table du dernier coup d'un disque plus grand que ceux de la table
+    
+    Quand ce grand disque quitte pour la dernière fois le bâtonnet n_rods - 2 vers le
+    dernier, les petits disques sont tous sur les n_rods - 2 premiers bâtonnets.
+    L'entrée d'un état S est le minimum, sur ces configurations C, de
+    distance(S, C) + distance(C, tour finale) : un BFS arrière partant de toutes
+    les configurations C à la fois, chacune entrant au niveau de sa distance.
+    
+    Args:
+        table: Table des distances des petits disques vers le dernier bâtonnet
+    
+    Returns:
+        Tableau uint8 (uint16 au-delà de 254 coups) indexé par code d'état
+    """
+    n_disks, n_rods = table.space.n_disks, table.space.n_rods
+    distances = np.asarray(table.distances)
+    
+    # Codes des configurations dont tous les disques sont sur les n_rods - 2 premiers bâtonnets
+    sources = np.zeros(1, dtype=np.int64)
+    for disk_idx in range(n_disks):
+        digits = np.arange(n_rods - 2, dtype=np.int64) * n_rods ** disk_idx
+        sources = (sources[:, None] + digits[None, :]).ravel()
+    entry = distances[sources].astype(np.int64)
+    order = np.argsort(entry, kind="stable")
+    sources, entry = sources[order], entry[order]
+    bounds = np.searchsorted(entry, np.arange(int(entry[-1]) + 2))
+    
+    unseen = np.iinfo(np.uint32).max
+    last_move = np.full(table.space.size, unseen, dtype=np.uint32)
+    frontier = np.empty(0, dtype=np.int64)
+    level = int(entry[0])
+    while frontier.size or level <= entry[-1]:
+        reached = [expand_codes(frontier, n_disks, n_rods)]
+        if level <= entry[-1]:
+            reached.append(sources[bounds[level]:bounds[level + 1]])
+        reached = np.concatenate(reached)
+        frontier = np.unique(reached[last_move[reached] == unseen])
+        last_move[frontier] = level
+        level += 1
+    return last_move.astype(np.uint8 if level <= np.iinfo(np.uint8).max else np.uint16)
+
+
+def _goal_labels(n_rods: int, goal_rod: int) -> List[int]:
+    # Symétrie : les bases visent le dernier bâtonnet
+    labels = list(range(n_rods))
+    labels[goal_rod], labels[-1] = labels[-1], labels[goal_rod]
+    return labels
+
+
+def _to_array(values: np.ndarray) -> array:
+    """Copie un tableau NumPy (ou projeté) dans un tableau à accès rapide"""
+    values = np.asarray(values)
+    typecode = "B" if values.dtype == np.uint8 else "H"
+    return array(typecode, values.astype(np.dtype(typecode)).tobytes())
+
+
+class PatternDatabase:
+    """
+    Distances exactes pour une tour de n_disks disques vers le dernier bâtonnet
+    
+    C'est la table des distances (distance_table.py) de la tour, indexée par code
+    d'état. Pour un autre bâtonnet d'arrivée, on échange par symétrie ce bâtonnet
+    et le dernier (voir labels) : une seule table sert pour toutes les arrivées.
+    La base garde aussi la table du dernier coup (voir build_last_move_table).
+    """
+    
+    def __init__(self, n_disks: int, n_rods: int, distances: Sequence[int], last_move: Sequence[int]):
+        self.n_disks = n_disks
+        self.n_rods = n_rods
+        self.distances = distances
+        self.last_move = last_move
+    
+    def labels(self, goal_rod: int) -> List[int]:
+        """Renumérotation des bâtonnets qui envoie goal_rod sur le dernier (et inversement)"""
+        return _goal_labels(self.n_rods, goal_rod)
+    
+    def lookup(self, digits: Sequence[int], goal_rod: int) -> int:
+        """
+        Distance d'un motif vers goal_rod
+        
+        Args:
+            digits: Bâtonnet de chaque disque du motif, du plus petit au plus grand
+            goal_rod: Bâtonnet d'arrivée (0-indexé)
+        """
+        labels = self.labels(goal_rod)
+        code = 0
+        for rod in reversed(digits):
+            code = code * self.n_rods + labels[rod]
+        return self.distances[code]
+
+
+def get_pattern_database(n_disks: int, n_rods: int, cache_dir: Optional[Path] = None) -> PatternDatabase:
+    """
+    Retourne la base de motifs, depuis la mémoire, le disque ou en la construisant
+    
+    La base est la table des distances vers le dernier bâtonnet : elle est
+    construite par le BFS vectorisé de DistanceTable et partage son fichier.
+    La table du dernier coup est enregistrée à côté (last_move_{n}x{k}.npy).
+    
+    Args:
+        n_disks: Nombre de disques du motif
+        n_rods: Nombre de bâtonnets
+        cache_dir: Répertoire des bases (voir cache_dir.default_cache_dir)
+    """
+    key = (n_disks, n_rods)
+    if key in _databases:
+        return _databases[key]
+    
+    goal_rod = n_rods - 1
+    path = DistanceTable.default_path(n_disks, n_rods, goal_rod, cache_dir)
+    table = _load_or_build(path, n_disks, n_rods, lambda: DistanceTable.build(n_disks, n_rods, goal_rod))
+    # Même format que les tables des distances : seul le sens des entrées change
+    last_move_path = path.with_name(f"last_move_{n_disks}x{n_rods}.npy")
+    last_move = _load_or_build(last_move_path, n_disks, n_rods, lambda: DistanceTable(
+        build_last_move_table(table), n_disks, n_rods, goal_rod))
+    
+    database = PatternDatabase(n_disks, n_rods, _to_array(table.distances), _to_array(last_move.distances))
+    _databases[key] = database
+    return database
+
+
+def _load_or_build(path: Path, n_disks: int, n_rods: int, build) -> DistanceTable:
+    """Relit une table enregistrée, ou la construit avec build() puis l'enregistre"""
+    try:
+        return DistanceTable.load(path, n_disks, n_rods)
+    except (OSError, ValueError):
+        table = build()
+        try:
+            table.save(path)
+        except OSError as e:
+            print(f"Impossible d'enregistrer la base de motifs: {e}")
+        return table
+
+
+def _group_size(n_disks: int, n_rods: int) -> int:
+    """Nombre maximal de disques d'un groupe (n_rods^g <= MAX_PATTERN_STATES)"""
+    group_size = 1
+    while group_size < n_disks and n_rods ** (group_size + 1) <= MAX_PATTERN_STATES:
+        group_size += 1
+    return group_size
+
+
+def default_partitions(n_disks: int, n_rods: int) -> List[List[List[int]]]:
+    """
+    Découpe les disques en groupes pour les bases de motifs additives
+    
+    Les groupes ont au plus g disques (n_rods^g <= MAX_PATTERN_STATES). La première
+    partition donne un groupe complet aux plus grands disques, la seconde répartit
+    les disques en groupes équilibrés ; l'heuristique prend le maximum.
+    
+    Returns:
+        Partitions, chacune formée de groupes de numéros de disques consécutifs
+    """
+    group_size = _group_size(n_disks, n_rods)
+    
+    large_first = []
+    high = n_disks
+    while high > 0:
+        low = max(high - group_size, 0)
+        large_first.append(list(range(low + 1, high + 1)))
+        high = low
+    
+    # Autant de groupes, de tailles égales à un disque près (les plus grands en premier)
+    n_groups = len(large_first)
+    balanced = []
+    high = n_disks
+    for index in range(n_groups):
+        size = n_disks // n_groups + (index < n_disks % n_groups)
+        balanced.append(list(range(high - size + 1, high + 1)))
+        high -= size
+    
+    if balanced == large_first:
+        return [large_first]
+    return [large_first, balanced]
+
+
+class AStarSolver:
+    """
+    Recherche A* guidée par des bases de motifs additives
+    
+    Chaque mouvement ne déplace qu'un disque, donc qu'un groupe : la somme des
+    distances des groupes d'une partition (chacun résolu en ignorant les autres)
+    est admissible, tout comme le maximum sur plusieurs partitions.
+    
+    S'y ajoute la borne du dernier coup du plus grand disque L hors de l'arrivée :
+    L quitte une dernière fois un bâtonnet a, les plus petits disques étant alors
+    hors de a et de l'arrivée, d'où au moins 1 + min sur a de la somme, par groupe
+    de petits disques, des entrées de la table du dernier coup. Les disques plus
+    grands que L, déjà en place, ne bougent pas dans une solution optimale.
+    
+    Le maximum de ces bornes est admissible mais pas toujours cohérent : un état
+    atteint par un chemin plus court est réexaminé, et A* reste optimal.
+    """
+    
+    def __init__(self, n_disks: int, n_rods: int, partitions: Optional[List[List[List[int]]]] = None,
+                 cache_dir: Optional[Path] = None):
+        self.space = StateSpace(n_disks, n_rods)
+        self.partitions = partitions if partitions is not None else default_partitions(n_disks, n_rods)
+        self.group_size = _group_size(n_disks, n_rods)
+        self.cache_dir = cache_dir
+        # Groupes des disques plus petits que le plus grand disque hors de l'arrivée, par disque
+        self._last_move_layouts: Dict[int, Tuple[list, list]] = {}
+        
+        # Pour chaque partition : (premier disque, dernier disque + 1, distances) par groupe,
+        # et pour chaque disque (indice de son groupe, poids de son chiffre dans le code du groupe)
+        self._groups = []
+        self._place_of_disk = []
+        for partition in self.partitions:
+            groups = [(group[0] - 1, group[-1], get_pattern_database(len(group), n_rods, cache_dir).distances)
+                      for group in partition]
+            place_of_disk = [(0, 0)] * n_disks
+            for index, (low, high, _) in enumerate(groups):
+                for disk_idx in range(low, high):
+                    place_of_disk[disk_idx] = (index, n_rods ** (disk_idx - low))
+            self._groups.append(groups)
+            self._place_of_disk.append(place_of_disk)
+    
+    def _digits(self, code: int) -> List[int]:
+        n_rods = self.space.n_rods
+        digits = []
+        for _ in range(self.space.n_disks):
+            code, rod = divmod(code, n_rods)
+            digits.append(rod)
+        return digits
+    
+    def _group_codes(self, digits: List[int], labels: List[int]) -> List[List[int]]:
+        """Code de chaque groupe de chaque partition, bâtonnets renumérotés par labels"""
+        n_rods = self.space.n_rods
+        codes = []
+        for groups in self._groups:
+            partition_codes = []
+            for low, high, _ in groups:
+                code = 0
+                for disk_idx in range(high - 1, low - 1, -1):
+                    code = code * n_rods + labels[digits[disk_idx]]
+                partition_codes.append(code)
+            codes.append(partition_codes)
+        return codes
+    
+    def _rod_maps(self, goal_rod: int) -> List[List[int]]:
+        """
+        Renumérotations des bâtonnets pour la table du dernier coup
+        
+        Une par bâtonnet a (autre que goal_rod) d'où part le dernier coup du grand
+        disque : a devient l'avant-dernier bâtonnet et goal_rod le dernier.
+        """
+        n_rods = self.space.n_rods
+        rod_maps = []
+        for rod in range(n_rods):
+            if rod == goal_rod:
+                continue
+            rod_map = [0] * n_rods
+            others = [other for other in range(n_rods) if other not in (rod, goal_rod)]
+            for label, other in enumerate(others):
+                rod_map[other] = label
+            rod_map[rod] = n_rods - 2
+            rod_map[goal_rod] = n_rods - 1
+            rod_maps.append(rod_map)
+        return rod_maps
+    
+    def _last_move_layout(self, largest: int) -> Tuple[list, list]:
+        """Groupes (comme _groups) des disques plus petits que largest, et place de chaque disque"""
+        if largest not in self._last_move_layouts:
+            n_rods = self.space.n_rods
+            groups = []
+            place_of_disk = [(0, 0)] * largest
+            high = largest
+            while high > 0:
+                low = max(high - self.group_size, 0)
+                for disk_idx in range(low, high):
+                    place_of_disk[disk_idx] = (len(groups), n_rods ** (disk_idx - low))
+                groups.append((low, high, get_pattern_database(high - low, n_rods, self.cache_dir).last_move))
+                high = low
+            self._last_move_layouts[largest] = (groups, place_of_disk)
+        return self._last_move_layouts[largest]
+    
+    def _last_move_codes(self, digits: List[int], goal_rod: int,
+                         rod_maps: List[List[int]]) -> Tuple[int, List[List[int]]]:
+        """
+        Plus grand disque hors de goal_rod et codes de ses groupes de petits disques
+        
+        Returns:
+            (indice du disque, -1 si l'état est final ; codes des groupes pour chaque renumérotation)
+        """
+        largest = len(digits) - 1
+        while largest >= 0 and digits[largest] == goal_rod:
+            largest -= 1
+        if largest < 0:
+            return largest, []
+        
+        n_rods = self.space.n_rods
+        groups, _ = self._last_move_layout(largest)
+        codes = []
+        for rod_map in rod_maps:
+            map_codes = []
+            for low, high, _ in groups:
+                code = 0
+                for disk_idx in range(high - 1, low - 1, -1):
+                    code = code * n_rods + rod_map[digits[disk_idx]]
+                map_codes.append(code)
+            codes.append(map_codes)
+        return largest, codes
+    
+    def _last_move_bound(self, largest: int, codes: List[List[int]]) -> int:
+        """Borne du dernier coup à partir du résultat de _last_move_codes"""
+        if largest < 0:
+            return 0
+        groups, _ = self._last_move_layout(largest)
+        return 1 + min(sum(last_move[group_code] for (_, _, last_move), group_code in zip(groups, map_codes))
+                       for map_codes in codes)
+    
+    def heuristic(self, code: int, goal_rod: int) -> int:
+        """Borne inférieure du nombre de mouvements restants"""
+        digits = self._digits(code)
+        codes = self._group_codes(digits, _goal_labels(self.space.n_rods, goal_rod))
+        bound = self._last_move_bound(*self._last_move_codes(digits, goal_rod, self._rod_maps(goal_rod)))
+        return max(bound, max(sum(distances[group_code]
+                                  for (_, _, distances), group_code in zip(groups, partition_codes))
+                              for groups, partition_codes in zip(self._groups, codes)))
+    
+    def solve(self, rods: List[List[int]], goal_rod: Optional[int] = None, cancel=None,
+              stats: Optional[SolverStats] = None) -> List[str]:
+        """
+        Calcule une solution optimale depuis un état quelconque
+        
+        Args:
+            rods: Disques de chaque bâtonnet, du bas vers le haut
+            goal_rod: Bâtonnet d'arrivée (0-indexé, le dernier par défaut)
+            cancel: threading.Event optionnel ; la recherche lève SearchCancelled quand il est activé
+            stats: Statistiques à compléter (états développés, taille maximale du tas, visités)
+        
+        Returns:
+            Liste des mouvements au format "source->destination"
+        """
+        space = self.space
+        n_rods = space.n_rods
+        powers = space.powers
+        if goal_rod is None:
+            goal_rod = n_rods - 1
+        labels = _goal_labels(self.space.n_rods, goal_rod)
+        rod_maps = self._rod_maps(goal_rod)
+        start = space.encode(rods)
+        goal = space.goal_code(goal_rod)
+        partitions = list(zip(self._groups, self._place_of_disk))
+        
+        best_cost = {start: 0}
+        parents: Dict[int, Tuple[int, int, int]] = {}
+        tie = count()
+        # (f, -g, ordre d'insertion, g, code) : à f égal, on préfère les nœuds les plus profonds
+        heap = [(self.heuristic(start, goal_rod), 0, next(tie), 0, start)]
+        
+        expanded = 0
+        peak_frontier = 1
+        path = []
+        while heap:
+            if len(heap) > peak_frontier:
+                peak_frontier = len(heap)
+            _, _, _, cost, code = heapq.heappop(heap)
+            if code == goal:
+                path = self._path(start, goal, parents)
+                break
+            if cost > best_cost[code]:
+                continue
+            
+            expanded += 1
+            if cancel is not None and expanded % CANCEL_CHECK_INTERVAL == 0 and cancel.is_set():
+                raise SearchCancelled()
+            
+            digits = self._digits(code)
+            codes = self._group_codes(digits, labels)
+            values = [[distances[group_code] for (_, _, distances), group_code in zip(groups, partition_codes)]
+                      for groups, partition_codes in zip(self._groups, codes)]
+            sums = [sum(partition_values) for partition_values in values]
+            
+            largest, last_codes = self._last_move_codes(digits, goal_rod, rod_maps)
+            last_groups, last_place = self._last_move_layout(largest)
+            last_values = [[last_move[group_code] for (_, _, last_move), group_code in zip(last_groups, map_codes)]
+                           for map_codes in last_codes]
+            last_sums = [sum(map_values) for map_values in last_values]
+            
+            masks = space.rod_masks(code)
+            tops = [mask & -mask for mask in masks]
+            next_cost = cost + 1
+            for from_rod, top in enumerate(tops):
+                if not top:
+                    continue
+                disk_idx = top.bit_length() - 1
+                for to_rod, other in enumerate(tops):
+                    if to_rod == from_rod or (other and other < top):
+                        continue
+                    next_code = code + (to_rod - from_rod) * powers[disk_idx]
+                    if next_cost >= best_cost.get(next_code, next_cost + 1):
+                        continue
+                    best_cost[next_code] = next_cost
+                    parents[next_code] = (code, from_rod, to_rod)
+                    
+                    # Seul le groupe du disque déplacé change dans chaque partition :
+                    # son code varie du poids du disque fois l'écart des bâtonnets renumérotés
+                    shift = labels[to_rod] - labels[from_rod]
+                    h = 0
+                    for (groups, place_of_disk), partition_codes, partition_values, total in zip(
+                            partitions, codes, values, sums):
+                        index, weight = place_of_disk[disk_idx]
+                        distances = groups[index][2]
+                        value = (total - partition_values[index]
+                                 + distances[partition_codes[index] + shift * weight])
+                        if value > h:
+                            h = value
+                    
+                    # Borne du dernier coup : même mise à jour tant que le plus grand disque
+                    # hors de l'arrivée reste le même, recalcul sinon
+                    if disk_idx < largest:
+                        index, weight = last_place[disk_idx]
+                        last_move = last_groups[index][2]
+                        value = 1 + min(
+                            total - map_values[index]
+                            + last_move[map_codes[index] + (rod_map[to_rod] - rod_map[from_rod]) * weight]
+                            for rod_map, map_codes, map_values, total in zip(rod_maps, last_codes, last_values,
+                                                                             last_sums))
+                    else:
+                        digits[disk_idx] = to_rod
+                        value = self._last_move_bound(*self._last_move_codes(digits, goal_rod, rod_maps))
+                        digits[disk_idx] = from_rod
+                    if value > h:
+                        h = value
+                    
+                    heapq.heappush(heap, (next_cost + h, -next_cost, next(tie), next_cost, next_code))
+        
+        if stats is not None:
+            stats.states_expanded += expanded
+            stats.visited += len(best_cost)
+            stats.peak_frontier = max(stats.peak_frontier, peak_frontier)
+            stats.moves_generated += len(path)
+        # Liste vide si aucune solution trouvée (ne devrait pas arriver)
+        return path
+    
+    @staticmethod
+    def _path(start: int, goal: int, parents: Dict[int, Tuple[int, int, int]]) -> List[str]:
+        moves = []
+        code = goal
+        while code != start:
+            code, from_rod, to_rod = parents[code]
+            moves.append(f"{from_rod + 1}->{to_rod + 1}")
+        moves.reverse()
+        return moves
+
+
+def astar_solve(rods: List[List[int]], goal_rod: Optional[int] = None,
+                cache_dir: Optional[Path] = None, cancel=None, stats: Optional[SolverStats] = None) -> List[str]:
+    """
+    Résout optimalement depuis un état quelconque avec A* et des bases de motifs additives
+    
+    Args:
+        rods: Disques de chaque bâtonnet, du bas vers le haut
+        goal_rod: Bâtonnet d'arrivée (0-indexé, le dernier par défaut)
+        cache_dir: Répertoire des bases de motifs
+        cancel: threading.Event optionnel ; la recherche lève SearchCancelled quand il est activé
+        stats: Statistiques à compléter (voir AStarSolver.solve)
+    
+    Returns:
+        Liste des mouvements au format "source->destination"
+    """
+    n_disks = sum(len(rod) for rod in rods)
+    return AStarSolver(n_disks, len(rods), cache_dir=cache_dir).solve(rods, goal_rod, cancel, stats)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Résolution de nombreuses configurations en parallèle
+Les configurations sont lues (une par ligne), dédoublonnées puis réparties sur
+un ProcessPoolExecutor ; chaque résumé est transmis dès qu'il est prêt
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from output import open_output, write_moves
+from solve import calculate_min_moves, iter_solution_pairs, parse_input
+
+Config = Tuple[int, int]
+Summary = Dict[str, Union[str, int, float, bool, None]]
+
+# Extension des fichiers de sortie selon le format
+EXTENSIONS = {"text": "txt", "csv": "csv", "jsonl": "jsonl", "binary": "bin"}
+
+
+def read_configs(lines: Iterable[str]) -> Tuple[List[Config], List[str], int]:
+    """
+    Lit des configurations "n_disks,n_rods", une par ligne
+    
+    Les lignes vides et les commentaires (#) sont ignorés.
+    
+    Returns:
+        Configurations uniques dans l'ordre de première apparition, erreurs de
+        lecture, et nombre de doublons retirés
+    """
+    configs: List[Config] = []
+    seen = set()
+    errors = []
+    duplicates = 0
+    for line_number, line in enumerate(lines, 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        try:
+            config = parse_input(line)
+        except ValueError as e:
+            errors.append(f"ligne {line_number}: {e}")
+            continue
+        if config in seen:
+            duplicates += 1
+            continue
+        seen.add(config)
+        configs.append(config)
+    return configs, errors, duplicates
+
+
+def output_file(output_dir: Union[str, Path], n_disks: int, n_rods: int, fmt: str = "text") -> Path:
+    """Chemin du fichier de mouvements d'une configuration"""
+    return Path(output_dir) / f"hanoi_{n_disks}x{n_rods}.{EXTENSIONS[fmt]}"
+
+
+def count_solution_moves(n_disks: int, n_rods: int) -> int:
+    """
+    Génère la solution sans l'écrire et compte ses mouvements
+    
+    Les mouvements sont produits par blocs NumPy (voir numpy_backend), ou un par
+    un quand NumPy est absent.
+    """
+    try:
+        from numpy_backend import iter_solution_chunks
+    except ImportError:
+        return sum(1 for _ in iter_solution_pairs(n_disks, n_rods))
+    return sum(sources.size for sources, _ in iter_solution_chunks(n_disks, n_rods))
+
+
+def solve_config(config: Config, output_dir: Optional[str] = None, fmt: str = "text") -> Summary:
+    """
+    Résout une configuration et retourne son résumé (exécuté dans un processus du pool)
+    
+    Sans répertoire de sortie, la solution est tout de même générée (sans être
+    écrite) : ses mouvements sont comptés et comparés à calculate_min_moves.
+    
+    Args:
+        config: (n_disks, n_rods)
+        output_dir: Répertoire des fichiers de mouvements (aucun fichier si None)
+        fmt: Format des fichiers (voir output.FORMATS)
+    
+    Returns:
+        Résumé : nombre de mouvements, optimalité, durée, fichier écrit
+    """
+    n_disks, n_rods = config
+    path = None
+    start = time.perf_counter()
+    min_moves = calculate_min_moves(n_disks, n_rods)
+    if output_dir is None:
+        n_moves = count_solution_moves(n_disks, n_rods)
+    else:
+        path = output_file(output_dir, n_disks, n_rods, fmt)
+        with open_output(str(path)) as stream:
+            n_moves = write_moves(stream, iter_solution_pairs(n_disks, n_rods), n_rods, fmt, min_moves)
+    elapsed = time.perf_counter() - start
+    
+    return {
+        "config": f"{n_disks},{n_rods}",
+        "n_disks": n_disks,
+        "n_rods": n_rods,
+        "moves": n_moves,
+        "min_moves": min_moves,
+        "optimal": n_moves == min_moves,
+        "time": elapsed,
+        "output": str(path) if path is not None else None,
+        "error": None,
+    }
+
+
+def error_summary(config: Config, error: BaseException) -> Summary:
+    """Résumé d'une configuration dont la résolution a échoué"""
+    return {
+        "config": f"{config[0]},{config[1]}",
+        "n_disks": config[0],
+        "n_rods": config[1],
+        "moves": None,
+        "min_moves": None,
+        "optimal": False,
+        "time": None,
+        "output": None,
+        "error": str(error) or type(error).__name__,
+    }
+
+
+def run_batch(configs: List[Config], jobs: Optional[int] = None, output_dir: Optional[str] = None,
+              fmt: str = "text") -> Iterator[Summary]:
+    """
+    Résout les configurations en parallèle et génère les résumés dans l'ordre d'achèvement
+    
+    Args:
+        configs: Configurations (déjà dédoublonnées, voir read_configs)
+        jobs: Nombre de processus (nombre de processeurs par défaut, 1 = sans pool)
+        output_dir: Répertoire des fichiers de mouvements (créé si besoin)
+        fmt: Format des fichiers de mouvements
+    """
+    if output_dir is not None:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    # Une configuration en échec donne un résumé d'erreur, sans interrompre les autres
+    if jobs == 1 or len(configs) <= 1:
+        for config in configs:
+            try:
+                yield solve_config(config, output_dir, fmt)
+            except Exception as e:
+                yield error_summary(config, e)
+        return
+    
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(solve_config, config, output_dir, fmt): config for config in configs}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield error_summary(futures[future], e)
+
+
+def format_summary(summary: Summary) -> str:
+    """Résumé lisible d'une configuration sur une ligne"""
+    if summary["error"] is not None:
+        return f"{summary['config']}: échec ({summary['error']})"
+    status = "optimal" if summary["optimal"] else f"minimum {summary['min_moves']}"
+    line = f"{summary['config']}: {summary['moves']} mouvements ({status}) en {summary['time'] * 1000:.1f} ms"
+    if summary["output"]:
+        line += f" -> {summary['output']}"
+    return line
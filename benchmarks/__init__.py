@@ -0,0 +1,6 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks de la Tour de Hanoï
+Usage : python -m benchmarks run [-o resultats.json] puis
+        python -m benchmarks compare reference.json resultats.json --threshold 0.10
+"""
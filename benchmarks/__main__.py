@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Ligne de commande de la suite de benchmarks
+    python -m benchmarks list
+    python -m benchmarks run [-o FICHIER] [-k MOTIF] [--repeat N] [--min-time S]
+    python -m benchmarks compare REFERENCE NOUVEAU [--threshold 0.10]
+"""
+
+import argparse
+import sys
+
+from benchmarks import runner
+from benchmarks import suite  # noqa: F401  (enregistre les benchmarks)
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmarks de la Tour de Hanoï")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    commands.add_parser("list", help="Liste les benchmarks")
+    
+    run_parser = commands.add_parser("run", help="Exécute les benchmarks")
+    run_parser.add_argument("-o", "--output", help="Fichier JSON des résultats")
+    run_parser.add_argument("-k", "--filter", action="append",
+                            help="Motif des benchmarks à exécuter (ex: 'bfs*'), répétable")
+    run_parser.add_argument("--repeat", type=int, default=runner.DEFAULT_REPEAT, help="Échantillons par benchmark")
+    run_parser.add_argument("--min-time", type=float, default=runner.MIN_SAMPLE_TIME,
+                            help="Durée minimale d'un échantillon (s)")
+    
+    compare_parser = commands.add_parser("compare", help="Compare deux fichiers de résultats")
+    compare_parser.add_argument("base", help="Résultats de référence")
+    compare_parser.add_argument("new", help="Nouveaux résultats")
+    compare_parser.add_argument("--threshold", type=float, default=runner.DEFAULT_THRESHOLD,
+                                help="Ralentissement toléré (0.10 = 10 %%)")
+    
+    args = parser.parse_args()
+    
+    if args.command == "list":
+        for bench in runner.BENCHMARKS:
+            print(bench.name)
+    
+    elif args.command == "run":
+        results = runner.run(args.filter, args.repeat, args.min_time)
+        if args.output:
+            runner.save(results, args.output)
+            print(f"\nRésultats enregistrés: {args.output}")
+    
+    else:
+        rows, regressions = runner.compare(runner.load(args.base), runner.load(args.new), args.threshold)
+        for name, base, new, ratio in rows:
+            flag = "  RÉGRESSION" if name in regressions else ""
+            print(f"{name:<45} {runner.format_time(base):>10} -> {runner.format_time(new):>10}  "
+                  f"x{ratio:.2f}{flag}")
+        if regressions:
+            print(f"\n{len(regressions)} régression(s) au-delà de {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"\nAucune régression au-delà de {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
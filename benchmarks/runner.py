@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Mesure, enregistrement et comparaison des benchmarks
+Chaque benchmark est calibré (nombre de boucles par échantillon), puis répété ;
+les résultats sont enregistrés en JSON pour servir de référence
+"""
+
+import fnmatch
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Durée minimale d'un échantillon (en secondes), atteinte en doublant le nombre de boucles
+MIN_SAMPLE_TIME = 0.1
+
+# Nombre d'échantillons par benchmark
+DEFAULT_REPEAT = 5
+
+# Écart relatif (médiane) au-delà duquel compare signale une régression
+DEFAULT_THRESHOLD = 0.10
+
+
+class SkipBenchmark(Exception):
+    """Levée par la préparation d'un benchmark qui ne peut pas tourner ici (pas d'affichage...)"""
+
+
+class Benchmark:
+    """
+    Benchmark enregistré
+    
+    setup() prépare les données et retourne la fonction mesurée (sans argument) ;
+    elle peut lever SkipBenchmark.
+    """
+    
+    def __init__(self, name: str, setup: Callable[[], Callable[[], object]]):
+        self.name = name
+        self.setup = setup
+
+
+# Benchmarks enregistrés, dans l'ordre de déclaration
+BENCHMARKS: List[Benchmark] = []
+
+
+def register(name: str, setup: Callable[[], Callable[[], object]]) -> None:
+    """Enregistre un benchmark (voir Benchmark)"""
+    BENCHMARKS.append(Benchmark(name, setup))
+
+
+def time_callable(func: Callable[[], object], repeat: int = DEFAULT_REPEAT,
+                  min_time: float = MIN_SAMPLE_TIME) -> Dict[str, object]:
+    """
+    Mesure le temps d'un appel de func
+    
+    Args:
+        func: Fonction mesurée
+        repeat: Nombre d'échantillons
+        min_time: Durée minimale d'un échantillon
+    
+    Returns:
+        Boucles par échantillon, temps par appel de chaque échantillon et statistiques
+    """
+    # Calibration : doubler le nombre de boucles jusqu'à dépasser min_time
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+    
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops)
+    
+    return {
+        "loops": loops,
+        "samples": samples,
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(patterns: Optional[List[str]] = None, repeat: int = DEFAULT_REPEAT,
+        min_time: float = MIN_SAMPLE_TIME, verbose: bool = True) -> Dict[str, object]:
+    """
+    Exécute les benchmarks enregistrés
+    
+    Args:
+        patterns: Motifs fnmatch des noms à exécuter (tous par défaut)
+        repeat: Nombre d'échantillons par benchmark
+        min_time: Durée minimale d'un échantillon
+        verbose: Afficher chaque résultat
+    
+    Returns:
+        Résultats (métadonnées, benchmarks mesurés, benchmarks ignorés)
+    """
+    results = {
+        "metadata": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "commit": _git_commit(),
+            "repeat": repeat,
+            "min_time": min_time,
+        },
+        "benchmarks": {},
+        "skipped": {},
+    }
+    
+    for bench in BENCHMARKS:
+        if patterns and not any(fnmatch.fnmatch(bench.name, pattern) for pattern in patterns):
+            continue
+        try:
+            func = bench.setup()
+        except SkipBenchmark as e:
+            results["skipped"][bench.name] = str(e)
+            if verbose:
+                print(f"{bench.name:<45} ignoré ({e})")
+            continue
+        
+        result = time_callable(func, repeat, min_time)
+        results["benchmarks"][bench.name] = result
+        if verbose:
+            print(f"{bench.name:<45} {format_time(result['median']):>10} "
+                  f"± {format_time(result['stdev']):>9}  ({result['loops']} boucles)")
+    
+    return results
+
+
+def format_time(seconds: float) -> str:
+    """Formate une durée avec l'unité adaptée"""
+    for unit, factor in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= factor:
+            return f"{seconds / factor:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def save(results: Dict[str, object], path: Path) -> None:
+    """Enregistre les résultats en JSON"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+
+def load(path: Path) -> Dict[str, object]:
+    """Relit des résultats enregistrés par save"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(base: Dict[str, object], new: Dict[str, object],
+            threshold: float = DEFAULT_THRESHOLD) -> Tuple[List[Tuple[str, float, float, float]], List[str]]:
+    """
+    Compare deux jeux de résultats sur la médiane des benchmarks communs
+    
+    Args:
+        base: Résultats de référence
+        new: Nouveaux résultats
+        threshold: Ralentissement relatif toléré (0.10 = 10 %)
+    
+    Returns:
+        Lignes (nom, médiane de référence, nouvelle médiane, rapport) et noms des régressions
+    """
+    rows = []
+    regressions = []
+    for name, result in new["benchmarks"].items():
+        reference = base["benchmarks"].get(name)
+        if reference is None:
+            continue
+        ratio = result["median"] / reference["median"]
+        rows.append((name, reference["median"], result["median"], ratio))
+        if ratio > 1.0 + threshold:
+            regressions.append(name)
+    return rows, regressions
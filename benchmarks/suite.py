@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmarks des chemins critiques : génération de la solution, nombre minimal
+de mouvements, recherche depuis un état quelconque et affichage Tk
+"""
+
+import contextlib
+import os
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.runner import SkipBenchmark, register
+from engine import HanoiEngine
+from solve import calculate_min_moves, solve_hanoi
+from state_space import StateSpace
+
+# Graine des états aléatoires : les mêmes états d'une exécution à l'autre
+SEED = 12345
+
+# Racine du dépôt (scripts lancés par les benchmarks de démarrage)
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _solve_list(n_disks: int, n_rods: int):
+    def setup():
+        return lambda: solve_hanoi(n_disks, n_rods, verbose=False)
+    return setup
+
+
+def _solve_verbose(n_disks: int):
+    def setup():
+        # Le coût mesuré est celui des print() ; la sortie part dans /dev/null
+        def func():
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                solve_hanoi(n_disks, 3, verbose=True)
+        return func
+    return setup
+
+
+def _solve_packed(n_disks: int):
+    def setup():
+        return lambda: solve_hanoi(n_disks, 3, verbose=False, mode="packed")
+    return setup
+
+
+def _solve_numpy(n_disks: int, mode: str):
+    def setup():
+        try:
+            import numpy  # noqa: F401
+        except ImportError as e:
+            raise SkipBenchmark(f"NumPy indisponible: {e}")
+        return lambda: solve_hanoi(n_disks, 3, verbose=False, mode=mode, backend="numpy")
+    return setup
+
+
+def _min_moves(n_disks: int, n_rods: int):
+    def setup():
+        return lambda: calculate_min_moves(n_disks, n_rods)
+    return setup
+
+
+def _bfs_random_states(n_disks: int, n_states: int = 5):
+    """HanoiEngine.solve_from_current_state_bfs depuis des états aléatoires"""
+    def setup():
+        engine = HanoiEngine(n_disks, 3)
+        space = StateSpace(n_disks, 3)
+        rng = random.Random(SEED)
+        states = [space.decode(rng.randrange(space.size)) for _ in range(n_states)]
+        
+        def func():
+            for state in states:
+                engine.set_state(state)
+                engine.solve_from_current_state_bfs()
+        return func
+    return setup
+
+
+def _startup(*args: str):
+    """Durée d'un lancement complet de l'interpréteur (imports compris), comme depuis un script shell"""
+    def setup():
+        command = [sys.executable, *args]
+        return lambda: subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+    return setup
+
+
+_tk_root = None
+
+
+def _get_tk_root():
+    """Fenêtre Tk cachée partagée par les benchmarks d'affichage"""
+    global _tk_root
+    if _tk_root is None:
+        try:
+            import tkinter as tk
+            _tk_root = tk.Tk()
+        except ImportError as e:
+            raise SkipBenchmark(f"Tk indisponible: {e}")
+        except Exception as e:  # tk.TclError : pas d'affichage
+            raise SkipBenchmark(f"pas d'affichage: {e}")
+        _tk_root.withdraw()
+    return _tk_root
+
+
+def _update_display(n_disks: int, rebuild: bool):
+    """Coût de HanoiGame.update_display après un mouvement (ou d'un dessin complet) sous Tk"""
+    def setup():
+        root = _get_tk_root()
+        from graphics import HanoiGame
+        for child in root.winfo_children():
+            child.destroy()
+        
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            game = HanoiGame(root)
+            game.disk_var.set(str(n_disks))
+            game.new_game()
+        
+        def func():
+            # Le petit disque fait l'aller-retour entre les bâtonnets 1 et 2
+            game.engine.move_disk(0, 1) or game.engine.move_disk(1, 0)
+            if rebuild:
+                game.renderer.build(game.rods)
+            game.update_display()
+            root.update_idletasks()
+        return func
+    return setup
+
+
+for n in (10, 16, 20):
+    register(f"solve_hanoi[n={n},rods=3]", _solve_list(n, 3))
+for n in (10, 16):
+    register(f"solve_hanoi[n={n},rods=4]", _solve_list(n, 4))
+for n in (10, 14):
+    register(f"solve_hanoi_verbose[n={n}]", _solve_verbose(n))
+for n in (20, 24):
+    register(f"solve_hanoi_packed[n={n}]", _solve_packed(n))
+register("solve_hanoi_numpy[n=20]", _solve_numpy(20, "list"))
+register("solve_hanoi_numpy_packed[n=20]", _solve_numpy(20, "packed"))
+
+for n, k in ((20, 3), (64, 3), (20, 4), (100, 5)):
+    register(f"calculate_min_moves[n={n},rods={k}]", _min_moves(n, k))
+
+for n in (8, 10):
+    register(f"bfs_random_state[n={n}]", _bfs_random_states(n))
+
+register("startup[python -c pass]", _startup("-c", "pass"))
+register("startup[main.py --count-only]", _startup("main.py", "8,3", "--count-only"))
+register("startup[main.py 3,3]", _startup("main.py", "3,3"))
+register("startup[import engine]", _startup("-c", "import engine"))
+
+for n in (8, 16):
+    register(f"update_display[n={n}]", _update_display(n, rebuild=False))
+    register(f"update_display_rebuild[n={n}]", _update_display(n, rebuild=True))
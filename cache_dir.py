@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Emplacement des fichiers de cache sur disque (tables de distances, bases de motifs, solutions)
+"""
+
+import os
+from pathlib import Path
+
+
+def default_cache_dir() -> Path:
+    """
+    Retourne le répertoire de cache par défaut
+    
+    La variable d'environnement HANOI_CACHE_DIR a priorité sur ~/.cache/hanoi-tower.
+    """
+    path = os.environ.get("HANOI_CACHE_DIR")
+    if path:
+        return Path(path)
+    return Path.home() / ".cache" / "hanoi-tower"
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Table des distances à l'état final pour tous les états d'une configuration (n_disks, n_rods)
+Construite par un BFS arrière vectorisé avec NumPy, puis enregistrée sur disque
+et relue par np.memmap sans coût de chargement
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cache_dir import default_cache_dir
+from solve import parse_input
+from state_space import StateSpace
+
+# Nombre maximal d'états pour lequel une table est construite (4^13, 3^16 ≈ 43M...)
+MAX_TABLE_STATES = 1 << 26
+
+# Nombre d'états de la frontière traités à la fois pendant la construction
+CHUNK_SIZE = 1 << 18
+
+# Un niveau qui atteint plus d'un état sur DENSE_LEVEL_SHARE est dédoublonné par un balayage de la table
+DENSE_LEVEL_SHARE = 32
+
+# Tables déjà ouvertes dans ce processus
+_open_tables: Dict[Tuple[int, int, int], "DistanceTable"] = {}
+
+
+def expand_codes(codes: np.ndarray, n_disks: int, n_rods: int) -> np.ndarray:
+    """
+    Calcule les codes de tous les états voisins d'un lot de codes (avec répétitions)
+    
+    Les mouvements étant réversibles, ce sont aussi les prédécesseurs.
+    
+    Args:
+        codes: Tableau int64 de codes d'état
+        n_disks: Nombre de disques
+        n_rods: Nombre de bâtonnets
+    
+    Returns:
+        Tableau int64 des codes voisins
+    """
+    powers = n_rods ** np.arange(n_disks, dtype=np.int64)
+    
+    # Disque du dessus de chaque bâtonnet (indice 0-based), n_disks si le bâtonnet est vide :
+    # on parcourt les disques du plus grand au plus petit, le dernier écrit est le sommet
+    tops = np.full(codes.size * n_rods, n_disks, dtype=np.int64)
+    rows = np.arange(codes.size, dtype=np.int64) * n_rods
+    for disk in range(n_disks - 1, -1, -1):
+        tops[rows + (codes // powers[disk]) % n_rods] = disk
+    tops = tops.reshape(codes.size, n_rods)
+    
+    neighbours = []
+    for from_rod in range(n_rods):
+        for to_rod in range(n_rods):
+            if from_rod == to_rod:
+                continue
+            # Un bâtonnet source vide a pour sommet n_disks et ne passe donc jamais le test
+            valid = tops[:, from_rod] < tops[:, to_rod]
+            disks = tops[valid, from_rod]
+            neighbours.append(codes[valid] + (to_rod - from_rod) * powers[disks])
+    return np.concatenate(neighbours) if neighbours else np.empty(0, dtype=np.int64)
+
+
+def _smallest_dtype(max_value: int) -> np.dtype:
+    for dtype in (np.uint8, np.uint16):
+        if max_value < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint32)
+
+
+class DistanceTable:
+    """
+    Distances à l'état final indexées par code d'état (voir StateSpace)
+    
+    Le tableau peut être en mémoire (après construction) ou projeté depuis un
+    fichier .npy avec np.memmap ; les lectures coûtent alors un accès disque paresseux.
+    """
+    
+    def __init__(self, distances: np.ndarray, n_disks: int, n_rods: int, goal_rod: int):
+        self.distances = distances
+        self.space = StateSpace(n_disks, n_rods)
+        self.goal_rod = goal_rod
+    
+    @classmethod
+    def build(cls, n_disks: int, n_rods: int = 3, goal_rod: Optional[int] = None) -> "DistanceTable":
+        """
+        Construit la table par un BFS arrière depuis l'état final, niveau par niveau
+        
+        Args:
+            n_disks: Nombre de disques
+            n_rods: Nombre de bâtonnets
+            goal_rod: Bâtonnet d'arrivée (0-indexé, le dernier par défaut)
+        """
+        space = StateSpace(n_disks, n_rods)
+        if goal_rod is None:
+            goal_rod = n_rods - 1
+        if space.size > MAX_TABLE_STATES:
+            raise ValueError(f"Table trop grande ({space.size} états, maximum {MAX_TABLE_STATES})")
+        
+        unseen = np.iinfo(np.uint32).max
+        distances = np.full(space.size, unseen, dtype=np.uint32)
+        goal = space.goal_code(goal_rod)
+        distances[goal] = 0
+        
+        frontier = np.array([goal], dtype=np.int64)
+        level = 0
+        while frontier.size:
+            level += 1
+            reached = []
+            for start in range(0, frontier.size, CHUNK_SIZE):
+                neighbours = expand_codes(frontier[start:start + CHUNK_SIZE], n_disks, n_rods)
+                neighbours = neighbours[distances[neighbours] == unseen]
+                distances[neighbours] = level
+                reached.append(neighbours)
+            reached = np.concatenate(reached)
+            # La frontière suivante vient des états atteints à ce niveau (dédoublonnés par tri) ;
+            # un balayage de la table n'est moins cher que pour un niveau très large
+            if reached.size * DENSE_LEVEL_SHARE >= space.size:
+                frontier = np.flatnonzero(distances == level)
+            else:
+                frontier = np.unique(reached)
+        
+        distances = distances.astype(_smallest_dtype(level - 1))
+        return cls(distances, n_disks, n_rods, goal_rod)
+    
+    @staticmethod
+    def default_path(n_disks: int, n_rods: int, goal_rod: int, cache_dir: Optional[Path] = None) -> Path:
+        """Chemin du fichier de table dans le répertoire de cache"""
+        directory = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        return directory / f"distances_{n_disks}x{n_rods}_goal{goal_rod + 1}.npy"
+    
+    def save(self, path: Path) -> None:
+        """Enregistre la table au format .npy (écriture atomique)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(self.distances))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    @classmethod
+    def load(cls, path: Path, n_disks: int, n_rods: int, goal_rod: Optional[int] = None) -> "DistanceTable":
+        """Ouvre une table enregistrée, projetée en mémoire (np.memmap)"""
+        if goal_rod is None:
+            goal_rod = n_rods - 1
+        distances = np.load(path, mmap_mode="r")
+        if distances.shape != (n_rods ** n_disks,):
+            raise ValueError(f"Table {path} incompatible avec {n_disks} disques et {n_rods} bâtonnets")
+        return cls(distances, n_disks, n_rods, goal_rod)
+    
+    def distance_code(self, code: int) -> int:
+        """Distance à l'état final depuis un code d'état"""
+        return int(self.distances[code])
+    
+    def distance(self, rods: List[List[int]]) -> int:
+        """Distance à l'état final depuis une liste de bâtonnets"""
+        return int(self.distances[self.space.encode(rods)])
+    
+    def best_move(self, rods: List[List[int]]) -> Optional[str]:
+        """
+        Retourne un coup qui rapproche de l'état final, ou None si l'état est final
+        
+        Returns:
+            Mouvement au format "source->destination" (bâtonnets numérotés à partir de 1)
+        """
+        code = self.space.encode(rods)
+        current = self.distances[code]
+        if current == 0:
+            return None
+        for next_code, from_rod, to_rod in self.space.successors(code):
+            if self.distances[next_code] < current:
+                return f"{from_rod + 1}->{to_rod + 1}"
+        return None
+
+
+def get_distance_table(n_disks: int, n_rods: int = 3, goal_rod: Optional[int] = None,
+                       cache_dir: Optional[Path] = None, build: bool = True) -> Optional[DistanceTable]:
+    """
+    Retourne la table des distances, depuis la mémoire, le disque ou en la construisant
+    
+    Args:
+        n_disks: Nombre de disques
+        n_rods: Nombre de bâtonnets
+        goal_rod: Bâtonnet d'arrivée (0-indexé, le dernier par défaut)
+        cache_dir: Répertoire des tables (voir cache_dir.default_cache_dir)
+        build: Si False, retourne None quand la table n'existe pas encore
+    
+    Returns:
+        Table projetée en mémoire depuis son fichier
+    """
+    if goal_rod is None:
+        goal_rod = n_rods - 1
+    key = (n_disks, n_rods, goal_rod)
+    if key in _open_tables:
+        return _open_tables[key]
+    
+    path = DistanceTable.default_path(n_disks, n_rods, goal_rod, cache_dir)
+    if not path.exists():
+        if not build:
+            return None
+        DistanceTable.build(n_disks, n_rods, goal_rod).save(path)
+    
+    table = DistanceTable.load(path, n_disks, n_rods, goal_rod)
+    _open_tables[key] = table
+    return table
+
+
+def main():
+    """
+    Construit et enregistre une table de distances en ligne de commande
+    """
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python distance_table.py 'n_disks,n_rods' [fichier.npy]")
+        print("Exemple: python distance_table.py '10,4'")
+        sys.exit(1)
+    
+    try:
+        n_disks, n_rods = parse_input(sys.argv[1])
+        goal_rod = n_rods - 1
+        path = Path(sys.argv[2]) if len(sys.argv) == 3 else DistanceTable.default_path(n_disks, n_rods, goal_rod)
+        
+        table = DistanceTable.build(n_disks, n_rods, goal_rod)
+        table.save(path)
+        
+        print(f"Table enregistrée: {path}")
+        print(f"- États: {table.space.size}")
+        print(f"- Distance maximale: {int(table.distances.max())}")
+        print(f"- Taille: {table.distances.nbytes} octets ({table.distances.dtype})")
+    
+    except ValueError as e:
+        print(f"Erreur: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
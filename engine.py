@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Moteur du jeu de la Tour de Hanoï, sans interface graphique
+État de la partie, règles de déplacement et calcul des solutions et conseils ;
+l'interface Tk (graphics.py) l'enveloppe, et il peut être utilisé seul (scripts, tests)
+"""
+
+from typing import List, Optional, Tuple
+
+from solve import calculate_min_moves
+from state_solver import (disk_positions, distance_between, distance_to_goal, iter_pairs_between,
+                          recommended_move, solve_between, solve_from_state)
+from state_space import StateSpace
+from stats import SolverStats
+
+# Taille maximale d'une table de distances construite à la volée
+ENGINE_TABLE_STATES = 3 ** 12
+
+
+class HanoiEngine:
+    """
+    Partie en cours : bâtonnets, nombre de mouvements et solution en cours de lecture
+    
+    Les bâtonnets sont indexés à partir de 0 ; les mouvements au format
+    "source->destination" les numérotent à partir de 1. L'état final est la
+    tour sur le dernier bâtonnet, ou goal_state s'il est défini (voir set_goal).
+    """
+    
+    def __init__(self, n_disks: int = 3, n_rods: int = 3, goal_state: Optional[List[List[int]]] = None):
+        self.n_disks = n_disks
+        self.n_rods = n_rods
+        self.goal_state: Optional[List[List[int]]] = None
+        self.rods: List[List[int]] = [[] for _ in range(n_rods)]
+        self.move_count = 0
+        self.solution_moves: List[str] = []
+        self.solution_index = 0
+        self.initial_state: Optional[List[List[int]]] = None
+        self.reset()
+        if goal_state is not None:
+            self.set_goal(goal_state)
+    
+    @property
+    def goal_rod(self) -> int:
+        """Bâtonnet d'arrivée (le dernier)"""
+        return self.n_rods - 1
+    
+    def set_goal(self, goal_state: Optional[List[List[int]]]):
+        """
+        Définit l'état final (None : la tour sur le dernier bâtonnet)
+        
+        Args:
+            goal_state: État d'arrivée, avec les disques et bâtonnets de la partie
+        """
+        if goal_state is not None:
+            if len(goal_state) != self.n_rods or len(disk_positions(goal_state)) != self.n_disks + 1:
+                raise ValueError(f"L'état d'arrivée doit avoir {self.n_disks} disques sur {self.n_rods} bâtonnets")
+            goal_state = [list(rod) for rod in goal_state]
+        self.goal_state = goal_state
+        self.clear_solution()
+    
+    def reset(self, n_disks: Optional[int] = None):
+        """
+        Remet tous les disques sur le premier bâtonnet
+        
+        Args:
+            n_disks: Nouveau nombre de disques (inchangé par défaut) ; un autre
+                     nombre de disques rétablit l'état final par défaut
+        """
+        if n_disks is not None and n_disks != self.n_disks:
+            self.n_disks = n_disks
+            self.goal_state = None
+        self.rods = [[] for _ in range(self.n_rods)]
+        self.rods[0] = list(range(self.n_disks, 0, -1))
+        self.move_count = 0
+        self.clear_solution()
+        self.initial_state = self.get_current_state()
+    
+    def clear_solution(self):
+        """Oublie la solution calculée (elle ne vaut que pour l'état où elle a été calculée)"""
+        self.solution_moves = []
+        self.solution_index = 0
+    
+    def min_moves(self) -> int:
+        """Nombre minimal de mouvements depuis l'état initial"""
+        return calculate_min_moves(self.n_disks, self.n_rods)
+    
+    def get_current_state(self) -> List[List[int]]:
+        """Retourne une copie de l'état actuel"""
+        return [rod.copy() for rod in self.rods]
+    
+    def set_state(self, state: List[List[int]]):
+        """Définit l'état du jeu"""
+        self.rods = [rod.copy() for rod in state]
+    
+    @staticmethod
+    def state_to_tuple(state: List[List[int]]) -> Tuple:
+        """Convertit un état en tuple pour utilisation comme clé de dictionnaire"""
+        return tuple(tuple(rod) for rod in state)
+    
+    @staticmethod
+    def tuple_to_state(state_tuple: Tuple) -> List[List[int]]:
+        """Convertit un tuple en état"""
+        return [list(rod) for rod in state_tuple]
+    
+    def is_goal_state(self, state: List[List[int]]) -> bool:
+        """Vérifie si un état est l'état final (goal_state, ou tous les disques sur le dernier bâtonnet)"""
+        if self.goal_state is not None:
+            return self.state_to_tuple(state) == self.state_to_tuple(self.goal_state)
+        return len(state[self.goal_rod]) == self.n_disks
+    
+    def get_possible_moves_from_state(self, state: List[List[int]]) -> List[Tuple[int, int]]:
+        """Retourne la liste des mouvements possibles depuis un état donné (bâtonnets numérotés à partir de 1)"""
+        possible_moves = []
+        for from_rod in range(self.n_rods):
+            if not state[from_rod]:
+                continue
+            for to_rod in range(self.n_rods):
+                if from_rod != to_rod and (not state[to_rod] or state[from_rod][-1] < state[to_rod][-1]):
+                    possible_moves.append((from_rod + 1, to_rod + 1))
+        return possible_moves
+    
+    @staticmethod
+    def apply_move_to_state(state: List[List[int]], from_rod: int, to_rod: int) -> List[List[int]]:
+        """Applique un mouvement à un état et retourne le nouvel état"""
+        new_state = [rod.copy() for rod in state]
+        if new_state[from_rod]:
+            new_state[to_rod].append(new_state[from_rod].pop())
+        return new_state
+    
+    def get_possible_moves(self) -> List[Tuple[int, int]]:
+        """Retourne la liste des mouvements possibles depuis l'état actuel"""
+        return self.get_possible_moves_from_state(self.rods)
+    
+    def can_move(self, from_rod: int, to_rod: int) -> bool:
+        """Vérifie si un mouvement est valide"""
+        if not self.rods[from_rod]:
+            return False
+        if not self.rods[to_rod]:
+            return True
+        return self.rods[from_rod][-1] < self.rods[to_rod][-1]
+    
+    def move_disk(self, from_rod: int, to_rod: int) -> bool:
+        """Déplace un disque d'un bâtonnet à un autre ; False si le mouvement est interdit"""
+        if self.can_move(from_rod, to_rod):
+            self.rods[to_rod].append(self.rods[from_rod].pop())
+            return True
+        return False
+    
+    def play(self, move: str) -> bool:
+        """
+        Joue un mouvement "source->destination" et le compte
+        
+        Returns:
+            False si le mouvement est interdit (l'état est inchangé)
+        """
+        from_rod, to_rod = map(int, move.split('->'))
+        if not self.move_disk(from_rod - 1, to_rod - 1):
+            return False
+        self.move_count += 1
+        return True
+    
+    def play_next_solution_move(self) -> Optional[str]:
+        """Joue le prochain mouvement de la solution calculée ; None si elle est terminée"""
+        if self.solution_index >= len(self.solution_moves):
+            return None
+        move = self.solution_moves[self.solution_index]
+        if not self.play(move):
+            return None
+        self.solution_index += 1
+        return move
+    
+    def is_game_won(self) -> bool:
+        """Vérifie si le jeu est gagné"""
+        return self.is_goal_state(self.rods)
+    
+    def solve_from_current_state_bfs(self, stats: Optional[SolverStats] = None) -> List[str]:
+        """Utilise BFS pour trouver la solution optimale depuis l'état actuel (stats optionnel, voir SolverStats)"""
+        # Les états sont codés en entiers : pas de copie de listes pendant la recherche
+        space = StateSpace(self.n_disks, self.n_rods)
+        goal = space.goal_code(self.goal_rod) if self.goal_state is None else space.encode(self.goal_state)
+        return space.bfs(space.encode(self.rods), goal, stats=stats)
+    
+    def compute_solution(self, rods: List[List[int]], cancel=None) -> List[str]:
+        """
+        Calcule la solution optimale depuis un état (appelable depuis un autre thread)
+        
+        Args:
+            rods: État de départ
+            cancel: threading.Event optionnel qui interrompt la recherche A*
+        """
+        if self.goal_state is not None:
+            return solve_between(rods, self.goal_state)
+        if self.n_rods == 3:
+            return solve_from_state(rods, self.goal_rod)
+        return self._search_optimal(rods, cancel)
+    
+    def _search_optimal(self, rods: List[List[int]], cancel=None,
+                        stats: Optional[SolverStats] = None) -> List[str]:
+        """A* guidé par les bases de motifs (au-delà de 3 bâtonnets), BFS si NumPy est absent"""
+        try:
+            from astar import astar_solve
+        except ImportError:  # NumPy absent : pas de bases de motifs
+            space = StateSpace(self.n_disks, self.n_rods)
+            return space.bfs(space.encode(rods), space.goal_code(self.goal_rod), cancel=cancel, stats=stats)
+        return astar_solve(rods, goal_rod=self.goal_rod, cancel=cancel, stats=stats)
+    
+    def get_distance_table(self):
+        """Retourne la table des distances de la configuration, si elle est disponible"""
+        try:
+            from distance_table import get_distance_table
+        except ImportError:  # NumPy absent : on se passe de la table des distances
+            return None
+        # Les grandes tables ne sont utilisées que si elles ont déjà été construites
+        build = self.n_rods ** self.n_disks <= ENGINE_TABLE_STATES
+        try:
+            return get_distance_table(self.n_disks, self.n_rods, goal_rod=self.goal_rod, build=build)
+        except (OSError, ValueError) as e:
+            print(f"Table des distances indisponible: {e}")
+            return None
+    
+    def compute_hint(self, rods: List[List[int]], cancel=None,
+                     stats: Optional[SolverStats] = None) -> Tuple[Optional[str], Optional[int]]:
+        """Calcule (coup recommandé, mouvements restants) pour un état"""
+        if self.goal_state is not None:
+            return self._compute_hint_to_state(rods, stats)
+        
+        # À 3 bâtonnets, le premier coup optimal se calcule directement en O(n), sans table
+        if self.n_rods == 3:
+            if stats is not None:
+                stats.solver = "calcul direct"
+            return recommended_move(rods, self.goal_rod), distance_to_goal(rods, self.goal_rod)
+        
+        table = self.get_distance_table()
+        if table is not None:
+            if stats is not None:
+                stats.solver = "table des distances"
+            return table.best_move(rods), table.distance(rods)
+        
+        # Au-delà, A* guidé par les bases de motifs
+        if stats is not None:
+            stats.solver = "A*"
+        optimal_moves = self._search_optimal(rods, cancel, stats)
+        return (optimal_moves[0] if optimal_moves else None), len(optimal_moves)
+    
+    def _compute_hint_to_state(self, rods: List[List[int]],
+                               stats: Optional[SolverStats] = None) -> Tuple[Optional[str], Optional[int]]:
+        """Conseil vers goal_state : calcul direct à 3 bâtonnets, recherche en largeur au-delà"""
+        if self.n_rods == 3:
+            if stats is not None:
+                stats.solver = "calcul direct"
+            first = next(iter_pairs_between(rods, self.goal_state), None)
+            move = f"{first[0]}->{first[1]}" if first is not None else None
+            return move, distance_between(rods, self.goal_state)
+        if stats is not None:
+            stats.solver = "BFS"
+        optimal_moves = solve_between(rods, self.goal_state)
+        return (optimal_moves[0] if optimal_moves else None), len(optimal_moves)
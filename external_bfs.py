@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+BFS en mémoire externe : l'état de recherche de chaque état du jeu est stocké
+sur 2 bits dans un fichier projeté en mémoire (np.memmap) et balayé niveau par
+niveau par gros blocs vectorisés. La mémoire utilisée ne dépend que de la taille
+des blocs ; un calcul interrompu reprend au niveau où il s'était arrêté.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from cache_dir import default_cache_dir
+from distance_table import CHUNK_SIZE, DistanceTable, _smallest_dtype, expand_codes
+from solve import parse_input
+from state_space import StateSpace
+
+# États d'un code (2 bits) : jamais vu, frontière / suivant (alternés selon la
+# parité du niveau), déjà développé
+UNSEEN = 0
+FRONTIER_VALUES = (1, 2)
+DONE = 3
+
+# Octets du fichier d'états lus par bloc (4 états par octet)
+CHUNK_BYTES = CHUNK_SIZE // 4
+
+# Position des 4 états d'un octet
+_SHIFTS = np.array([0, 2, 4, 6], dtype=np.uint8)
+
+# Pour chaque valeur v et chaque octet : nombre d'états valant v dans l'octet
+_COUNTS = np.array([[sum(((byte >> shift) & 3) == value for shift in (0, 2, 4, 6)) for byte in range(256)]
+                    for value in range(4)], dtype=np.int64)
+
+
+def _get_status(status: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    return (status[codes >> 2] >> ((codes & 3) << 1).astype(np.uint8)) & 3
+
+
+def _set_status(status: np.ndarray, codes: np.ndarray, value: int) -> None:
+    """Donne la valeur à des codes triés, uniques et encore non vus (un OU par octet)"""
+    if not codes.size:
+        return
+    byte_index = codes >> 2
+    starts = np.flatnonzero(np.diff(byte_index, prepend=-1))
+    bits = (value << ((codes & 3) << 1)).astype(np.uint8)
+    status[byte_index[starts]] |= np.bitwise_or.reduceat(bits, starts)
+
+
+class ExternalBFS:
+    """
+    BFS arrière depuis l'état final dont l'état de recherche est sur disque
+    
+    Le répertoire de travail contient :
+    - status.bin : 2 bits par état (UNSEEN, FRONTIER_VALUES, DONE) ;
+    - distances.npy : distance de chaque état (table compatible avec DistanceTable) ;
+    - progress.json : niveau en cours et nombre d'états par niveau.
+    
+    Chaque bloc est développé (voisins marqués « suivant ») avant que ses états
+    de frontière soient marqués DONE : rejouer un niveau interrompu ne refait que
+    le travail manquant.
+    """
+    
+    def __init__(self, n_disks: int, n_rods: int = 3, goal_rod: Optional[int] = None,
+                 directory: Optional[Path] = None, with_distances: bool = True):
+        self.space = StateSpace(n_disks, n_rods)
+        self.goal_rod = n_rods - 1 if goal_rod is None else goal_rod
+        if directory is None:
+            directory = default_cache_dir() / f"external_{n_disks}x{n_rods}_goal{self.goal_rod + 1}"
+        self.directory = Path(directory)
+        self.with_distances = with_distances
+        self.level = 0
+        self.counts: List[int] = []
+        self.complete = False
+    
+    @property
+    def status_path(self) -> Path:
+        return self.directory / "status.bin"
+    
+    @property
+    def distances_path(self) -> Path:
+        return self.directory / "distances.npy"
+    
+    @property
+    def progress_path(self) -> Path:
+        return self.directory / "progress.json"
+    
+    def _save_progress(self) -> None:
+        """Enregistre l'avancement (écriture atomique)"""
+        progress = {
+            "n_disks": self.space.n_disks,
+            "n_rods": self.space.n_rods,
+            "goal_rod": self.goal_rod,
+            "with_distances": self.with_distances,
+            "level": self.level,
+            "counts": self.counts,
+            "complete": self.complete,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(progress, f)
+            os.replace(tmp_path, self.progress_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    def _load_progress(self) -> bool:
+        """Relit l'avancement d'un calcul précédent ; False s'il n'y en a pas"""
+        if not self.progress_path.exists():
+            return False
+        with open(self.progress_path, encoding="utf-8") as f:
+            progress = json.load(f)
+        expected = (self.space.n_disks, self.space.n_rods, self.goal_rod, self.with_distances)
+        found = (progress["n_disks"], progress["n_rods"], progress["goal_rod"], progress["with_distances"])
+        if found != expected:
+            raise ValueError(f"Le répertoire {self.directory} contient un autre calcul "
+                             f"({found[0]} disques, {found[1]} bâtonnets, arrivée {found[2] + 1})")
+        self.level = progress["level"]
+        self.counts = progress["counts"]
+        self.complete = progress["complete"]
+        return True
+    
+    def _open(self, create: bool):
+        """Projette les fichiers de travail en mémoire (en les créant si besoin)"""
+        n_bytes = (self.space.size + 3) // 4
+        status = np.memmap(self.status_path, dtype=np.uint8, mode="w+" if create else "r+", shape=(n_bytes,))
+        distances = None
+        if self.with_distances:
+            if create:
+                # Toute distance est au plus 2^n - 1 (solution à 3 bâtonnets), d'où le type
+                dtype = _smallest_dtype(2 ** self.space.n_disks - 1)
+                distances = np.lib.format.open_memmap(self.distances_path, mode="w+", dtype=dtype,
+                                                      shape=(self.space.size,))
+                for start in range(0, distances.size, CHUNK_SIZE):
+                    distances[start:start + CHUNK_SIZE] = np.iinfo(dtype).max
+            else:
+                distances = np.load(self.distances_path, mmap_mode="r+")
+        return status, distances
+    
+    def _sweep(self, status: np.ndarray, distances: Optional[np.ndarray]) -> None:
+        """Développe toutes les frontières restantes du niveau en cours, bloc par bloc"""
+        frontier_value = FRONTIER_VALUES[self.level % 2]
+        next_value = FRONTIER_VALUES[(self.level + 1) % 2]
+        has_frontier = _COUNTS[frontier_value] > 0
+        n_disks, n_rods = self.space.n_disks, self.space.n_rods
+        
+        for byte_start in range(0, status.size, CHUNK_BYTES):
+            chunk = np.array(status[byte_start:byte_start + CHUNK_BYTES])
+            if not has_frontier[chunk].any():
+                continue
+            in_frontier = ((chunk[:, None] >> _SHIFTS) & 3) == frontier_value
+            codes = np.flatnonzero(in_frontier) + byte_start * 4
+            
+            neighbours = np.unique(expand_codes(codes, n_disks, n_rods))
+            neighbours = neighbours[_get_status(status, neighbours) == UNSEEN]
+            _set_status(status, neighbours, next_value)
+            if distances is not None:
+                distances[neighbours] = self.level + 1
+            
+            # Les états du bloc sont développés : FRONTIER | 3 == DONE
+            done_bits = (in_frontier * (DONE << _SHIFTS)).sum(axis=1).astype(np.uint8)
+            status[byte_start:byte_start + chunk.size] |= done_bits
+    
+    def _count(self, status: np.ndarray, value: int) -> int:
+        """Nombre d'états ayant la valeur donnée"""
+        table = _COUNTS[value]
+        return int(sum(table[status[start:start + CHUNK_BYTES]].sum()
+                       for start in range(0, status.size, CHUNK_BYTES)))
+    
+    def run(self, on_level: Optional[Callable[[int, int, float], None]] = None) -> List[int]:
+        """
+        Exécute (ou reprend) le parcours jusqu'à épuisement des états
+        
+        Args:
+            on_level: Appelé après chaque niveau avec (niveau, nombre d'états, durée)
+        
+        Returns:
+            Nombre d'états à chaque distance de l'état final
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        resumed = self._load_progress()
+        if self.complete:
+            return self.counts
+        
+        status, distances = self._open(create=not resumed)
+        try:
+            if not resumed:
+                goal = self.space.goal_code(self.goal_rod)
+                _set_status(status, np.array([goal], dtype=np.int64), FRONTIER_VALUES[0])
+                if distances is not None:
+                    distances[goal] = 0
+                self.level = 0
+                self.counts = [1]
+                self._flush(status, distances)
+                self._save_progress()
+            
+            while not self.complete:
+                start = time.perf_counter()
+                self._sweep(status, distances)
+                count = self._count(status, FRONTIER_VALUES[(self.level + 1) % 2])
+                self._flush(status, distances)
+                
+                if count:
+                    self.level += 1
+                    self.counts.append(count)
+                    if on_level is not None:
+                        on_level(self.level, count, time.perf_counter() - start)
+                else:
+                    self.complete = True
+                self._save_progress()
+        finally:
+            del status, distances
+        return self.counts
+    
+    @staticmethod
+    def _flush(status: np.ndarray, distances: Optional[np.ndarray]) -> None:
+        status.flush()
+        if distances is not None:
+            distances.flush()
+    
+    def install(self, cache_dir: Optional[Path] = None) -> Path:
+        """
+        Déplace la table terminée là où get_distance_table la cherche
+        
+        Returns:
+            Chemin de la table installée
+        """
+        if not self.complete or not self.with_distances:
+            raise ValueError("Le calcul n'est pas terminé ou n'enregistre pas les distances")
+        if not self.distances_path.exists():
+            raise ValueError(f"La table de {self.directory} a déjà été installée")
+        path = DistanceTable.default_path(self.space.n_disks, self.space.n_rods, self.goal_rod, cache_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self.distances_path, path)
+        return path
+
+
+def main():
+    """
+    Calcule (ou reprend) une table de distances en mémoire externe
+    """
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python external_bfs.py 'n_disks,n_rods' [répertoire de travail]")
+        print("Exemple: python external_bfs.py '15,4'")
+        sys.exit(1)
+    
+    try:
+        n_disks, n_rods = parse_input(sys.argv[1])
+        bfs = ExternalBFS(n_disks, n_rods, directory=Path(sys.argv[2]) if len(sys.argv) == 3 else None)
+        if bfs._load_progress() and not bfs.complete:
+            print(f"Reprise au niveau {bfs.level} ({bfs.directory})")
+        
+        def show(level: int, count: int, elapsed: float):
+            print(f"Niveau {level}: {count} états ({elapsed:.2f} s)", flush=True)
+        
+        counts = bfs.run(show)
+        path = bfs.install()
+        
+        print(f"Table enregistrée: {path}")
+        print(f"- États: {sum(counts)} sur {bfs.space.size}")
+        print(f"- Distance maximale: {len(counts) - 1}")
+    
+    except ValueError as e:
+        print(f"Erreur: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
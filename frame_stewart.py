@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Algorithme de Frame-Stewart pour la Tour de Hanoï à plus de 3 bâtonnets
+Table mémoïsée des points de partage optimaux et générateur de mouvements non récursif
+"""
+
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+
+class FrameStewartTable:
+    """
+    Table mémoïsée des coûts et points de partage de Frame-Stewart
+    
+    Pour n disques et k bâtonnets, on déplace les t plus petits disques vers un
+    bâtonnet intermédiaire (k bâtonnets), les n-t restants vers la destination
+    (k-1 bâtonnets), puis les t petits disques vers la destination. Le t optimal
+    est calculé une seule fois par (n, k) et réutilisé entre les appels.
+    """
+    
+    def __init__(self):
+        # Pour chaque nombre de bâtonnets : coût et partage optimal, indexés par n
+        self._costs: Dict[int, List[int]] = {}
+        self._splits: Dict[int, List[int]] = {}
+    
+    def _extend(self, n_disks: int, n_rods: int) -> None:
+        """Complète la table jusqu'à n_disks disques pour n_rods bâtonnets"""
+        costs = self._costs.setdefault(n_rods, [0])
+        splits = self._splits.setdefault(n_rods, [0])
+        if len(costs) > n_disks:
+            return
+        
+        if n_rods == 3:
+            for n in range(len(costs), n_disks + 1):
+                costs.append((1 << n) - 1)
+                splits.append(n - 1)
+            return
+        
+        self._extend(n_disks, n_rods - 1)
+        lower = self._costs[n_rods - 1]
+        for n in range(len(costs), n_disks + 1):
+            if n == 1:
+                costs.append(1)
+                splits.append(0)
+                continue
+            best_t = 1
+            best_cost = 2 * costs[1] + lower[n - 1]
+            for t in range(2, n):
+                cost = 2 * costs[t] + lower[n - t]
+                if cost < best_cost:
+                    best_t, best_cost = t, cost
+            costs.append(best_cost)
+            splits.append(best_t)
+    
+    def cost(self, n_disks: int, n_rods: int) -> int:
+        """Nombre de mouvements de Frame-Stewart pour n_disks disques et n_rods bâtonnets"""
+        if n_rods < 3:
+            raise ValueError("Il faut au moins 3 bâtonnets pour résoudre la Tour de Hanoï")
+        if n_disks <= 0:
+            return 0
+        self._extend(n_disks, n_rods)
+        return self._costs[n_rods][n_disks]
+    
+    def split(self, n_disks: int, n_rods: int) -> int:
+        """Nombre optimal de petits disques à mettre de côté (t) pour (n_disks, n_rods)"""
+        if n_rods < 3:
+            raise ValueError("Il faut au moins 3 bâtonnets pour résoudre la Tour de Hanoï")
+        if n_disks <= 1:
+            return 0
+        self._extend(n_disks, n_rods)
+        return self._splits[n_rods][n_disks]
+    
+    def iter_moves(self, n_disks: int, source: int, destination: int,
+                   pegs: Sequence[int]) -> Iterator[Tuple[int, int]]:
+        """
+        Génère les mouvements (source, destination) sans récursion, avec une pile explicite
+        
+        Args:
+            n_disks: Nombre de disques à déplacer
+            source: Bâtonnet de départ
+            destination: Bâtonnet d'arrivée
+            pegs: Bâtonnets utilisables (source et destination comprises)
+        
+        Returns:
+            Itérateur sur les mouvements
+        """
+        if n_disks <= 0:
+            return
+        self._extend(n_disks, len(pegs))
+        
+        # Chaque tâche est (n, source, destination, bâtonnets) ; n == 1 est un mouvement simple
+        stack = [(n_disks, source, destination, tuple(pegs))]
+        while stack:
+            n, src, dst, available = stack.pop()
+            if n <= 1:
+                yield src, dst
+                continue
+            
+            k = len(available)
+            t = self._splits[k][n]
+            inter = next(p for p in available if p != src and p != dst)
+            remaining = tuple(p for p in available if p != inter)
+            
+            # Empilés dans l'ordre inverse d'exécution
+            stack.append((t, inter, dst, available))
+            stack.append((n - t, src, dst, remaining))
+            stack.append((t, src, inter, available))
+
+
+# Table partagée par tous les appels du processus
+DEFAULT_TABLE = FrameStewartTable()
+
+
+def frame_stewart_moves(n_disks: int, n_rods: int) -> int:
+    """
+    Calcule le nombre de mouvements de la solution de Frame-Stewart
+    
+    Args:
+        n_disks: Nombre de disques
+        n_rods: Nombre de bâtonnets
+    
+    Returns:
+        Nombre de mouvements (2^n - 1 pour 3 bâtonnets)
+    """
+    return DEFAULT_TABLE.cost(n_disks, n_rods)
+
+
+def iter_frame_stewart(n_disks: int, n_rods: int, source: int = 1,
+                       destination: int = 3) -> Iterator[Tuple[int, int]]:
+    """
+    Génère les mouvements de Frame-Stewart entre deux bâtonnets
+    
+    Args:
+        n_disks: Nombre de disques
+        n_rods: Nombre de bâtonnets (numérotés de 1 à n_rods)
+        source: Bâtonnet de départ
+        destination: Bâtonnet d'arrivée
+    
+    Returns:
+        Itérateur sur les mouvements (source, destination)
+    """
+    return DEFAULT_TABLE.iter_moves(n_disks, source, destination, range(1, n_rods + 1))
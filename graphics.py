@@ -9,15 +9,39 @@ Corrections finales :
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-import time
-import threading
-from typing import List, Optional, Tuple, Dict
-from collections import deque
-from solve import solve_hanoi, calculate_min_moves
+from typing import List, Optional, Tuple
+from engine import HanoiEngine
+from hint_cache import HintCache
+from solver_worker import SolverWorker
+from renderer import HanoiRenderer
+from playback import Playback, SPEEDS
+from stats import SolverStats
+
+# Nombre maximal de disques proposé par l'interface
+MAX_DISKS = 16
+
+
+def _engine_attribute(name: str) -> property:
+    """Attribut de HanoiGame lu et écrit directement dans le moteur"""
+    return property(lambda self: getattr(self.engine, name),
+                    lambda self, value: setattr(self.engine, name, value))
 
 
 class HanoiGame:
-    """Classe principale pour le jeu de la Tour de Hanoï avec interface graphique finale"""
+    """
+    Classe principale pour le jeu de la Tour de Hanoï avec interface graphique finale
+    
+    L'état de la partie et les règles sont dans self.engine (HanoiEngine) ;
+    cette classe gère l'affichage, les événements et les calculs en arrière-plan.
+    """
+    
+    n_disks = _engine_attribute("n_disks")
+    n_rods = _engine_attribute("n_rods")
+    rods = _engine_attribute("rods")
+    move_count = _engine_attribute("move_count")
+    solution_moves = _engine_attribute("solution_moves")
+    solution_index = _engine_attribute("solution_index")
+    initial_state = _engine_attribute("initial_state")
     
     def __init__(self, master: tk.Tk):
         self.master = master
@@ -25,19 +49,22 @@ class HanoiGame:
         self.master.geometry("800x600")
         self.master.resizable(True, True)
         
-        # Configuration du jeu
-        self.n_disks = 3
-        self.n_rods = 3
+        # État de la partie et règles du jeu
+        self.engine = HanoiEngine(n_disks=3, n_rods=3)
         self.disk_colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#98D8C8', '#F7DC6F']
         
-        # État du jeu
-        self.rods = [[], [], []]  # Liste des disques sur chaque bâtonnet
+        # État de l'interface
         self.selected_rod = None
-        self.move_count = 0
         self.is_solving = False
-        self.solution_moves = []
-        self.solution_index = 0
-        self.initial_state = None  # Pour sauvegarder l'état initial
+        self.playback = None  # Lecture de la solution en cours (résolution automatique)
+        self.speed = SPEEDS[0]  # Mouvements par seconde (None = maximum)
+        
+        # Cache des conseils (coup recommandé, distance) indexé par état
+        self.hint_cache = HintCache(self.engine.compute_hint)
+        
+        # Calculs hors du thread Tk ; state_version change à chaque modification de l'état
+        self.worker = SolverWorker(self.master)
+        self.state_version = 0
         
         # Variables d'interface
         self.canvas_width = 700
@@ -75,7 +102,7 @@ class HanoiGame:
         
         ttk.Label(config_frame, text="Nombre de disques:").grid(row=0, column=0, padx=(0, 5))
         self.disk_var = tk.StringVar(value=str(self.n_disks))
-        disk_spinbox = ttk.Spinbox(config_frame, from_=1, to=8, width=5, textvariable=self.disk_var)
+        disk_spinbox = ttk.Spinbox(config_frame, from_=1, to=MAX_DISKS, width=5, textvariable=self.disk_var)
         disk_spinbox.grid(row=0, column=1, padx=(0, 10))
         
         ttk.Button(config_frame, text="Nouveau jeu", command=self.new_game).grid(row=0, column=2, padx=(0, 10))
@@ -88,6 +115,19 @@ class HanoiGame:
         ttk.Button(solve_frame, text="Résoudre automatiquement", command=self.solve_auto).grid(row=0, column=0, padx=(0, 10))
         ttk.Button(solve_frame, text="Étape suivante", command=self.next_step).grid(row=0, column=1, padx=(0, 10))
         ttk.Button(solve_frame, text="Arrêter", command=self.stop_solving).grid(row=0, column=2, padx=(0, 10))
+        ttk.Button(solve_frame, text="Aller à la fin", command=self.skip_to_end).grid(row=0, column=3, padx=(0, 10))
+        
+        # Vitesse de la résolution automatique
+        ttk.Label(solve_frame, text="Vitesse:").grid(row=0, column=4, padx=(0, 5))
+        self.speed_var = tk.StringVar(value=self.speed_label(self.speed))
+        speed_box = ttk.Combobox(solve_frame, textvariable=self.speed_var, width=8, state="readonly",
+                                 values=[self.speed_label(speed) for speed in SPEEDS])
+        speed_box.grid(row=0, column=5, padx=(0, 10))
+        speed_box.bind("<<ComboboxSelected>>", self.on_speed_change)
+        
+        self.render_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(solve_frame, text="Afficher", variable=self.render_var,
+                        command=self.on_render_toggle).grid(row=0, column=6)
         
         # Informations
         info_frame = ttk.Frame(control_frame)
@@ -106,6 +146,8 @@ class HanoiGame:
         self.canvas = tk.Canvas(main_frame, width=self.canvas_width, height=self.canvas_height, 
                                bg='white', relief=tk.SUNKEN, borderwidth=2)
         self.canvas.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.renderer = HanoiRenderer(self.canvas, self.disk_colors, self.canvas_width, self.canvas_height,
+                                      self.rod_width, self.rod_height, self.disk_height, self.base_width)
         
         # Événements de la souris
         self.canvas.bind("<Button-1>", self.on_canvas_click)
@@ -118,114 +160,81 @@ class HanoiGame:
                                 wraplength=700, justify=tk.CENTER)
         instructions.grid(row=2, column=0, columnspan=2, pady=(10, 0))
     
-    def get_current_state(self) -> List[List[int]]:
-        """Retourne l'état actuel du jeu"""
-        return [rod.copy() for rod in self.rods]
-    
-    def set_state(self, state: List[List[int]]):
-        """Définit l'état du jeu"""
-        self.rods = [rod.copy() for rod in state]
-    
-    def state_to_tuple(self, state: List[List[int]]) -> Tuple:
-        """Convertit un état en tuple pour utilisation comme clé de dictionnaire"""
-        return tuple(tuple(rod) for rod in state)
-    
-    def tuple_to_state(self, state_tuple: Tuple) -> List[List[int]]:
-        """Convertit un tuple en état"""
-        return [list(rod) for rod in state_tuple]
-    
-    def is_goal_state(self, state: List[List[int]]) -> bool:
-        """Vérifie si un état est l'état final (tous les disques sur le dernier bâtonnet)"""
-        return len(state[2]) == self.n_disks and len(state[0]) == 0 and len(state[1]) == 0
-    
-    def get_possible_moves_from_state(self, state: List[List[int]]) -> List[Tuple[int, int]]:
-        """Retourne la liste des mouvements possibles depuis un état donné"""
-        possible_moves = []
-        
-        for from_rod in range(self.n_rods):
-            if state[from_rod]:  # Si le bâtonnet n'est pas vide
-                for to_rod in range(self.n_rods):
-                    if from_rod != to_rod:
-                        # Vérifier si le mouvement est valide
-                        if not state[to_rod] or state[from_rod][-1] < state[to_rod][-1]:
-                            possible_moves.append((from_rod + 1, to_rod + 1))  # Convertir en 1-based
-        
-        return possible_moves
-    
-    def apply_move_to_state(self, state: List[List[int]], from_rod: int, to_rod: int) -> List[List[int]]:
-        """Applique un mouvement à un état et retourne le nouvel état"""
-        new_state = [rod.copy() for rod in state]
-        if new_state[from_rod]:
-            disk = new_state[from_rod].pop()
-            new_state[to_rod].append(disk)
-        return new_state
-    
-    def solve_from_current_state_bfs(self) -> List[str]:
-        """Utilise BFS pour trouver la solution optimale depuis l'état actuel"""
-        current_state = self.get_current_state()
-        
-        if self.is_goal_state(current_state):
-            return []
-        
-        # BFS pour trouver la solution optimale
-        queue = deque([(current_state, [])])
-        visited = {self.state_to_tuple(current_state)}
-        
-        while queue:
-            state, moves = queue.popleft()
-            
-            # Générer tous les mouvements possibles
-            possible_moves = self.get_possible_moves_from_state(state)
-            
-            for from_rod, to_rod in possible_moves:
-                # Appliquer le mouvement
-                new_state = self.apply_move_to_state(state, from_rod - 1, to_rod - 1)
-                new_state_tuple = self.state_to_tuple(new_state)
-                
-                if new_state_tuple not in visited:
-                    visited.add(new_state_tuple)
-                    new_moves = moves + [f"{from_rod}->{to_rod}"]
-                    
-                    # Vérifier si c'est l'état final
-                    if self.is_goal_state(new_state):
-                        return new_moves
-                    
-                    queue.append((new_state, new_moves))
-        
-        # Si aucune solution trouvée (ne devrait pas arriver)
-        return []
-    
-    def get_recommended_move(self) -> Optional[str]:
-        """Retourne le coup recommandé (premier coup de la solution optimale)"""
+    def get_hint(self) -> Tuple[Optional[str], Optional[int]]:
+        """Retourne (coup recommandé, mouvements restants) pour l'état actuel, depuis le cache"""
         try:
-            if self.is_game_won():
-                return None
-            
-            # Utiliser BFS pour trouver la solution optimale
-            optimal_moves = self.solve_from_current_state_bfs()
-            
-            if optimal_moves:
-                return optimal_moves[0]
-            else:
-                return None
-                
+            return self.hint_cache.get(self.rods)
         except Exception as e:
             print(f"Erreur lors du calcul du coup recommandé: {e}")
-            return None
+            return None, None
     
-    def get_possible_moves(self) -> List[Tuple[int, int]]:
-        """Retourne la liste des mouvements possibles depuis l'état actuel"""
-        return self.get_possible_moves_from_state(self.rods)
+    def state_changed(self):
+        """Signale une modification de l'état : les calculs lancés pour l'ancien état sont annulés"""
+        self.state_version += 1
+        self.worker.cancel_older(self.state_version)
+    
+    def prefetch_hints(self):
+        """Précalcule en arrière-plan les conseils de tous les états accessibles en un coup"""
+        self.hint_cache.prefetch(self.engine.apply_move_to_state(self.rods, from_rod - 1, to_rod - 1)
+                                 for from_rod, to_rod in self.engine.get_possible_moves())
+    
+    def get_distance_to_goal(self) -> Optional[int]:
+        """Retourne le nombre minimum de mouvements restants"""
+        return self.get_hint()[1]
+    
+    def get_recommended_move(self) -> Optional[str]:
+        """Retourne le coup recommandé (premier coup de la solution optimale)"""
+        if self.engine.is_game_won():
+            return None
+        return self.get_hint()[0]
     
     def print_possible_moves(self):
-        """Affiche les coups possibles dans le terminal avec coup recommandé"""
-        possible_moves = self.get_possible_moves()
-        recommended_move = self.get_recommended_move()
+        """
+        Affiche les coups possibles dans le terminal avec coup recommandé
+        
+        Si le conseil n'est pas encore en cache, il est calculé par le thread de
+        calcul et l'affichage a lieu à la réception du résultat.
+        """
+        if self.engine.is_game_won():
+            self.print_state_report((None, 0))
+            return
+        
+        hint = self.hint_cache.peek(self.rods)
+        if hint is not None:
+            self.print_state_report(hint)
+            return
+        
+        rods = self.engine.get_current_state()
+        self.worker.submit("hint", self.state_version,
+                           lambda cancel: self.compute_and_store_hint(rods, cancel),
+                           self.print_state_report,
+                           on_error=self.on_hint_error)
+    
+    def compute_and_store_hint(self, rods: List[List[int]], cancel=None) -> Tuple[Optional[str], Optional[int]]:
+        """Calcule le conseil d'un état et l'enregistre dans le cache (thread de calcul)"""
+        stats = SolverStats()
+        with stats.measure():
+            hint = self.engine.compute_hint(rods, cancel, stats)
+        print(f"📈 Conseil calculé ({stats.solver}): {stats.summary()}")
+        self.hint_cache.put(rods, hint)
+        return hint
+    
+    def on_hint_error(self, error: Exception):
+        """Affiche l'état sans coup recommandé quand le calcul du conseil a échoué"""
+        print(f"Erreur lors du calcul du coup recommandé: {error}")
+        self.print_state_report((None, None))
+    
+    def print_state_report(self, hint: Tuple[Optional[str], Optional[int]]):
+        """Affiche l'état du jeu, les coups possibles et le conseil déjà calculé"""
+        possible_moves = self.engine.get_possible_moves()
+        recommended_move, remaining = hint
         
         print("\n" + "="*50)
         print("🎯 ÉTAT ACTUEL DU JEU:")
         print(f"   Mouvements effectués: {self.move_count}")
-        print(f"   Minimum théorique: {calculate_min_moves(self.n_disks)}")
+        print(f"   Minimum théorique: {self.engine.min_moves()}")
+        if remaining is not None:
+            print(f"   Mouvements restants (optimal): {remaining}")
         
         # Afficher l'état des bâtonnets
         print("\n📊 ÉTAT DES BÂTONNETS:")
@@ -259,22 +268,25 @@ class HanoiGame:
             print("\n❌ AUCUN COUP POSSIBLE")
         
         # Vérifier si le jeu est gagné
-        if self.is_game_won():
+        if self.engine.is_game_won():
             print("\n🏆 FÉLICITATIONS ! JEU TERMINÉ !")
             print(f"   Résolu en {self.move_count} mouvements")
-            if self.move_count == calculate_min_moves(self.n_disks):
+            if self.move_count == self.engine.min_moves():
                 print("   🌟 SOLUTION OPTIMALE ATTEINTE !")
             else:
-                print(f"   💡 Solution optimale: {calculate_min_moves(self.n_disks)} mouvements")
+                print(f"   💡 Solution optimale: {self.engine.min_moves()} mouvements")
         
         print("="*50)
+        
+        # Le prochain conseil sera presque toujours déjà dans le cache
+        self.prefetch_hints()
     
     def new_game(self):
         """Démarre un nouveau jeu avec le nombre de disques spécifié"""
         try:
             new_n_disks = int(self.disk_var.get())
-            if new_n_disks < 1 or new_n_disks > 8:
-                messagebox.showerror("Erreur", "Le nombre de disques doit être entre 1 et 8")
+            if new_n_disks < 1 or new_n_disks > MAX_DISKS:
+                messagebox.showerror("Erreur", f"Le nombre de disques doit être entre 1 et {MAX_DISKS}")
                 return
             
             self.n_disks = new_n_disks
@@ -287,70 +299,38 @@ class HanoiGame:
         """Remet le jeu à l'état initial"""
         self.stop_solving()
         
-        # Réinitialiser l'état
-        self.rods = [[], [], []]
+        # Tous les disques sur le premier bâtonnet (l'état initial est mémorisé par le moteur)
+        self.state_changed()
+        self.engine.reset()
         self.selected_rod = None
-        self.move_count = 0
-        self.solution_moves = []
-        self.solution_index = 0
-        
-        # Placer tous les disques sur le premier bâtonnet
-        for i in range(self.n_disks, 0, -1):
-            self.rods[0].append(i)
-        
-        # Sauvegarder l'état initial
-        self.initial_state = self.get_current_state()
         
         # Mettre à jour l'affichage
         self.update_display()
         self.update_info()
         self.print_possible_moves()
     
-    def update_display(self):
-        """Met à jour l'affichage du canvas"""
-        self.canvas.delete("all")
+    def update_display(self, animate: bool = False):
+        """
+        Met à jour l'affichage du canvas
         
-        # Calculer les positions des bâtonnets
-        rod_spacing = self.canvas_width // 3
-        rod_positions = [rod_spacing // 2 + i * rod_spacing for i in range(3)]
-        
-        # Dessiner la base
-        base_y = self.canvas_height - 50
-        for x in rod_positions:
-            self.canvas.create_rectangle(x - self.base_width//2, base_y, 
-                                       x + self.base_width//2, base_y + 20, 
-                                       fill='brown', outline='black')
-        
-        # Dessiner les bâtonnets
-        for i, x in enumerate(rod_positions):
-            color = 'red' if i == self.selected_rod else 'black'
-            self.canvas.create_rectangle(x - self.rod_width//2, base_y - self.rod_height, 
-                                       x + self.rod_width//2, base_y, 
-                                       fill=color, outline='black')
-        
-        # Dessiner les disques
-        for rod_idx, rod in enumerate(self.rods):
-            x = rod_positions[rod_idx]
-            for disk_idx, disk_size in enumerate(rod):
-                y = base_y - (disk_idx + 1) * self.disk_height
-                disk_width = 20 + disk_size * 15
-                color = self.disk_colors[(disk_size - 1) % len(self.disk_colors)]
-                
-                self.canvas.create_rectangle(x - disk_width//2, y - self.disk_height//2,
-                                           x + disk_width//2, y + self.disk_height//2,
-                                           fill=color, outline='black', width=2)
-                
-                # Numéro du disque
-                self.canvas.create_text(x, y, text=str(disk_size), font=('Arial', 12, 'bold'))
+        Les éléments sont créés une fois par partie ; seuls les disques déplacés
+        et la couleur du bâtonnet sélectionné sont modifiés ensuite.
+        
+        Args:
+            animate: Faire glisser les disques déplacés vers leur nouvelle place
+        """
+        self.renderer.render(self.rods, self.selected_rod, animate)
     
     def update_info(self):
         """Met à jour les informations affichées"""
         self.move_label.config(text=f"Mouvements: {self.move_count}")
-        self.min_moves_label.config(text=f"Minimum: {calculate_min_moves(self.n_disks)}")
+        self.min_moves_label.config(text=f"Minimum: {self.engine.min_moves()}")
         
-        if self.is_solving:
+        if self.is_solving and self.playback is not None:
+            self.status_label.config(text=f"Résolution en cours... ({self.playback.moves_per_second():.0f} coups/s)")
+        elif self.is_solving:
             self.status_label.config(text="Résolution en cours...")
-        elif self.is_game_won():
+        elif self.engine.is_game_won():
             self.status_label.config(text="Jeu terminé !")
         else:
             self.status_label.config(text="En cours")
@@ -386,20 +366,22 @@ class HanoiGame:
                 self.update_display()
             else:
                 # Tenter le mouvement
-                if self.move_disk(self.selected_rod, rod):
-                    self.move_count += 1
+                if self.engine.play(f"{self.selected_rod + 1}->{rod + 1}"):
                     self.selected_rod = None
-                    self.update_display()
+                    # Une solution calculée pour l'état précédent n'est plus valable
+                    self.engine.clear_solution()
+                    self.state_changed()
+                    self.update_display(animate=True)
                     self.update_info()
                     
                     # Afficher les nouveaux coups possibles
                     self.print_possible_moves()
                     
                     # Vérifier si le jeu est gagné
-                    if self.is_game_won():
+                    if self.engine.is_game_won():
                         messagebox.showinfo("Félicitations !", 
                                           f"Vous avez résolu le puzzle en {self.move_count} mouvements !\n"
-                                          f"Minimum théorique: {calculate_min_moves(self.n_disks)}")
+                                          f"Minimum théorique: {self.engine.min_moves()}")
                 else:
                     messagebox.showwarning("Mouvement invalide", 
                                          "Ce mouvement n'est pas autorisé selon les règles du jeu.")
@@ -412,108 +394,144 @@ class HanoiGame:
         else:
             self.canvas.config(cursor="")
     
-    def can_move(self, from_rod: int, to_rod: int) -> bool:
-        """Vérifie si un mouvement est valide"""
-        if not self.rods[from_rod]:
-            return False
-        
-        if not self.rods[to_rod]:
-            return True
-        
-        return self.rods[from_rod][-1] < self.rods[to_rod][-1]
-    
-    def move_disk(self, from_rod: int, to_rod: int):
-        """Déplace un disque d'un bâtonnet à un autre"""
-        if self.can_move(from_rod, to_rod):
-            disk = self.rods[from_rod].pop()
-            self.rods[to_rod].append(disk)
-            return True
-        return False
+    def request_solution(self, callback):
+        """
+        Calcule la solution depuis l'état actuel dans le thread de calcul
+        
+        Args:
+            callback: Appelé dans le thread Tk avec la liste des mouvements
+        """
+        if self.worker.is_busy("solve"):
+            return
+        rods = self.engine.get_current_state()
+        self.status_label.config(text="Calcul de la solution...")
+        self.worker.submit("solve", self.state_version,
+                           lambda cancel: self.engine.compute_solution(rods, cancel),
+                           callback, on_error=self.on_solve_error)
     
-    def is_game_won(self) -> bool:
-        """Vérifie si le jeu est gagné"""
-        return len(self.rods[2]) == self.n_disks
+    def on_solve_error(self, error: Exception):
+        """Signale l'échec du calcul de la solution"""
+        print(f"❌ Erreur lors du calcul de la solution: {error}")
+        self.update_info()
+        messagebox.showerror("Erreur", f"Impossible de calculer la solution: {error}")
     
     def solve_auto(self):
         """Lance la résolution automatique depuis l'état actuel"""
         if self.is_solving:
             return
         
-        if self.is_game_won():
+        if self.engine.is_game_won():
             messagebox.showinfo("Jeu terminé", "Le jeu est déjà résolu !")
             return
         
         print("\n🤖 RÉSOLUTION AUTOMATIQUE DEPUIS L'ÉTAT ACTUEL")
         print("="*50)
         
-        # Utiliser le solveur BFS pour calculer la solution optimale
-        try:
-            self.solution_moves = self.solve_from_current_state_bfs()
-            self.solution_index = 0
-            
-            if self.solution_moves:
-                print(f"🎯 Solution optimale calculée: {len(self.solution_moves)} mouvements")
+        # La solution optimale est calculée en arrière-plan ; l'interface reste réactive
+        self.request_solution(self.start_auto_solve)
+    
+    def start_auto_solve(self, moves: List[str]):
+        """Démarre la résolution automatique avec la solution calculée"""
+        self.solution_moves = moves
+        self.solution_index = 0
+        
+        if self.solution_moves:
+            print(f"🎯 Solution optimale calculée: {len(self.solution_moves)} mouvements")
+            if len(self.solution_moves) <= 100:
                 print(f"📋 Séquence: {' → '.join(self.solution_moves)}")
-                
-                self.is_solving = True
-                
-                # Démarrer la résolution automatique dans un thread séparé
-                threading.Thread(target=self.auto_solve_thread, daemon=True).start()
-            else:
-                print("❌ Aucune solution trouvée (erreur)")
-                
-        except Exception as e:
-            print(f"❌ Erreur lors du calcul de la solution: {e}")
-            messagebox.showerror("Erreur", f"Impossible de calculer la solution: {e}")
-    
-    def auto_solve_thread(self):
-        """Thread pour la résolution automatique"""
-        while self.is_solving and self.solution_index < len(self.solution_moves):
-            if not self.is_solving:
-                break
             
-            # Exécuter le mouvement suivant
-            self.master.after(0, self.execute_next_move)
-            time.sleep(1)  # Pause d'une seconde entre les mouvements
-        
-        if self.is_solving:
-            self.master.after(0, self.stop_solving)
+            self.is_solving = True
+            self.update_info()
+            
+            # Lecture dans la boucle d'événements Tk, à la vitesse choisie
+            self.playback = Playback(self.master, self.solution_moves, self.apply_solution_move,
+                                     self.render_playback, self.on_playback_finished,
+                                     speed=self.speed, progress=self.update_info)
+            self.playback.set_render_enabled(self.render_var.get())
+            self.playback.start()
+        else:
+            print("❌ Aucune solution trouvée (erreur)")
+            self.update_info()
+    
+    def apply_solution_move(self, move: str):
+        """Applique un mouvement de la solution sans le dessiner (appelé par la lecture)"""
+        if self.engine.play(move):
+            self.solution_index += 1
+            # Aux vitesses élevées (et pour un saut à la fin), le terminal ralentirait la lecture
+            if self.playback is not None and self.playback.skipping:
+                return
+            if self.speed is not None and self.speed <= 10:
+                print(f"🤖 Mouvement automatique: {move}")
+    
+    def render_playback(self):
+        """Dessine l'état atteint à la fin d'une image de la lecture"""
+        self.state_changed()
+        self.update_display(animate=self.speed is not None and self.speed <= 2)
+        self.update_info()
+    
+    def on_playback_finished(self):
+        """Fin de la lecture : affiche le bilan et l'état final"""
+        self.stop_solving()
+        self.print_possible_moves()
+    
+    @staticmethod
+    def speed_label(speed: Optional[int]) -> str:
+        """Texte affiché pour une vitesse dans la liste déroulante"""
+        return "Max" if speed is None else f"{speed}/s"
+    
+    def on_speed_change(self, event=None):
+        """Applique la vitesse choisie, y compris pendant une lecture"""
+        labels = {self.speed_label(speed): speed for speed in SPEEDS}
+        self.speed = labels.get(self.speed_var.get(), SPEEDS[0])
+        if self.playback is not None:
+            self.playback.set_speed(self.speed)
+    
+    def on_render_toggle(self):
+        """Suspend ou reprend le dessin pendant la lecture"""
+        if self.playback is not None:
+            self.playback.set_render_enabled(self.render_var.get())
+    
+    def skip_to_end(self):
+        """Applique immédiatement tous les mouvements restants de la lecture"""
+        if self.playback is not None:
+            self.playback.skip_to_end()
     
     def execute_next_move(self):
         """Exécute le mouvement suivant de la solution"""
-        if self.solution_index < len(self.solution_moves):
-            move = self.solution_moves[self.solution_index]
-            from_rod, to_rod = map(int, move.split('->'))
-            from_rod -= 1  # Convertir en index 0-based
-            to_rod -= 1
-            
+        move = self.engine.play_next_solution_move()
+        if move is not None:
             print(f"🤖 Mouvement automatique: {move}")
-            
-            if self.move_disk(from_rod, to_rod):
-                self.move_count += 1
-                self.solution_index += 1
-                self.update_display()
-                self.update_info()
-                self.print_possible_moves()
+            self.state_changed()
+            self.update_display(animate=True)
+            self.update_info()
+            self.print_possible_moves()
     
     def next_step(self):
         """Exécute la prochaine étape de la solution"""
+        if self.is_solving:
+            return
+        
         if not self.solution_moves:
-            # Calculer la solution depuis l'état actuel avec BFS
-            try:
-                self.solution_moves = self.solve_from_current_state_bfs()
-                self.solution_index = 0
-                
-                if self.solution_moves:
-                    print(f"💡 Solution calculée: {len(self.solution_moves)} mouvements restants")
-                else:
-                    print("❌ Aucune solution trouvée")
-                    return
-                    
-            except Exception as e:
-                print(f"❌ Erreur lors du calcul: {e}")
-                return
+            # Calculer la solution depuis l'état actuel (en arrière-plan)
+            self.request_solution(self.on_step_solution)
+            return
+        
+        self.execute_step()
+    
+    def on_step_solution(self, moves: List[str]):
+        """Reçoit la solution demandée par next_step et joue sa première étape"""
+        self.solution_moves = moves
+        self.solution_index = 0
+        self.update_info()
         
+        if self.solution_moves:
+            print(f"💡 Solution calculée: {len(self.solution_moves)} mouvements restants")
+            self.execute_step()
+        else:
+            print("❌ Aucune solution trouvée")
+    
+    def execute_step(self):
+        """Joue l'étape courante de la solution déjà calculée"""
         if self.solution_index < len(self.solution_moves):
             move = self.solution_moves[self.solution_index]
             print(f"👆 Étape suivante suggérée: {move}")
@@ -522,8 +540,19 @@ class HanoiGame:
             messagebox.showinfo("Solution terminée", "Toutes les étapes ont été exécutées !")
     
     def stop_solving(self):
-        """Arrête la résolution automatique"""
+        """Arrête la résolution automatique (et un éventuel calcul de solution en cours)"""
         self.is_solving = False
+        self.worker.cancel("solve")
+        
+        if self.playback is not None:
+            playback, self.playback = self.playback, None
+            rate = playback.moves_per_second()
+            playback.stop()
+            self.state_changed()
+            self.update_display()
+            print(f"\n⏱️  {playback.index - playback.start_index} mouvements joués ({rate:.0f} mouvements/s, "
+                  f"{playback.frames} images)")
+        
         self.update_info()
         print("\n⏹️  Résolution automatique arrêtée")
 
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Cache des conseils (coup recommandé, distance restante) indexé par état du jeu
+Cache LRU borné avec préchargement en arrière-plan des états voisins
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+Hint = Tuple[Optional[str], Optional[int]]
+StateKey = Tuple[Tuple[int, ...], ...]
+
+
+class HintCache:
+    """
+    Cache LRU (état -> conseil) partagé entre l'interface et un thread de préchargement
+    
+    compute(rods) calcule le conseil d'un état ; il doit pouvoir être appelé
+    depuis un autre thread que celui de l'interface.
+    """
+    
+    def __init__(self, compute: Callable[[List[List[int]]], Hint], maxsize: int = 4096):
+        self.compute = compute
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[StateKey, Hint]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # États en attente de préchargement (seule la dernière demande compte)
+        self._pending: List[StateKey] = []
+        self._wakeup = threading.Condition(self._lock)
+        self._worker: Optional[threading.Thread] = None
+        
+        # Compteurs pour le réglage
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def key(rods: List[List[int]]) -> StateKey:
+        """Convertit un état en clé de dictionnaire"""
+        return tuple(tuple(rod) for rod in rods)
+    
+    def _store(self, key: StateKey, hint: Hint) -> None:
+        # Appelé avec le verrou
+        self._entries[key] = hint
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def get(self, rods: List[List[int]]) -> Hint:
+        """Retourne le conseil d'un état, calculé si nécessaire"""
+        key = self.key(rods)
+        with self._lock:
+            hint = self._entries.get(key)
+            if hint is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return hint
+            self.misses += 1
+        
+        hint = self.compute(rods)
+        with self._lock:
+            self._store(key, hint)
+        return hint
+    
+    def peek(self, rods: List[List[int]]) -> Optional[Hint]:
+        """Retourne le conseil d'un état s'il est déjà dans le cache, sans le calculer"""
+        key = self.key(rods)
+        with self._lock:
+            hint = self._entries.get(key)
+            if hint is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return hint
+    
+    def put(self, rods: List[List[int]], hint: Hint) -> None:
+        """Enregistre un conseil calculé ailleurs (par exemple par le solveur en arrière-plan)"""
+        with self._lock:
+            self.misses += 1
+            self._store(self.key(rods), hint)
+    
+    def prefetch(self, states: Iterable[List[List[int]]]) -> None:
+        """Demande le calcul en arrière-plan des conseils de ces états (remplace la demande précédente)"""
+        with self._lock:
+            self._pending = [key for key in map(self.key, states) if key not in self._entries]
+            if not self._pending:
+                return
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._prefetch_loop, daemon=True)
+                self._worker.start()
+            self._wakeup.notify()
+    
+    def _prefetch_loop(self) -> None:
+        """Thread de préchargement : calcule les conseils des états en attente"""
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._wakeup.wait()
+                key = self._pending.pop()
+                if key in self._entries:
+                    continue
+            
+            try:
+                hint = self.compute([list(rod) for rod in key])
+            except Exception as e:
+                print(f"Erreur lors du préchargement d'un conseil: {e}")
+                continue
+            
+            with self._lock:
+                if key not in self._entries:
+                    self._store(key, hint)
+                    self.prefetched += 1
+    
+    def clear(self) -> None:
+        """Vide le cache et annule les préchargements en attente"""
+        with self._lock:
+            self._entries.clear()
+            self._pending = []
+    
+    def stats(self) -> Dict[str, float]:
+        """Retourne les compteurs du cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "prefetched": self.prefetched,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
@@ -4,13 +4,17 @@ Script principal pour le jeu de la Tour de Hanoï
 Point d'entrée de l'application avec choix entre mode console et interface graphique
 """
 
+import contextlib
+import os
 import sys
 import argparse
 from typing import Optional
 
-# Import des modules du projet
-from solve import solve_hanoi, calculate_min_moves, parse_input
-from graphics import main as graphics_main
+# Import des modules du projet ; l'interface graphique (tkinter), le mode lot
+# (concurrent.futures) et les statistiques (--profile) ne sont importés que dans
+# le mode qui les utilise
+from solve import iter_solution_pairs, calculate_min_moves, parse_input
+from output import FORMATS, open_output, write_moves
 
 
 def print_banner():
@@ -26,44 +30,250 @@ def print_banner():
     print(banner)
 
 
-def console_mode(input_str: str):
+def console_mode(input_str: str, output_path: Optional[str] = None, output_format: str = "text",
+                 count_only: bool = False, profile: Optional[str] = None, cache=None):
     """
     Mode console pour résoudre la Tour de Hanoï
     
+    Les décorations (titres, emojis) ne sont affichées que si la sortie standard
+    est un terminal ; dans un tube, seuls les mouvements sont écrits.
+    
     Args:
-        input_str: Chaîne d'entrée au format "n_disks,n_rods"
+        input_str: Chaîne d'entrée au format "n_disks,n_rods", ou "départ>arrivée"
+                   pour des états quelconques (ex: "3,2,1||>|3,2,1|", voir state_solver.parse_state)
+        output_path: Fichier de sortie des mouvements (None ou "-" pour la sortie standard)
+        output_format: Format des mouvements (voir output.FORMATS)
+        count_only: N'afficher que le nombre de mouvements, sans les générer
+        profile: Si défini, mesure la génération ; "-" affiche les statistiques sur
+                 la sortie d'erreur, sinon elles sont écrites en JSON dans ce fichier
+        cache: SolutionCache optionnel où prendre (et garder) la solution ; sans
+               cache, les mouvements sont générés au fil de l'écriture
     """
+    decorated = sys.stdout.isatty()
+    to_stdout = output_path in (None, "-")
+    
     try:
-        n_disks, n_rods = parse_input(input_str)
+        start_goal = None
+        if ">" in input_str:
+            start_goal, min_moves, pairs = _start_goal_solution(input_str)
+            n_disks, n_rods = sum(len(rod) for rod in start_goal[0]), len(start_goal[0])
+        else:
+            n_disks, n_rods = parse_input(input_str)
+            min_moves = calculate_min_moves(n_disks, n_rods)
         
-        print(f"\n🎯 Résolution de la Tour de Hanoï:")
-        print(f"   • Nombre de disques: {n_disks}")
-        print(f"   • Nombre de bâtonnets: {n_rods}")
-        print(f"   • Nombre minimum de mouvements: {calculate_min_moves(n_disks)}")
-        print("\n📋 Séquence de mouvements:")
-        print("   " + "─" * 40)
+        if count_only:
+            print(f"🎯 Nombre minimum de mouvements: {min_moves}" if decorated else min_moves)
+            return
         
-        moves = solve_hanoi(n_disks, n_rods, verbose=True)
+        if to_stdout and output_format == "binary" and decorated:
+            raise ValueError("Le format binaire ne peut pas être affiché dans un terminal (utilisez --output)")
         
-        print("   " + "─" * 40)
-        print(f"\n✅ Résolution terminée en {len(moves)} mouvements.")
+        if decorated:
+            print(f"\n🎯 Résolution de la Tour de Hanoï:")
+            print(f"   • Nombre de disques: {n_disks}")
+            print(f"   • Nombre de bâtonnets: {n_rods}")
+            if start_goal is not None:
+                from state_solver import format_state
+                print(f"   • Départ: {format_state(start_goal[0])}  →  Arrivée: {format_state(start_goal[1])}")
+            print(f"   • Nombre minimum de mouvements: {min_moves}")
+            if to_stdout:
+                print("\n📋 Séquence de mouvements:")
+                print("   " + "─" * 40)
         
-        if len(moves) == calculate_min_moves(n_disks):
-            print("🏆 Solution optimale atteinte !")
+        # Les mouvements sont écrits par gros blocs, sans construire la liste
+        sys.stdout.flush()
+        stats = None
+        if profile is not None:
+            # stats importe tracemalloc et json : seulement quand on mesure
+            from stats import SolverStats
+            if start_goal is not None:
+                stats = SolverStats("direct" if n_rods == 3 else "BFS")
+            else:
+                stats = SolverStats("classique" if n_rods == 3 else "Frame-Stewart")
+        stream = open_output(output_path)
+        try:
+            with stats.measure(trace_memory=True) if stats is not None else contextlib.nullcontext():
+                if start_goal is not None:
+                    n_moves = write_moves(stream, pairs, n_rods, output_format, min_moves)
+                elif cache is None:
+                    n_moves = write_moves(stream, iter_solution_pairs(n_disks, n_rods), n_rods,
+                                          output_format, min_moves)
+                else:
+                    n_moves = write_cached_solution(stream, cache.get(n_disks, n_rods), output_format)
+        finally:
+            if to_stdout:
+                stream.flush()
+            else:
+                stream.close()
+        if stats is not None:
+            stats.moves_generated = n_moves
         
-    except ValueError as e:
-        print(f"❌ Erreur: {e}")
+        if profile == "-":
+            # Sur la sortie d'erreur, pour ne pas se mêler aux mouvements
+            print(stats.format(), file=sys.stderr)
+        elif profile is not None:
+            with open(profile, "w", encoding="utf-8") as f:
+                f.write(stats.to_json() + "\n")
+        
+        if decorated:
+            if to_stdout:
+                print("   " + "─" * 40)
+            else:
+                print(f"\n💾 Mouvements écrits dans {output_path} (format {output_format})")
+            print(f"\n✅ Résolution terminée en {n_moves} mouvements.")
+            
+            if n_moves == min_moves:
+                print("🏆 Solution optimale atteinte !")
+    
+    except BrokenPipeError:
+        # Le lecteur du tube (head...) a fermé sa sortie : on s'arrête sans message
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(0)
+    except (ValueError, OSError) as e:
+        if decorated:
+            print(f"❌ Erreur: {e}")
+        else:
+            print(f"Erreur: {e}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n\n⏹️  Interruption par l'utilisateur")
+        sys.exit(0)
+
+
+def _start_goal_solution(input_str: str):
+    """
+    Solution entre deux états quelconques "départ>arrivée"
+    
+    Returns:
+        ((départ, arrivée), nombre minimum de mouvements, itérateur des mouvements (source, destination))
+    """
+    from state_solver import distance_between, iter_pairs_between, parse_start_goal, solve_between
+    
+    start, goal = parse_start_goal(input_str)
+    if len(start) == 3:
+        # Distance en O(n) ; les mouvements ne sont générés qu'à l'écriture
+        return (start, goal), distance_between(start, goal), iter_pairs_between(start, goal)
+    moves = solve_between(start, goal)
+    return (start, goal), len(moves), (tuple(map(int, move.split("->"))) for move in moves)
+
+
+def write_cached_solution(stream, solution, output_format: str) -> int:
+    """
+    Écrit une solution du cache ; une solution empaquetée est écrite telle quelle en binaire
+    
+    Returns:
+        Nombre de mouvements écrits
+    """
+    from move_buffer import MoveBuffer
+    from solution_cache import iter_pairs
+    
+    if output_format == "binary" and isinstance(solution, MoveBuffer):
+        solution.tofile(stream)
+        return len(solution)
+    return write_moves(stream, iter_pairs(solution), solution.n_rods, output_format, len(solution))
+
+
+def serve_mode(port: Optional[int] = None, unix_path: Optional[str] = None, jobs: Optional[int] = None,
+               cache_size: Optional[int] = None, cache_dir: Optional[str] = None):
+    """
+    Lance le service local de résolution (HTTP/JSON, voir server.py)
+    
+    Args:
+        port: Port TCP sur 127.0.0.1 (server.DEFAULT_PORT par défaut)
+        unix_path: Socket Unix où écouter au lieu de TCP
+        jobs: Nombre de processus de calcul (nombre de processeurs par défaut)
+        cache_size: Budget mémoire du cache des solutions en Mo
+        cache_dir: Répertoire du niveau disque du cache (désactivé par défaut)
+    """
+    from server import DEFAULT_HOST, DEFAULT_PORT, serve
+    from solution_cache import DEFAULT_MAX_BYTES, SolutionCache
+    
+    try:
+        cache = SolutionCache(DEFAULT_MAX_BYTES if cache_size is None else cache_size << 20, cache_dir)
+        serve(DEFAULT_HOST, DEFAULT_PORT if port is None else port, unix_path, jobs, cache)
+    except (ValueError, OSError) as e:
+        print(f"Erreur: {e}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n⏹️  Service arrêté")
+
+
+def batch_mode(source: str, output_dir: Optional[str] = None, output_format: str = "text",
+               jobs: Optional[int] = None):
+    """
+    Résout toutes les configurations d'un fichier en parallèle
+    
+    Un résumé par configuration est affiché dès qu'il est prêt : texte dans un
+    terminal, une ligne JSON sinon.
+    
+    Args:
+        source: Fichier de configurations ("n_disks,n_rods" par ligne), "-" pour l'entrée standard
+        output_dir: Répertoire où écrire les mouvements de chaque configuration
+        output_format: Format des fichiers de mouvements
+        jobs: Nombre de processus (nombre de processeurs par défaut)
+    """
+    import json
+    from batch import format_summary, read_configs, run_batch
+    
+    decorated = sys.stdout.isatty()
+    
+    try:
+        if source == "-":
+            configs, errors, duplicates = read_configs(sys.stdin)
+        else:
+            with open(source, encoding="utf-8") as f:
+                configs, errors, duplicates = read_configs(f)
+        
+        for error in errors:
+            print(f"Configuration ignorée, {error}", file=sys.stderr)
+        if decorated:
+            print(f"\n📦 {len(configs)} configuration(s) à résoudre ({duplicates} doublon(s) retiré(s))")
+        
+        n_optimal = 0
+        n_failed = 0
+        for summary in run_batch(configs, jobs, output_dir, output_format):
+            n_optimal += summary["optimal"]
+            n_failed += summary["error"] is not None
+            print(format_summary(summary) if decorated else json.dumps(summary), flush=True)
+        
+        if decorated:
+            print(f"\n✅ {n_optimal}/{len(configs)} solution(s) optimale(s)")
+            if n_failed:
+                print(f"❌ {n_failed} configuration(s) en échec")
+        if errors or n_failed:
+            sys.exit(1)
+    
+    except OSError as e:
+        print(f"Erreur: {e}", file=sys.stderr)
         sys.exit(1)
     except KeyboardInterrupt:
         print("\n\n⏹️  Interruption par l'utilisateur")
         sys.exit(0)
 
 
-def interactive_console():
-    """Mode console interactif"""
+def interactive_console(cache_size: Optional[int] = None, cache_dir: Optional[str] = None):
+    """
+    Mode console interactif
+    
+    Les solutions sont gardées dans le cache partagé du processus : une
+    configuration déjà demandée n'est pas recalculée.
+    
+    Args:
+        cache_size: Budget mémoire du cache en Mo (voir solution_cache.DEFAULT_MAX_BYTES)
+        cache_dir: Répertoire du niveau disque du cache (désactivé par défaut)
+    """
+    from solution_cache import DEFAULT_MAX_BYTES, configure_solution_cache
+    
+    try:
+        cache = configure_solution_cache(DEFAULT_MAX_BYTES if cache_size is None else cache_size << 20,
+                                         cache_dir)
+    except ValueError as e:
+        print(f"❌ Erreur: {e}")
+        sys.exit(1)
+    
     print_banner()
     print("Mode console interactif")
-    print("Tapez 'quit' ou 'exit' pour quitter\n")
+    print("Tapez 'stats' pour les statistiques du cache, 'quit' ou 'exit' pour quitter\n")
     
     while True:
         try:
@@ -76,7 +286,12 @@ def interactive_console():
             if not user_input:
                 continue
             
-            console_mode(user_input)
+            if user_input.lower() == 'stats':
+                print(cache.format_stats())
+                print()
+                continue
+            
+            console_mode(user_input, cache=cache)
             print("\n" + "="*60 + "\n")
             
         except KeyboardInterrupt:
@@ -105,23 +320,60 @@ MODES:
     
     3. Mode console interactif:
        python main.py --console
+    
+    4. Mode lot (plusieurs configurations en parallèle):
+       python main.py --batch configs.txt
+       cat configs.txt | python main.py --batch - -o resultats/ -f binary
+    
+    5. Service local de résolution (HTTP/JSON):
+       python main.py --serve
+       curl 'http://127.0.0.1:8765/solve?config=20,3&format=csv'
 
 OPTIONS:
     -h, --help      Affiche cette aide
     -g, --gui       Lance l'interface graphique (par défaut)
     -c, --console   Mode console interactif
     -v, --version   Affiche la version
+    -o, --output FICHIER
+                    Écrit les mouvements dans un fichier ("-" : sortie standard)
+    -f, --format {text,csv,jsonl,binary}
+                    Format des mouvements (text par défaut ; binary : 4 bits par mouvement)
+    --count-only    Affiche seulement le nombre de mouvements
+    --profile [FICHIER]
+                    Mesure la résolution (durée, pic mémoire...) ; statistiques sur
+                    la sortie d'erreur, ou en JSON dans FICHIER
+    -b, --batch FICHIER
+                    Résout une configuration par ligne ("-" : entrée standard) ;
+                    avec -o, les mouvements sont écrits dans ce répertoire
+    -j, --jobs N    Nombre de processus du mode lot (par défaut : nombre de processeurs)
+    --cache-size MO Budget mémoire du cache des solutions (mode interactif et service,
+                    64 Mo par défaut)
+    --cache-dir [RÉPERTOIRE]
+                    Garde aussi les solutions sur disque, d'une session à l'autre
+                    (par défaut : ~/.cache/hanoi-tower/solutions)
+    --serve         Lance le service local de résolution (HTTP/JSON sur 127.0.0.1)
+    --port PORT     Port du service (8765 par défaut)
+    --unix CHEMIN   Écoute sur un socket Unix au lieu du port TCP
+                    Points d'accès : GET /solve, /move, /count ; POST /hint
 
 EXEMPLES:
     python main.py                    # Interface graphique
     python main.py "4,3"              # Résout 4 disques en mode console
     python main.py --console          # Mode console interactif
+    python main.py --console --cache-size 256 --cache-dir
     python main.py --gui              # Force l'interface graphique
+    python main.py "20,3" -o moves.bin -f binary
+    python main.py "12,4" -f jsonl | jq .source
 
 FORMAT DE CONFIGURATION:
     "n_disks,n_rods" où:
     - n_disks: nombre de disques (1-20)
     - n_rods: nombre de bâtonnets (3 minimum)
+    
+    "départ>arrivée" pour aller d'un état quelconque à un autre, où chaque
+    état liste les bâtonnets séparés par "|", et leurs disques du bas vers le haut:
+    python main.py "3,2,1||>|3,2,1|"   # Tour du bâtonnet 1 vers le bâtonnet 2
+    python main.py "3|2|1>1|2|3"       # Optimal à 3 bâtonnets, BFS au-delà
 
 RÈGLES DU JEU:
     1. Un seul disque peut être déplacé à la fois
@@ -144,6 +396,19 @@ def main():
     parser.add_argument('-g', '--gui', action='store_true', help='Lance l\'interface graphique')
     parser.add_argument('-c', '--console', action='store_true', help='Mode console interactif')
     parser.add_argument('-v', '--version', action='store_true', help='Affiche la version')
+    parser.add_argument('-o', '--output', help='Fichier de sortie des mouvements')
+    parser.add_argument('-f', '--format', choices=FORMATS, default='text', help='Format des mouvements')
+    parser.add_argument('--count-only', action='store_true', help='Affiche seulement le nombre de mouvements')
+    parser.add_argument('--profile', nargs='?', const='-', metavar='FICHIER',
+                        help='Statistiques de résolution (sortie d\'erreur, ou JSON dans FICHIER)')
+    parser.add_argument('-b', '--batch', metavar='FICHIER', help='Fichier de configurations ("-" : entrée standard)')
+    parser.add_argument('-j', '--jobs', type=int, help='Nombre de processus du mode lot')
+    parser.add_argument('--cache-size', type=int, metavar='MO', help='Budget mémoire du cache des solutions (Mo)')
+    parser.add_argument('--cache-dir', nargs='?', const='', metavar='RÉPERTOIRE',
+                        help='Répertoire du cache des solutions sur disque')
+    parser.add_argument('--serve', action='store_true', help='Lance le service local de résolution')
+    parser.add_argument('--port', type=int, help='Port du service')
+    parser.add_argument('--unix', metavar='CHEMIN', help='Socket Unix du service')
     
     args = parser.parse_args()
     
@@ -157,15 +422,29 @@ def main():
         print("Développé comme projet éducatif")
         return
     
+    cache_dir = args.cache_dir
+    if cache_dir == '':
+        from solution_cache import default_solution_dir
+        cache_dir = default_solution_dir()
+    
     # Déterminer le mode d'exécution
-    if args.config:
-        # Mode console avec configuration directe
-        print_banner()
-        console_mode(args.config)
+    if args.serve:
+        # Service local : un processus pour tous les clients
+        serve_mode(args.port, args.unix, args.jobs, args.cache_size, cache_dir)
+    
+    elif args.batch:
+        # Mode lot : une configuration par ligne
+        batch_mode(args.batch, args.output, args.format, args.jobs)
+    
+    elif args.config:
+        # Mode console avec configuration directe (sans bannière dans un tube)
+        if sys.stdout.isatty():
+            print_banner()
+        console_mode(args.config, args.output, args.format, args.count_only, args.profile)
     
     elif args.console:
         # Mode console interactif
-        interactive_console()
+        interactive_console(args.cache_size, cache_dir)
     
     else:
         # Mode interface graphique (par défaut)
@@ -173,6 +452,7 @@ def main():
             print_banner()
             print("Lancement de l'interface graphique...")
             print("Fermez la fenêtre pour quitter.\n")
+            from graphics import main as graphics_main
             graphics_main()
         except ImportError as e:
             print(f"❌ Erreur: Impossible de lancer l'interface graphique: {e}")
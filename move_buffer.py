@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Représentation compacte des mouvements de la Tour de Hanoï
+Chaque mouvement est codé sur 4 bits (jusqu'à 4 bâtonnets) ou sur un octet
+"""
+
+import struct
+from collections.abc import Sequence
+from typing import BinaryIO, Iterable, Iterator, List, Tuple, Union
+
+# En-tête des fichiers : signature, version, nombre de bâtonnets, bits par mouvement, nombre de mouvements
+_HEADER = struct.Struct("<4sBBBQ")
+_MAGIC = b"HNOI"
+_VERSION = 1
+
+# Nombre maximal de bâtonnets représentables sur un octet (4 bits par bâtonnet)
+MAX_RODS = 16
+
+
+def write_header(f: BinaryIO, n_rods: int, n_moves: int) -> None:
+    """
+    Écrit l'en-tête d'un fichier de mouvements
+    
+    Permet d'écrire les données par blocs à la suite, sans construire tout le tampon.
+    """
+    bits_per_move = 4 if n_rods <= 4 else 8
+    f.write(_HEADER.pack(_MAGIC, _VERSION, n_rods, bits_per_move, n_moves))
+
+
+class MoveBuffer(Sequence):
+    """
+    Séquence de mouvements stockée dans un bytearray
+    
+    Avec 3 ou 4 bâtonnets, deux mouvements sont rangés par octet (premier
+    mouvement dans les 4 bits de poids fort) ; au-delà, un mouvement par octet.
+    Le code d'un mouvement est (source-1, destination-1) concaténés.
+    Les mouvements sont décodés en chaînes "a->b" uniquement à la lecture.
+    """
+    
+    def __init__(self, n_rods: int = 3, data: Union[bytes, bytearray, memoryview, None] = None,
+                 n_moves: int = 0):
+        if n_rods < 3 or n_rods > MAX_RODS:
+            raise ValueError(f"Le nombre de bâtonnets doit être entre 3 et {MAX_RODS}")
+        
+        self.n_rods = n_rods
+        self.bits_per_move = 4 if n_rods <= 4 else 8
+        self._shift = 2 if self.bits_per_move == 4 else 4
+        self._data = bytearray(data) if data is not None else bytearray()
+        self._n_moves = n_moves
+        
+        if len(self._data) != self._bytes_for(n_moves):
+            raise ValueError("La taille des données ne correspond pas au nombre de mouvements")
+        
+        # Table de décodage code -> "a->b"
+        self._names = [f"{(code >> self._shift) + 1}->{(code & ((1 << self._shift) - 1)) + 1}"
+                       for code in range(1 << self.bits_per_move)]
+    
+    def _bytes_for(self, n_moves: int) -> int:
+        return (n_moves + 1) // 2 if self.bits_per_move == 4 else n_moves
+    
+    def encode(self, source: int, destination: int) -> int:
+        """Retourne le code d'un mouvement (bâtonnets numérotés à partir de 1)"""
+        if not (1 <= source <= self.n_rods and 1 <= destination <= self.n_rods):
+            raise ValueError(f"Mouvement invalide: {source}->{destination}")
+        return ((source - 1) << self._shift) | (destination - 1)
+    
+    def append(self, source: int, destination: int) -> None:
+        """Ajoute un mouvement à la fin du tampon"""
+        code = self.encode(source, destination)
+        if self.bits_per_move == 8:
+            self._data.append(code)
+        elif self._n_moves % 2 == 0:
+            self._data.append(code << 4)
+        else:
+            self._data[-1] |= code
+        self._n_moves += 1
+    
+    def extend(self, pairs: Iterable[Tuple[int, int]]) -> None:
+        """Ajoute une suite de mouvements (source, destination)"""
+        for source, destination in pairs:
+            self.append(source, destination)
+    
+    def extend_arrays(self, sources, destinations) -> None:
+        """
+        Ajoute un bloc de mouvements donné par deux tableaux NumPy d'entiers
+        
+        Le bloc est codé et empaqueté en une fois (sans boucle Python par mouvement).
+        
+        Args:
+            sources: Bâtonnets de départ (numérotés à partir de 1)
+            destinations: Bâtonnets d'arrivée, de même taille
+        """
+        if sources.shape != destinations.shape or sources.ndim != 1:
+            raise ValueError("Les tableaux de départ et d'arrivée doivent avoir la même taille")
+        if not sources.size:
+            return
+        if min(sources.min(), destinations.min()) < 1 or max(sources.max(), destinations.max()) > self.n_rods:
+            raise ValueError(f"Mouvement invalide pour {self.n_rods} bâtonnets")
+        
+        codes = ((sources.astype("uint8") - 1) << self._shift) | (destinations.astype("uint8") - 1)
+        if self.bits_per_move == 8:
+            self._data += codes.tobytes()
+            self._n_moves += codes.size
+            return
+        
+        # Compléter l'octet entamé par le dernier mouvement, puis deux mouvements par octet
+        if self._n_moves % 2:
+            self._data[-1] |= int(codes[0])
+            self._n_moves += 1
+            codes = codes[1:]
+        if codes.size % 2:
+            last = int(codes[-1])
+            codes = codes[:-1]
+        else:
+            last = None
+        self._data += ((codes[0::2] << 4) | codes[1::2]).tobytes()
+        self._n_moves += codes.size
+        if last is not None:
+            self._data.append(last << 4)
+            self._n_moves += 1
+    
+    @classmethod
+    def from_arrays(cls, chunks: Iterable[Tuple["np.ndarray", "np.ndarray"]], n_rods: int = 3) -> "MoveBuffer":
+        """Construit un tampon à partir de blocs (sources, destinations) de tableaux NumPy"""
+        buffer = cls(n_rods)
+        for sources, destinations in chunks:
+            buffer.extend_arrays(sources, destinations)
+        return buffer
+    
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[int, int]], n_rods: int = 3) -> "MoveBuffer":
+        """Construit un tampon à partir de mouvements (source, destination)"""
+        buffer = cls(n_rods)
+        buffer.extend(pairs)
+        return buffer
+    
+    def code_at(self, k: int) -> int:
+        """Retourne le code brut du mouvement k"""
+        if k < 0:
+            k += self._n_moves
+        if not 0 <= k < self._n_moves:
+            raise IndexError("Indice de mouvement hors limites")
+        if self.bits_per_move == 8:
+            return self._data[k]
+        byte = self._data[k >> 1]
+        return byte & 0x0F if k & 1 else byte >> 4
+    
+    def move_pair(self, k: int) -> Tuple[int, int]:
+        """Retourne le mouvement k sous forme de tuple (source, destination)"""
+        code = self.code_at(k)
+        return (code >> self._shift) + 1, (code & ((1 << self._shift) - 1)) + 1
+    
+    def __len__(self) -> int:
+        return self._n_moves
+    
+    def __getitem__(self, key: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(key, slice):
+            return [self._names[self.code_at(i)] for i in range(*key.indices(self._n_moves))]
+        return self._names[self.code_at(key)]
+    
+    def __iter__(self) -> Iterator[str]:
+        names = self._names
+        if self.bits_per_move == 8:
+            for code in self._data:
+                yield names[code]
+            return
+        
+        remaining = self._n_moves
+        for byte in self._data:
+            yield names[byte >> 4]
+            if remaining > 1:
+                yield names[byte & 0x0F]
+            remaining -= 2
+    
+    def iter_pairs(self) -> Iterator[Tuple[int, int]]:
+        """Itère les mouvements sous forme de tuples (source, destination)"""
+        mask = (1 << self._shift) - 1
+        pairs = [((code >> self._shift) + 1, (code & mask) + 1) for code in range(1 << self.bits_per_move)]
+        if self.bits_per_move == 8:
+            for code in self._data:
+                yield pairs[code]
+            return
+        
+        remaining = self._n_moves
+        for byte in self._data:
+            yield pairs[byte >> 4]
+            if remaining > 1:
+                yield pairs[byte & 0x0F]
+            remaining -= 2
+    
+    @property
+    def nbytes(self) -> int:
+        """Taille des données en octets"""
+        return len(self._data)
+    
+    def view(self) -> memoryview:
+        """Retourne une vue sans copie sur les données brutes"""
+        return memoryview(self._data)
+    
+    def __buffer__(self, flags: int) -> memoryview:
+        # Protocole tampon (PEP 688, Python 3.12+) : memoryview(buffer) sans copie
+        return memoryview(self._data)
+    
+    def tobytes(self) -> bytes:
+        """Retourne une copie des données brutes"""
+        return bytes(self._data)
+    
+    def tofile(self, f: BinaryIO) -> None:
+        """Écrit le tampon (en-tête puis données) dans un fichier binaire ouvert"""
+        write_header(f, self.n_rods, self._n_moves)
+        f.write(self.view())
+    
+    @classmethod
+    def fromfile(cls, f: BinaryIO) -> "MoveBuffer":
+        """Lit un tampon écrit par tofile"""
+        header = f.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError("Fichier de mouvements tronqué")
+        magic, version, n_rods, _, n_moves = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Format de fichier de mouvements non reconnu")
+        buffer = cls(n_rods)
+        buffer._data = bytearray(f.read(buffer._bytes_for(n_moves)))
+        buffer._n_moves = n_moves
+        if len(buffer._data) != buffer._bytes_for(n_moves):
+            raise ValueError("Fichier de mouvements tronqué")
+        return buffer
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, MoveBuffer):
+            return (self.n_rods, self._n_moves, self._data) == (other.n_rods, other._n_moves, other._data)
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"MoveBuffer(n_rods={self.n_rods}, n_moves={self._n_moves}, nbytes={self.nbytes})"
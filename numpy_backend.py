@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Génération vectorisée (NumPy) des mouvements de la solution, par blocs
+Le mouvement m de la solution à 3 bâtonnets se déduit des bits de m : chaque
+bloc est calculé d'un coup sur un np.arange d'indices de mouvements
+"""
+
+import math
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from frame_stewart import DEFAULT_TABLE as FRAME_STEWART_TABLE
+
+# Nombre de mouvements par bloc
+CHUNK_MOVES = 1 << 20
+
+# Au-delà, les indices de mouvements ne tiennent plus dans un uint64
+MAX_DISKS = 63
+
+Chunk = Tuple[np.ndarray, np.ndarray]
+
+
+def hanoi_block(n_disks: int, source: int, destination: int, auxiliary: int,
+                start: int, stop: int) -> Chunk:
+    """
+    Calcule les mouvements start..stop-1 (0-indexés) de la solution classique
+    
+    Même formule que solve.iter_hanoi_pairs, appliquée à tout le bloc à la fois.
+    
+    Returns:
+        Tableaux uint8 des bâtonnets de départ et d'arrivée
+    """
+    pegs = np.array((source, destination, auxiliary) if n_disks % 2 == 0 else (source, auxiliary, destination),
+                    dtype=np.uint8)
+    # Le modulo en 32 bits est nettement plus rapide ; (m | (m - 1)) + 1 <= 2^n
+    dtype = np.uint32 if n_disks <= 31 else np.uint64
+    one, three = dtype(1), dtype(3)
+    m = np.arange(start + 1, stop + 1, dtype=dtype)
+    previous = m - one
+    sources = pegs[(m & previous) % three]
+    destinations = pegs[((m | previous) + one) % three]
+    return sources, destinations
+
+
+def iter_hanoi_chunks(n_disks: int, source: int = 1, destination: int = 3, auxiliary: int = 2,
+                      chunk_size: int = CHUNK_MOVES) -> Iterator[Chunk]:
+    """
+    Génère la solution à 3 bâtonnets par blocs de chunk_size mouvements
+    
+    Args:
+        n_disks: Nombre de disques
+        source: Bâtonnet de départ
+        destination: Bâtonnet d'arrivée
+        auxiliary: Bâtonnet intermédiaire
+        chunk_size: Nombre de mouvements par bloc (le dernier peut être plus court)
+    
+    Returns:
+        Itérateur sur des couples (sources, destinations) de tableaux uint8
+    """
+    if n_disks > MAX_DISKS:
+        raise ValueError(f"Trop de disques pour la génération vectorisée (maximum {MAX_DISKS})")
+    if chunk_size <= 0:
+        raise ValueError("La taille des blocs doit être positive")
+    n_moves = (1 << max(n_disks, 0)) - 1
+    for start in range(0, n_moves, chunk_size):
+        yield hanoi_block(n_disks, source, destination, auxiliary, start, min(start + chunk_size, n_moves))
+
+
+def _iter_frame_stewart_pieces(n_disks: int, source: int, destination: int,
+                               pegs: Sequence[int], chunk_size: int) -> Iterator[Chunk]:
+    """
+    Parcourt la décomposition de Frame-Stewart (comme FrameStewartTable.iter_moves)
+    
+    Les sous-problèmes à 3 bâtonnets sont générés par blocs vectorisés au lieu
+    d'être développés mouvement par mouvement.
+    """
+    table = FRAME_STEWART_TABLE
+    table.cost(n_disks, len(pegs))
+    stack = [(n_disks, source, destination, tuple(pegs))]
+    while stack:
+        n, src, dst, available = stack.pop()
+        if n <= 0:
+            continue
+        if len(available) == 3:
+            aux = next(p for p in available if p != src and p != dst)
+            yield from iter_hanoi_chunks(n, src, dst, aux, chunk_size)
+            continue
+        if n == 1:
+            yield np.array([src], dtype=np.uint8), np.array([dst], dtype=np.uint8)
+            continue
+        
+        t = table.split(n, len(available))
+        inter = next(p for p in available if p != src and p != dst)
+        remaining = tuple(p for p in available if p != inter)
+        
+        # Empilés dans l'ordre inverse d'exécution
+        stack.append((t, inter, dst, available))
+        stack.append((n - t, src, dst, remaining))
+        stack.append((t, src, inter, available))
+
+
+def _rechunk(pieces: Iterator[Chunk], chunk_size: int) -> Iterator[Chunk]:
+    """Regroupe des morceaux de tailles quelconques en blocs de chunk_size mouvements"""
+    sources: List[np.ndarray] = []
+    destinations: List[np.ndarray] = []
+    pending = 0
+    for piece_sources, piece_destinations in pieces:
+        sources.append(piece_sources)
+        destinations.append(piece_destinations)
+        pending += piece_sources.size
+        if pending < chunk_size:
+            continue
+        all_sources = np.concatenate(sources)
+        all_destinations = np.concatenate(destinations)
+        full = pending - pending % chunk_size
+        for start in range(0, full, chunk_size):
+            yield all_sources[start:start + chunk_size], all_destinations[start:start + chunk_size]
+        sources, destinations = [all_sources[full:]], [all_destinations[full:]]
+        pending -= full
+    if pending:
+        yield np.concatenate(sources), np.concatenate(destinations)
+
+
+def iter_solution_chunks(n_disks: int, n_rods: int = 3, chunk_size: int = CHUNK_MOVES) -> Iterator[Chunk]:
+    """
+    Génère la solution 1 -> 3 (mêmes mouvements que solve.iter_solution_pairs) par blocs
+    
+    Args:
+        n_disks: Nombre de disques
+        n_rods: Nombre de bâtonnets (Frame-Stewart au-delà de 3)
+        chunk_size: Nombre de mouvements par bloc (le dernier peut être plus court)
+    
+    Returns:
+        Itérateur sur des couples (sources, destinations) de tableaux uint8
+    """
+    if n_rods < 3:
+        raise ValueError("Il faut au moins 3 bâtonnets pour résoudre la Tour de Hanoï")
+    if n_disks <= 0:
+        return iter(())
+    if n_rods == 3:
+        return iter_hanoi_chunks(n_disks, 1, 3, 2, chunk_size)
+    pieces = _iter_frame_stewart_pieces(n_disks, 1, 3, range(1, n_rods + 1), chunk_size)
+    return _rechunk(pieces, chunk_size)
+
+
+def format_chunk(sources: np.ndarray, destinations: np.ndarray, names: Sequence[str]) -> List[str]:
+    """
+    Convertit un bloc en chaînes "source->destination"
+    
+    Args:
+        names: Table des chaînes indexée par source * (n_rods + 1) + destination (voir move_names)
+    """
+    # La table a (n_rods + 1)² entrées
+    stride = math.isqrt(len(names))
+    codes = sources.astype(np.intp) * stride + destinations
+    return [names[code] for code in codes.tolist()]
+
+
+def move_names(n_rods: int) -> List[str]:
+    """Table des chaînes "a->b" indexée par a * (n_rods + 1) + b (bâtonnets numérotés à partir de 1)"""
+    stride = n_rods + 1
+    return [f"{code // stride}->{code % stride}" for code in range(stride * stride)]
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Écriture rapide des mouvements vers un fichier ou un tube
+Les mouvements sont formatés par blocs et écrits en gros morceaux (text, csv,
+jsonl ou binaire compact), au lieu d'un print() par mouvement
+"""
+
+import io
+import sys
+from itertools import islice
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from move_buffer import MoveBuffer, write_header
+
+# Formats de sortie disponibles
+FORMATS = ("text", "csv", "jsonl", "binary")
+
+# Nombre de mouvements formatés à la fois
+CHUNK_MOVES = 1 << 16
+
+# Taille du tampon d'écriture des fichiers (en octets)
+WRITE_BUFFER = 1 << 20
+
+Pair = Tuple[int, int]
+
+
+def open_output(path: Optional[str]) -> BinaryIO:
+    """
+    Ouvre la destination des mouvements en mode binaire
+    
+    Args:
+        path: Chemin du fichier, ou None / "-" pour la sortie standard
+    """
+    if path is None or path == "-":
+        return sys.stdout.buffer
+    return open(path, "wb", buffering=WRITE_BUFFER)
+
+
+def _format_text(chunk: List[Pair], start: int, names: List[List[bytes]]) -> bytes:
+    return b"".join([names[source][destination] for source, destination in chunk])
+
+
+def _format_csv(chunk: List[Pair], start: int, names: List[List[bytes]]) -> bytes:
+    return "".join([f"{step},{source},{destination}\n"
+                    for step, (source, destination) in enumerate(chunk, start + 1)]).encode()
+
+
+def _format_jsonl(chunk: List[Pair], start: int, names: List[List[bytes]]) -> bytes:
+    return "".join([f'{{"step": {step}, "source": {source}, "destination": {destination}}}\n'
+                    for step, (source, destination) in enumerate(chunk, start + 1)]).encode()
+
+
+_FORMATTERS: Dict[str, Callable[[List[Pair], int, List[List[bytes]]], bytes]] = {
+    "text": _format_text,
+    "csv": _format_csv,
+    "jsonl": _format_jsonl,
+}
+
+_CSV_HEADER = b"step,source,destination\n"
+
+
+def _pack_chunk(chunk: List[Pair], packer: MoveBuffer, table: List[List[int]]) -> bytes:
+    """Code un bloc de mouvements au format de MoveBuffer (le bloc doit être de taille paire sauf le dernier)"""
+    codes = [table[source][destination] for source, destination in chunk]
+    if packer.bits_per_move == 8:
+        return bytes(codes)
+    packed = bytes([high << 4 | low for high, low in zip(codes[0::2], codes[1::2])])
+    if len(codes) % 2:
+        packed += bytes([codes[-1] << 4])
+    return packed
+
+
+def _iter_blocks(pairs: Iterable[Pair], n_rods: int, fmt: str,
+                 n_moves: Optional[int]) -> Iterator[Tuple[bytes, int]]:
+    """Génère les blocs formatés (octets, nombre de mouvements du bloc) ; voir write_moves"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Format de sortie inconnu: {fmt} (formats: {', '.join(FORMATS)})")
+    
+    packer = None
+    if fmt == "binary":
+        if n_moves is None:
+            raise ValueError("Le nombre de mouvements est requis pour le format binaire")
+        packer = MoveBuffer(n_rods)
+        codes = [[packer.encode(source, destination) if source != destination else 0
+                  for destination in range(1, n_rods + 1)] for source in range(1, n_rods + 1)]
+        # Indices à partir de 1, comme les bâtonnets
+        table = [[0] * (n_rods + 1)] + [[0] + row for row in codes]
+        header = io.BytesIO()
+        write_header(header, n_rods, n_moves)
+        yield header.getvalue(), 0
+    elif fmt == "csv":
+        yield _CSV_HEADER, 0
+    
+    names = [[f"{source}->{destination}\n".encode() for destination in range(n_rods + 1)]
+             for source in range(n_rods + 1)]
+    formatter = _FORMATTERS.get(fmt)
+    
+    pairs = iter(pairs)
+    written = 0
+    while True:
+        chunk = list(islice(pairs, CHUNK_MOVES))
+        if not chunk:
+            break
+        if packer is not None:
+            yield _pack_chunk(chunk, packer, table), len(chunk)
+        else:
+            yield formatter(chunk, written, names), len(chunk)
+        written += len(chunk)
+    
+    if n_moves is not None and fmt == "binary" and written != n_moves:
+        raise ValueError(f"{written} mouvements écrits au lieu des {n_moves} annoncés dans l'en-tête")
+
+
+def iter_formatted(pairs: Iterable[Pair], n_rods: int = 3, fmt: str = "text",
+                   n_moves: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Formate une suite de mouvements en blocs d'octets, sans les écrire
+    
+    Mêmes arguments que write_moves ; l'en-tête éventuel (binaire, CSV) est le
+    premier bloc, puis un bloc par CHUNK_MOVES mouvements.
+    """
+    for block, _ in _iter_blocks(pairs, n_rods, fmt, n_moves):
+        yield block
+
+
+def write_moves(stream: BinaryIO, pairs: Iterable[Pair], n_rods: int = 3, fmt: str = "text",
+                n_moves: Optional[int] = None) -> int:
+    """
+    Écrit une suite de mouvements dans un flux binaire
+    
+    Args:
+        stream: Flux ouvert en écriture binaire (voir open_output)
+        pairs: Mouvements (source, destination), bâtonnets numérotés à partir de 1
+        n_rods: Nombre de bâtonnets
+        fmt: "text" (a->b par ligne), "csv", "jsonl" ou "binary" (format de MoveBuffer.tofile)
+        n_moves: Nombre de mouvements, obligatoire pour le format binaire (écrit dans l'en-tête)
+    
+    Returns:
+        Nombre de mouvements écrits
+    """
+    written = 0
+    for block, count in _iter_blocks(pairs, n_rods, fmt, n_moves):
+        stream.write(block)
+        written += count
+    return written
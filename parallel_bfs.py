@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+BFS parallèle sur l'espace des états, niveau par niveau, sur plusieurs processus
+Le bitmap des états visités est partagé (multiprocessing.shared_memory) ; chaque
+processus possède une partie des octets du bitmap et la frontière correspondante.
+Les états échangés entre processus passent aussi par la mémoire partagée : les
+tubes vers le coordinateur ne portent que des messages de contrôle.
+"""
+
+import sys
+import time
+from multiprocessing import Pipe, Process, cpu_count
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from distance_table import CHUNK_SIZE, expand_codes
+from solve import calculate_min_moves, parse_input
+from state_space import StateSpace
+
+# Taille maximale de l'espace des états (le bitmap fait size / 8 octets)
+MAX_PARALLEL_STATES = 1 << 36
+
+# Taille minimale (en octets) de la boîte d'envoi partagée de chaque processus
+MIN_OUTBOX_BYTES = 1 << 16
+
+
+def owner_of(codes: np.ndarray, n_workers: int) -> np.ndarray:
+    """
+    Processus propriétaire de chaque code d'état
+    
+    La propriété est attribuée par octet du bitmap (code >> 3) : seul le
+    propriétaire écrit dans un octet, il n'y a donc pas de course entre processus.
+    """
+    return (codes >> 3) % n_workers
+
+
+def _test_bits(visited: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    return (visited[codes >> 3] >> (codes & 7).astype(np.uint8)) & 1
+
+
+def _set_bits(visited: np.ndarray, codes: np.ndarray) -> None:
+    """Marque des codes triés et uniques (un OU par octet plutôt que par code)"""
+    if not codes.size:
+        return
+    byte_index = codes >> 3
+    starts = np.flatnonzero(np.diff(byte_index, prepend=-1))
+    visited[byte_index[starts]] |= np.bitwise_or.reduceat((1 << (codes & 7)).astype(np.uint8), starts)
+
+
+class _Outbox:
+    """
+    Boîte d'envoi d'un processus : segment de mémoire partagée où il dépose, après
+    l'expansion, les états destinés à chaque propriétaire (rangés par propriétaire)
+    
+    Le segment est relu par les propriétaires pendant la réclamation et réécrit à
+    l'expansion suivante seulement : la barrière du coordinateur sépare les deux.
+    """
+    
+    def __init__(self):
+        self.shm: Optional[SharedMemory] = None
+    
+    def write(self, buckets: List[List[np.ndarray]]) -> Tuple[str, List[int]]:
+        """
+        Dépose les états de chaque propriétaire, bout à bout
+        
+        Returns:
+            Nom du segment et nombre d'états de chaque propriétaire
+        """
+        counts = [sum(part.size for part in bucket) for bucket in buckets]
+        parts = [part for bucket in buckets for part in bucket]
+        needed = sum(counts) * 8
+        if self.shm is None or self.shm.size < needed:
+            # Agrandi par doublement, sous un nouveau nom
+            size = max(MIN_OUTBOX_BYTES, needed, 2 * self.shm.size if self.shm is not None else 0)
+            self.release()
+            self.shm = SharedMemory(create=True, size=size)
+        codes = np.ndarray((sum(counts),), dtype=np.int64, buffer=self.shm.buf)
+        if parts:
+            np.concatenate(parts, out=codes)
+        del codes
+        return self.shm.name, counts
+    
+    def release(self) -> None:
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+def _read_inboxes(inboxes: Dict[str, SharedMemory], slices: List[Tuple[str, int, int]]) -> List[np.ndarray]:
+    """
+    Copie les états reçus depuis les boîtes d'envoi des autres processus
+    
+    Args:
+        inboxes: Segments déjà ouverts, par nom (mis à jour)
+        slices: (nom du segment, premier état, nombre d'états) pour chaque expéditeur
+    """
+    arrays = []
+    for name, offset, count in slices:
+        if name not in inboxes:
+            inboxes[name] = SharedMemory(name=name)
+        codes = np.ndarray((count,), dtype=np.int64, buffer=inboxes[name].buf, offset=offset * 8)
+        arrays.append(codes.copy())
+        del codes
+    # Un segment absent de cette réclamation a été remplacé par son processus (agrandi)
+    for name in set(inboxes) - {name for name, _, _ in slices}:
+        inboxes.pop(name).close()
+    return arrays
+
+
+def _worker_main(conn, shm_name: str, n_disks: int, n_rods: int, n_workers: int) -> None:
+    """
+    Boucle d'un processus : exécute les phases demandées par le coordinateur
+    
+    Commandes : ("seed", codes), ("expand",), ("claim", segments), ("stop",)
+    L'expansion répond par le nom de la boîte d'envoi et le nombre d'états par
+    propriétaire ; la réclamation reçoit les parties à lire dans les autres boîtes.
+    """
+    shm = SharedMemory(name=shm_name)
+    visited = np.ndarray((shm.size,), dtype=np.uint8, buffer=shm.buf)
+    frontier = np.empty(0, dtype=np.int64)
+    outbox = _Outbox()
+    inboxes: Dict[str, SharedMemory] = {}
+    try:
+        while True:
+            command = conn.recv()
+            if command[0] == "stop":
+                break
+            
+            start = time.perf_counter()
+            if command[0] == "expand":
+                # Voisins de la frontière, non encore visités, regroupés par propriétaire
+                buckets = [[] for _ in range(n_workers)]
+                for offset in range(0, frontier.size, CHUNK_SIZE):
+                    neighbours = np.unique(expand_codes(frontier[offset:offset + CHUNK_SIZE], n_disks, n_rods))
+                    neighbours = neighbours[_test_bits(visited, neighbours) == 0]
+                    owners = owner_of(neighbours, n_workers)
+                    order = np.argsort(owners, kind="stable")
+                    bounds = np.cumsum(np.bincount(owners, minlength=n_workers))[:-1]
+                    for owner, part in enumerate(np.split(neighbours[order], bounds)):
+                        buckets[owner].append(part)
+                result = outbox.write(buckets)
+            else:
+                # seed / claim : marquer les nouveaux états (tous possédés par ce processus)
+                arrays = command[1] if command[0] == "seed" else _read_inboxes(inboxes, command[1])
+                candidates = np.unique(np.concatenate(arrays)) if arrays else np.empty(0, dtype=np.int64)
+                frontier = candidates[_test_bits(visited, candidates) == 0]
+                _set_bits(visited, frontier)
+                result = frontier.size
+            conn.send((result, time.perf_counter() - start))
+    finally:
+        for inbox in inboxes.values():
+            inbox.close()
+        outbox.release()
+        del visited
+        shm.close()
+
+
+class LevelReport:
+    """Bilan d'un niveau du BFS : nombre d'états et durée des deux phases"""
+    
+    def __init__(self, level: int, states: int, expand_time: float, claim_time: float, exchange_time: float):
+        self.level = level
+        self.states = states
+        self.expand_time = expand_time
+        self.claim_time = claim_time
+        self.exchange_time = exchange_time
+    
+    def __repr__(self) -> str:
+        return (f"LevelReport(level={self.level}, states={self.states}, expand={self.expand_time:.3f}s, "
+                f"claim={self.claim_time:.3f}s, exchange={self.exchange_time:.3f}s)")
+
+
+class ParallelBFS:
+    """
+    BFS synchronisé par niveau sur n_workers processus
+    
+    À chaque niveau :
+    - expansion : chaque processus calcule les voisins de sa frontière (NumPy)
+      et les dépose, rangés par propriétaire, dans sa boîte d'envoi partagée ;
+    - réclamation : chaque propriétaire marque dans le bitmap partagé les états
+      qu'il reçoit et qui n'étaient pas visités ; ils forment sa frontière suivante.
+    Les deux phases sont séparées par une barrière (le coordinateur attend tous
+    les processus), donc les lectures du bitmap pendant l'expansion sont sûres.
+    """
+    
+    def __init__(self, n_disks: int, n_rods: int = 3, n_workers: Optional[int] = None):
+        self.space = StateSpace(n_disks, n_rods)
+        if self.space.size > MAX_PARALLEL_STATES:
+            raise ValueError(f"Espace d'états trop grand ({self.space.size} états, maximum {MAX_PARALLEL_STATES})")
+        self.n_workers = n_workers or cpu_count()
+    
+    def run(self, start: Optional[int] = None, target: Optional[int] = None,
+            on_level: Optional[Callable[[LevelReport], None]] = None) -> Tuple[List[LevelReport], Optional[int]]:
+        """
+        Parcourt l'espace depuis start, niveau par niveau
+        
+        Args:
+            start: Code de départ (l'état final sur le dernier bâtonnet par défaut)
+            target: Code dont on veut la distance ; le parcours s'arrête au niveau qui l'atteint
+            on_level: Appelé avec le bilan de chaque niveau dès qu'il est terminé
+        
+        Returns:
+            Bilans des niveaux, et distance de target (None si non demandé)
+        """
+        space = self.space
+        n_workers = self.n_workers
+        if start is None:
+            start = space.goal_code()
+        
+        shm = SharedMemory(create=True, size=(space.size + 7) >> 3)
+        connections = []
+        processes = []
+        try:
+            np.ndarray((shm.size,), dtype=np.uint8, buffer=shm.buf).fill(0)
+            for _ in range(n_workers):
+                parent_conn, child_conn = Pipe()
+                process = Process(target=_worker_main, daemon=True,
+                                  args=(child_conn, shm.name, space.n_disks, space.n_rods, n_workers))
+                process.start()
+                connections.append(parent_conn)
+                processes.append(process)
+            
+            seeds = np.array([start], dtype=np.int64)
+            owners = owner_of(seeds, n_workers)
+            for worker_id, conn in enumerate(connections):
+                conn.send(("seed", [seeds[owners == worker_id]]))
+            for conn in connections:
+                conn.recv()
+            
+            reports = [LevelReport(0, 1, 0.0, 0.0, 0.0)]
+            if on_level is not None:
+                on_level(reports[0])
+            if target == start:
+                return reports, 0
+            
+            level = 0
+            while True:
+                level += 1
+                
+                # Phase 1 : expansion
+                phase_start = time.perf_counter()
+                for conn in connections:
+                    conn.send(("expand",))
+                outboxes = []
+                expand_time = 0.0
+                for conn in connections:
+                    result, elapsed = conn.recv()
+                    outboxes.append(result)
+                    expand_time = max(expand_time, elapsed)
+                
+                # Phase 2 : réclamation, chaque propriétaire lit sa partie dans chaque boîte d'envoi
+                for owner, conn in enumerate(connections):
+                    slices = []
+                    for name, counts in outboxes:
+                        if counts[owner]:
+                            slices.append((name, sum(counts[:owner]), counts[owner]))
+                    conn.send(("claim", slices))
+                new_states = 0
+                claim_time = 0.0
+                for conn in connections:
+                    count, elapsed = conn.recv()
+                    new_states += count
+                    claim_time = max(claim_time, elapsed)
+                exchange_time = time.perf_counter() - phase_start - expand_time - claim_time
+                
+                if not new_states:
+                    return reports, None
+                report = LevelReport(level, new_states, expand_time, claim_time, max(exchange_time, 0.0))
+                reports.append(report)
+                if on_level is not None:
+                    on_level(report)
+                
+                # La cible est atteinte quand son bit est marqué
+                if target is not None and shm.buf[target >> 3] & (1 << (target & 7)):
+                    return reports, level
+        finally:
+            for conn in connections:
+                try:
+                    conn.send(("stop",))
+                except (BrokenPipeError, OSError):
+                    pass
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            shm.close()
+            shm.unlink()
+
+
+def main():
+    """
+    Vérifie en ligne de commande la distance optimale d'une configuration
+    """
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python parallel_bfs.py 'n_disks,n_rods' [n_processus]")
+        print("Exemple: python parallel_bfs.py '12,4' 8")
+        sys.exit(1)
+    
+    try:
+        n_disks, n_rods = parse_input(sys.argv[1])
+        n_workers = int(sys.argv[2]) if len(sys.argv) == 3 else None
+        bfs = ParallelBFS(n_disks, n_rods, n_workers)
+        space = bfs.space
+        
+        print(f"BFS parallèle: {n_disks} disques, {n_rods} bâtonnets, {space.size} états, "
+              f"{bfs.n_workers} processus")
+        print(f"{'niveau':>6} {'états':>12} {'expansion':>10} {'réclamation':>12} {'échanges':>9}")
+        
+        def show(report: LevelReport):
+            print(f"{report.level:>6} {report.states:>12} {report.expand_time:>9.3f}s "
+                  f"{report.claim_time:>11.3f}s {report.exchange_time:>8.3f}s", flush=True)
+        
+        start = time.perf_counter()
+        reports, distance = bfs.run(space.goal_code(), target=space.goal_code(0), on_level=show)
+        elapsed = time.perf_counter() - start
+        
+        print(f"\nDistance de l'état initial à l'état final: {distance}")
+        print(f"Nombre de mouvements de la solution (Frame-Stewart): {calculate_min_moves(n_disks, n_rods)}")
+        print(f"États visités: {sum(report.states for report in reports)} en {elapsed:.2f} s")
+    
+    except ValueError as e:
+        print(f"Erreur: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Lecture d'une solution dans la boucle d'événements Tk, à vitesse réglable
+À grande vitesse, plusieurs mouvements sont appliqués par image et seul l'état
+final de chaque image est dessiné ; l'affichage peut aussi être suspendu
+jusqu'à la fin
+"""
+
+import time
+from typing import Callable, List, Optional
+
+# Vitesses proposées (mouvements par seconde) ; None = aussi vite que possible
+SPEEDS = [1, 2, 5, 10, 50, 200, 1000, None]
+
+# Intervalle entre deux images (en ms, environ 60 images par seconde)
+FRAME_MS = 16
+
+# Temps de calcul accordé à chaque image en vitesse maximale (en secondes)
+FRAME_BUDGET = 0.012
+
+# Nombre de mouvements appliqués entre deux lectures de l'horloge en vitesse maximale
+BATCH_SIZE = 256
+
+
+class Playback:
+    """
+    Joue une liste de mouvements avec master.after, sans thread ni time.sleep
+    
+    apply_move(move) applique un mouvement "a->b" à l'état du jeu sans le
+    dessiner ; render() dessine l'état courant ; on_finish() est appelé quand
+    tous les mouvements ont été joués. Quand le dessin est suspendu, progress()
+    (optionnel) est appelé à chaque image à la place de render(). Pendant
+    skip_to_end(), skipping est vrai : apply_move peut s'en servir pour se taire.
+    """
+    
+    def __init__(self, master, moves: List[str], apply_move: Callable[[str], None],
+                 render: Callable[[], None], on_finish: Callable[[], None],
+                 speed: Optional[float] = 1, start_index: int = 0,
+                 progress: Optional[Callable[[], None]] = None):
+        self.master = master
+        self.moves = moves
+        self.apply_move = apply_move
+        self.render = render
+        self.on_finish = on_finish
+        self.progress = progress
+        self.speed = speed
+        self.index = start_index
+        self.start_index = start_index
+        self.render_enabled = True
+        self.skipping = False
+        
+        self.running = False
+        self._after_id = None
+        self._last_tick = 0.0
+        self._credit = 0.0
+        
+        # Mesure de la vitesse réellement obtenue
+        self._start_time = 0.0
+        self._elapsed = 0.0
+        self.frames = 0
+    
+    @property
+    def remaining(self) -> int:
+        """Nombre de mouvements restant à jouer"""
+        return len(self.moves) - self.index
+    
+    def elapsed(self) -> float:
+        """Durée de lecture en secondes (pauses exclues)"""
+        if self.running:
+            return self._elapsed + time.monotonic() - self._start_time
+        return self._elapsed
+    
+    def moves_per_second(self) -> float:
+        """Vitesse moyenne obtenue depuis le début de la lecture"""
+        elapsed = self.elapsed()
+        return (self.index - self.start_index) / elapsed if elapsed > 0 else 0.0
+    
+    def start(self) -> None:
+        """Démarre (ou reprend) la lecture"""
+        if self.running:
+            return
+        self.running = True
+        self._start_time = self._last_tick = time.monotonic()
+        self._credit = 1.0  # le premier mouvement est joué tout de suite
+        self._schedule(0)
+    
+    def stop(self) -> None:
+        """Interrompt la lecture (l'état reste celui du dernier mouvement joué)"""
+        if self.running:
+            self._elapsed += time.monotonic() - self._start_time
+        self.running = False
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+    
+    def set_speed(self, speed: Optional[float]) -> None:
+        """Change la vitesse (mouvements par seconde, None pour le maximum)"""
+        self.speed = speed
+        self._credit = min(self._credit, 1.0)
+        if self.running and self._after_id is not None:
+            # Une image lente déjà programmée ne doit pas retarder la nouvelle vitesse
+            self.master.after_cancel(self._after_id)
+            self._schedule(0)
+    
+    def set_render_enabled(self, enabled: bool) -> None:
+        """Active ou suspend le dessin pendant la lecture"""
+        self.render_enabled = enabled
+        if enabled:
+            self.render()
+    
+    def skip_to_end(self) -> None:
+        """Applique tous les mouvements restants sans les dessiner, puis termine"""
+        self.stop()
+        self.skipping = True
+        try:
+            while self.index < len(self.moves):
+                self.apply_move(self.moves[self.index])
+                self.index += 1
+        finally:
+            self.skipping = False
+        self._finish()
+    
+    def _schedule(self, delay: int) -> None:
+        self._after_id = self.master.after(delay, self._tick)
+    
+    def _tick(self) -> None:
+        """Image : applique les mouvements dus depuis la précédente et dessine le résultat"""
+        self._after_id = None
+        if not self.running:
+            return
+        
+        now = time.monotonic()
+        if self.speed is None:
+            applied = self._apply_for(now + FRAME_BUDGET)
+        else:
+            self._credit += (now - self._last_tick) * self.speed
+            due = min(int(self._credit), self.remaining)
+            self._credit -= due
+            for _ in range(due):
+                self.apply_move(self.moves[self.index])
+                self.index += 1
+            applied = due
+        self._last_tick = now
+        
+        if applied:
+            self.frames += 1
+            if self.render_enabled:
+                self.render()
+            elif self.progress is not None:
+                self.progress()
+        
+        if self.index >= len(self.moves):
+            self._finish()
+        elif self.speed is None:
+            # Laisser Tk traiter les événements entre deux lots
+            self._schedule(1)
+        else:
+            # Attendre le prochain mouvement dû, sans descendre sous une image
+            wait = (1.0 - self._credit) / self.speed
+            self._schedule(max(FRAME_MS, int(wait * 1000)))
+    
+    def _apply_for(self, deadline: float) -> int:
+        """Applique des mouvements jusqu'à l'échéance (en vitesse maximale)"""
+        applied = 0
+        while self.index < len(self.moves):
+            end = min(self.index + BATCH_SIZE, len(self.moves))
+            for move in self.moves[self.index:end]:
+                self.apply_move(move)
+            applied += end - self.index
+            self.index = end
+            if time.monotonic() >= deadline:
+                break
+        return applied
+    
+    def _finish(self) -> None:
+        self.stop()
+        self.render()
+        self.on_finish()
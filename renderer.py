@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Affichage de la Tour de Hanoï sur un canvas Tk en mode retenu
+Les éléments (bases, bâtonnets, disques) sont créés une fois par partie ; un
+mouvement ne fait que déplacer les deux éléments du disque concerné
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Durée d'un déplacement animé (en ms)
+ANIMATION_MS = 250
+
+# Intervalle entre deux images d'une animation (en ms, environ 60 images par seconde)
+FRAME_MS = 16
+
+
+class HanoiRenderer:
+    """
+    Dessine et met à jour l'état du jeu sur un canvas
+    
+    Les identifiants des éléments du canvas sont gardés par disque et par
+    bâtonnet : render ne touche qu'aux disques dont la place a changé, et la
+    sélection d'un bâtonnet est un simple itemconfig.
+    """
+    
+    def __init__(self, canvas, colors: List[str], width: int = 700, height: int = 400,
+                 rod_width: int = 10, rod_height: int = 300, disk_height: int = 20, base_width: int = 150):
+        self.canvas = canvas
+        self.colors = colors
+        self.width = width
+        self.height = height
+        self.rod_width = rod_width
+        self.rod_height = rod_height
+        self.max_disk_height = disk_height
+        self.base_width = base_width
+        
+        # (n_disks, n_rods) des éléments actuellement créés
+        self._layout: Optional[Tuple[int, int]] = None
+        self._rod_items: List[int] = []
+        self._disk_items: Dict[int, Tuple[int, int]] = {}
+        # Centre actuellement dessiné de chaque disque
+        self._positions: Dict[int, Tuple[int, int]] = {}
+        self._selected: Optional[int] = None
+        self._animation = None
+        
+        self.base_y = height - 50
+        self.disk_height = disk_height
+        self.rod_spacing = width // 3
+    
+    def rod_x(self, rod: int) -> int:
+        """Abscisse du centre d'un bâtonnet"""
+        return self.rod_spacing // 2 + rod * self.rod_spacing
+    
+    def disk_center(self, rod: int, level: int) -> Tuple[int, int]:
+        """Centre d'un disque posé à la hauteur level (0 en bas) sur un bâtonnet"""
+        return self.rod_x(rod), self.base_y - (level + 1) * self.disk_height
+    
+    def build(self, rods: List[List[int]]) -> None:
+        """Crée tous les éléments du canvas pour un nouvel état (nouvelle partie)"""
+        self._cancel_animation()
+        self.canvas.delete("all")
+        n_rods = len(rods)
+        n_disks = sum(len(rod) for rod in rods)
+        self._layout = (n_disks, n_rods)
+        self._selected = None
+        
+        self.rod_spacing = self.width // n_rods
+        # Adapter la taille des disques pour que la pile tienne sur le bâtonnet
+        self.disk_height = min(self.max_disk_height, self.rod_height // max(n_disks, 1))
+        width_step = min(15, (self.rod_spacing - 30) // max(n_disks, 1))
+        font_size = min(12, max(self.disk_height - 8, 6))
+        
+        # Bases puis bâtonnets
+        for rod_idx in range(n_rods):
+            x = self.rod_x(rod_idx)
+            self.canvas.create_rectangle(x - self.base_width//2, self.base_y,
+                                         x + self.base_width//2, self.base_y + 20,
+                                         fill='brown', outline='black')
+        self._rod_items = [
+            self.canvas.create_rectangle(self.rod_x(rod_idx) - self.rod_width//2, self.base_y - self.rod_height,
+                                         self.rod_x(rod_idx) + self.rod_width//2, self.base_y,
+                                         fill='black', outline='black')
+            for rod_idx in range(n_rods)
+        ]
+        
+        # Disques (rectangle et numéro)
+        self._disk_items = {}
+        self._positions = {}
+        for rod_idx, rod in enumerate(rods):
+            for level, disk in enumerate(rod):
+                x, y = self.disk_center(rod_idx, level)
+                disk_width = 20 + disk * width_step
+                color = self.colors[(disk - 1) % len(self.colors)]
+                rect = self.canvas.create_rectangle(x - disk_width//2, y - self.disk_height//2,
+                                                    x + disk_width//2, y + self.disk_height//2,
+                                                    fill=color, outline='black', width=2)
+                label = self.canvas.create_text(x, y, text=str(disk), font=('Arial', font_size, 'bold'))
+                self._disk_items[disk] = (rect, label)
+                self._positions[disk] = (x, y)
+    
+    def render(self, rods: List[List[int]], selected_rod: Optional[int] = None, animate: bool = False) -> None:
+        """
+        Met l'affichage en accord avec l'état
+        
+        Args:
+            rods: Disques de chaque bâtonnet, du bas vers le haut
+            selected_rod: Bâtonnet sélectionné (affiché en rouge)
+            animate: Faire glisser les disques déplacés au lieu de les téléporter
+        """
+        n_disks = sum(len(rod) for rod in rods)
+        if self._layout != (n_disks, len(rods)):
+            self.build(rods)
+        else:
+            self._finish_animation()
+            moved = []
+            for rod_idx, rod in enumerate(rods):
+                for level, disk in enumerate(rod):
+                    target = self.disk_center(rod_idx, level)
+                    if self._positions[disk] != target:
+                        moved.append((disk, target))
+            if animate and moved:
+                self._start_animation(moved)
+            else:
+                for disk, target in moved:
+                    self._place(disk, target)
+        self.set_selected(selected_rod)
+    
+    def set_selected(self, rod: Optional[int]) -> None:
+        """Met en évidence le bâtonnet sélectionné"""
+        if rod == self._selected:
+            return
+        if self._selected is not None:
+            self.canvas.itemconfig(self._rod_items[self._selected], fill='black')
+        if rod is not None:
+            self.canvas.itemconfig(self._rod_items[rod], fill='red')
+        self._selected = rod
+    
+    def _place(self, disk: int, target: Tuple[int, int]) -> None:
+        """Déplace les éléments d'un disque pour que son centre soit en target"""
+        x, y = self._positions[disk]
+        dx, dy = target[0] - x, target[1] - y
+        if dx or dy:
+            for item in self._disk_items[disk]:
+                self.canvas.move(item, dx, dy)
+            self._positions[disk] = target
+    
+    def _start_animation(self, moved: List[Tuple[int, Tuple[int, int]]]) -> None:
+        """Lance l'animation : chaque disque monte, traverse puis descend vers sa place"""
+        lift_y = self.base_y - self.rod_height - self.disk_height
+        paths = []
+        for disk, target in moved:
+            start = self._positions[disk]
+            paths.append((disk, [start, (start[0], lift_y), (target[0], lift_y), target]))
+        self._animation = {"paths": paths, "start": time.monotonic(), "after_id": None}
+        self._animate_frame()
+    
+    def _animate_frame(self) -> None:
+        animation = self._animation
+        fraction = min((time.monotonic() - animation["start"]) * 1000 / ANIMATION_MS, 1.0)
+        for disk, path in animation["paths"]:
+            self._place(disk, _point_along(path, fraction))
+        if fraction < 1.0:
+            animation["after_id"] = self.canvas.after(FRAME_MS, self._animate_frame)
+        else:
+            self._animation = None
+    
+    def _finish_animation(self) -> None:
+        """Termine immédiatement l'animation en cours (les disques rejoignent leur place)"""
+        if self._animation is None:
+            return
+        animation = self._cancel_animation()
+        for disk, path in animation["paths"]:
+            self._place(disk, path[-1])
+    
+    def _cancel_animation(self):
+        animation = self._animation
+        if animation is not None and animation["after_id"] is not None:
+            self.canvas.after_cancel(animation["after_id"])
+        self._animation = None
+        return animation
+
+
+def _point_along(path: List[Tuple[int, int]], fraction: float) -> Tuple[int, int]:
+    """Point situé à la fraction donnée de la longueur d'une ligne brisée (segments horizontaux ou verticaux)"""
+    lengths = [abs(x1 - x0) + abs(y1 - y0) for (x0, y0), (x1, y1) in zip(path, path[1:])]
+    remaining = fraction * sum(lengths)
+    for (x0, y0), (x1, y1), length in zip(path, path[1:], lengths):
+        if remaining <= length and length:
+            ratio = remaining / length
+            return round(x0 + (x1 - x0) * ratio), round(y0 + (y1 - y0) * ratio)
+        remaining -= length
+    return path[-1]
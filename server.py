@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Service local de résolution (HTTP/1.1 et JSON sur asyncio)
+Un seul processus sert tous les clients : les solutions sont diffusées par blocs
+(Transfer-Encoding: chunked), les requêtes identiques simultanées sont fusionnées
+et les calculs lourds (solutions, nombres de Frame-Stewart, indices) tournent
+dans un ProcessPoolExecutor pour ne jamais bloquer la boucle
+
+Points d'accès :
+    GET  /count?config=20,3               {"n_disks": 20, "n_rods": 3, "moves": 1048575}
+    GET  /move?config=20,3&index=5        Mouvement d'indice 5 (0-indexé, négatif depuis la fin)
+    POST /hint  {"rods": [[3], [2, 1], []]}   Coup recommandé et distance restante
+    GET  /solve?config=20,3&format=text   Tous les mouvements (text, csv, jsonl ou binary)
+"""
+
+import asyncio
+import io
+import json
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from move_buffer import MoveBuffer, write_header
+from output import FORMATS, iter_formatted
+from solution_cache import Solution, SolutionCache, iter_pairs
+from solve import HanoiSolution, calculate_min_moves, parse_input, solve_hanoi
+from state_space import SearchCancelled
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Taille maximale de l'en-tête et du corps d'une requête (en octets)
+MAX_HEADER_BYTES = 1 << 14
+MAX_BODY_BYTES = 1 << 20
+
+# Octets de données binaires envoyés par bloc
+BINARY_CHUNK_BYTES = 1 << 16
+
+# Durée maximale (en secondes) de la recherche d'un coup recommandé
+HINT_TIMEOUT = 30.0
+
+CONTENT_TYPES = {
+    "text": "text/plain; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+    "binary": "application/octet-stream",
+}
+
+Params = Dict[str, str]
+
+
+class HttpError(Exception):
+    """Erreur renvoyée au client avec un code HTTP"""
+    
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _min_moves(n_disks: int, n_rods: int) -> int:
+    """Nombre minimal de mouvements, calculé dans un processus du pool (O(n²) au-delà de 3 bâtonnets)"""
+    return calculate_min_moves(n_disks, n_rods)
+
+
+def _move_pair(n_disks: int, n_rods: int, index: int) -> Tuple[int, int]:
+    """Mouvement d'indice index, calculé dans un processus du pool"""
+    # Calcul direct sur l'indice, sans générer la solution
+    return HanoiSolution(n_disks, n_rods).move_pair(index)
+
+
+def _solution(n_disks: int, n_rods: int, cache_bytes: int) -> Solution:
+    """
+    Solution à garder dans un cache de cache_bytes octets, calculée dans un processus du pool
+    
+    Returns:
+        MoveBuffer si elle tient dans le cache, sinon HanoiSolution paresseuse
+    """
+    if SolutionCache(cache_bytes).fits(n_disks, n_rods):
+        return solve_hanoi(n_disks, n_rods, verbose=False, mode="packed")
+    return HanoiSolution(n_disks, n_rods)
+
+
+def _hint(rods: List[List[int]]) -> Dict[str, Any]:
+    """
+    Coup recommandé et distance restante d'un état, calculés dans un processus du pool
+    
+    La recherche est interrompue (SearchCancelled) au bout de HINT_TIMEOUT secondes.
+    """
+    from engine import HanoiEngine
+    engine = HanoiEngine(sum(len(rod) for rod in rods), len(rods))
+    cancel = threading.Event()
+    timer = threading.Timer(HINT_TIMEOUT, cancel.set)
+    timer.start()
+    try:
+        move, distance = engine.compute_hint(rods, cancel=cancel)
+    finally:
+        timer.cancel()
+    return {"move": move, "distance": distance}
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    """
+    Contexte des processus du pool
+    
+    Les processus sont créés à la demande, pendant le service : avec fork, ils
+    hériteraient des sockets clients ouverts et ces connexions ne seraient jamais
+    fermées côté client. forkserver (ou spawn) part d'un processus vierge.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def parse_state(data: Any) -> List[List[int]]:
+    """
+    Valide un état envoyé par un client : {"rods": [[3, 2, 1], [], []]}
+    
+    Chaque bâtonnet liste ses disques de bas en haut ; les disques sont numérotés
+    de 1 (le plus petit) à n et l'état final est sur le dernier bâtonnet.
+    """
+    rods = data.get("rods") if isinstance(data, dict) else None
+    if not isinstance(rods, list) or len(rods) < 3 or not all(isinstance(rod, list) for rod in rods):
+        raise ValueError('L\'état doit être de la forme {"rods": [[3, 2, 1], [], []]} (3 bâtonnets ou plus)')
+    disks = [disk for rod in rods for disk in rod]
+    if any(type(disk) is not int for disk in disks) or sorted(disks) != list(range(1, len(disks) + 1)):
+        raise ValueError("Les disques doivent être numérotés de 1 à n, chacun une seule fois")
+    if not disks:
+        raise ValueError("L'état ne contient aucun disque")
+    for rod in rods:
+        if any(lower < upper for lower, upper in zip(rod, rod[1:])):
+            raise ValueError(f"Disque posé sur un disque plus petit: {rod}")
+    return rods
+
+
+def _config(params: Params) -> Tuple[int, int]:
+    if "config" not in params:
+        raise ValueError('Paramètre "config" manquant (format: n_disks,n_rods)')
+    return parse_input(params["config"])
+
+
+def _binary_blocks(solution: MoveBuffer) -> Iterator[bytes]:
+    """Solution empaquetée au format binaire, envoyée telle quelle (en-tête puis données)"""
+    header = io.BytesIO()
+    write_header(header, solution.n_rods, len(solution))
+    yield header.getvalue()
+    data = solution.view()
+    for start in range(0, len(data), BINARY_CHUNK_BYTES):
+        yield bytes(data[start:start + BINARY_CHUNK_BYTES])
+
+
+class SolveServer:
+    """
+    Service HTTP/1.1 (connexions persistantes) de résolution de la Tour de Hanoï
+    
+    Les solutions complètes sont calculées dans le pool puis gardées dans un
+    SolutionCache ; une requête identique à un calcul en cours (même solution,
+    même état pour /hint) attend ce calcul au lieu d'en lancer un autre.
+    """
+    
+    def __init__(self, jobs: Optional[int] = None, cache: Optional[SolutionCache] = None):
+        self.executor = ProcessPoolExecutor(max_workers=jobs, mp_context=_pool_context())
+        self.cache = cache if cache is not None else SolutionCache()
+        self._inflight: Dict[Hashable, "asyncio.Future"] = {}
+        # Chemin -> (méthode, traitement, réponse diffusée par le traitement lui-même)
+        self._routes: Dict[str, Tuple[str, Callable, bool]] = {
+            "/count": ("GET", self._count, False),
+            "/move": ("GET", self._move, False),
+            "/hint": ("POST", self._hint, False),
+            "/solve": ("GET", self._solve, True),
+        }
+        
+        # Compteurs pour le réglage
+        self.requests = 0
+        self.coalesced = 0
+    
+    async def _coalesce(self, key: Hashable, start: Callable[[], Awaitable]) -> Any:
+        """Lance le calcul start(), ou attend le calcul identique déjà en cours"""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = asyncio.ensure_future(start())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Un client qui se déconnecte n'annule pas le calcul attendu par les autres
+        return await asyncio.shield(future)
+    
+    def _run(self, function: Callable, *args) -> Awaitable:
+        """Exécute function(*args) dans un processus du pool"""
+        return asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+    
+    async def _count(self, params: Params, body: bytes) -> Dict[str, Any]:
+        n_disks, n_rods = _config(params)
+        moves = await self._coalesce(("count", n_disks, n_rods), lambda: self._run(_min_moves, n_disks, n_rods))
+        return {"n_disks": n_disks, "n_rods": n_rods, "moves": moves}
+    
+    async def _move(self, params: Params, body: bytes) -> Dict[str, Any]:
+        n_disks, n_rods = _config(params)
+        try:
+            index = int(params["index"])
+        except (KeyError, ValueError):
+            raise ValueError('Paramètre "index" manquant ou invalide')
+        source, destination = await self._coalesce(("move", n_disks, n_rods, index),
+                                                   lambda: self._run(_move_pair, n_disks, n_rods, index))
+        return {"index": index, "move": f"{source}->{destination}", "source": source, "destination": destination}
+    
+    async def _hint(self, params: Params, body: bytes) -> Dict[str, Any]:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise ValueError("Le corps de la requête doit être un objet JSON")
+        rods = parse_state(data)
+        key = ("hint", tuple(tuple(rod) for rod in rods))
+        try:
+            return await self._coalesce(key, lambda: self._run(_hint, rods))
+        except SearchCancelled:
+            raise HttpError(HTTPStatus.SERVICE_UNAVAILABLE,
+                            f"Recherche du coup recommandé interrompue après {HINT_TIMEOUT:g} s")
+    
+    async def _compute_solution(self, n_disks: int, n_rods: int) -> Solution:
+        """Calcule une solution dans le pool et la garde dans le cache"""
+        solution = await self._run(_solution, n_disks, n_rods, self.cache.max_bytes)
+        self.cache.put(n_disks, n_rods, solution)
+        return solution
+    
+    async def _solution_blocks(self, n_disks: int, n_rods: int, fmt: str) -> Iterator[bytes]:
+        """Blocs à envoyer pour /solve, depuis le cache ou un calcul (fusionné) dans le pool"""
+        solution = self.cache.peek(n_disks, n_rods)
+        if solution is None:
+            solution = await self._coalesce(("solve", n_disks, n_rods),
+                                            lambda: self._compute_solution(n_disks, n_rods))
+        
+        if isinstance(solution, MoveBuffer) and fmt == "binary":
+            return _binary_blocks(solution)
+        # Solution paresseuse (trop grande pour le cache) : générée au fil de l'envoi, en mémoire constante
+        return iter_formatted(iter_pairs(solution), n_rods, fmt, len(solution))
+    
+    async def _solve(self, params: Params, body: bytes, writer: asyncio.StreamWriter,
+                     keep_alive: bool) -> None:
+        n_disks, n_rods = _config(params)
+        fmt = params.get("format", "text")
+        if fmt not in FORMATS:
+            raise ValueError(f"Format de sortie inconnu: {fmt} (formats: {', '.join(FORMATS)})")
+        blocks = await self._solution_blocks(n_disks, n_rods, fmt)
+        
+        loop = asyncio.get_running_loop()
+        self._write_head(writer, HTTPStatus.OK, CONTENT_TYPES[fmt], keep_alive, chunked=True)
+        while True:
+            # Le formatage d'un bloc tourne dans un thread : la boucle reste disponible
+            try:
+                block = await loop.run_in_executor(None, next, blocks, None)
+            except Exception as e:
+                # L'en-tête est parti : on ne peut plus répondre une erreur, on coupe la connexion
+                raise ConnectionAbortedError(f"Échec de la génération des mouvements: {e}")
+            if block is None:
+                break
+            writer.write(b"%x\r\n%b\r\n" % (len(block), block))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+    
+    @staticmethod
+    def _write_head(writer: asyncio.StreamWriter, status: HTTPStatus, content_type: str,
+                    keep_alive: bool, length: Optional[int] = None, chunked: bool = False) -> None:
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Type: {content_type}"]
+        if chunked:
+            lines.append("Transfer-Encoding: chunked")
+        else:
+            lines.append(f"Content-Length: {length}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    
+    def _send_json(self, writer: asyncio.StreamWriter, status: HTTPStatus, data: Any, keep_alive: bool) -> None:
+        payload = (json.dumps(data, ensure_ascii=False) + "\n").encode()
+        self._write_head(writer, status, "application/json; charset=utf-8", keep_alive, len(payload))
+        writer.write(payload)
+    
+    async def _dispatch(self, method: str, target: str, body: bytes, writer: asyncio.StreamWriter,
+                        keep_alive: bool) -> None:
+        """Traite une requête et écrit sa réponse"""
+        url = urlsplit(target)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        route = self._routes.get(url.path)
+        try:
+            if route is None:
+                raise HttpError(HTTPStatus.NOT_FOUND, f"Point d'accès inconnu: {url.path}")
+            expected_method, handler, streaming = route
+            if method != expected_method:
+                raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"{url.path} attend la méthode {expected_method}")
+            if streaming:
+                await handler(params, body, writer, keep_alive)
+                return
+            result = await handler(params, body)
+        except HttpError as e:
+            self._send_json(writer, e.status, {"error": str(e)}, keep_alive)
+        except (ValueError, IndexError) as e:
+            self._send_json(writer, HTTPStatus.BAD_REQUEST, {"error": str(e)}, keep_alive)
+        else:
+            self._send_json(writer, HTTPStatus.OK, result, keep_alive)
+        await writer.drain()
+    
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Sert une connexion : requêtes successives tant que le client la garde ouverte"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    self._send_json(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                    {"error": "En-tête de requête trop grand"}, False)
+                    break
+                
+                request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ")
+                    headers = {name.strip().lower(): value.strip()
+                               for name, value in (line.split(":", 1) for line in header_lines)}
+                    length = int(headers.get("content-length", "0"))
+                except ValueError:
+                    self._send_json(writer, HTTPStatus.BAD_REQUEST, {"error": "Requête HTTP invalide"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    self._send_json(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                    {"error": "Corps de requête trop grand"}, False)
+                    break
+                body = await reader.readexactly(length) if length > 0 else b""
+                
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                self.requests += 1
+                await self._dispatch(method, target, body, writer, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Client parti en cours de requête ou de réponse
+        finally:
+            writer.close()
+    
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    unix_path: Optional[str] = None, on_ready: Optional[Callable[[str], None]] = None) -> None:
+        """
+        Écoute jusqu'à annulation
+        
+        Args:
+            host: Adresse d'écoute (locale par défaut)
+            port: Port TCP
+            unix_path: Si défini, écoute sur ce socket Unix au lieu de TCP
+            on_ready: Appelé avec l'adresse d'écoute une fois le service prêt
+        """
+        if unix_path is not None:
+            server = await asyncio.start_unix_server(self.handle, path=unix_path, limit=MAX_HEADER_BYTES)
+            address = f"unix:{unix_path}"
+        else:
+            server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+            bound_port = server.sockets[0].getsockname()[1]
+            address = f"http://{host}:{bound_port}"
+        try:
+            async with server:
+                if on_ready is not None:
+                    on_ready(address)
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            if unix_path is not None:
+                with suppress(OSError):
+                    Path(unix_path).unlink()
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: Optional[str] = None,
+          jobs: Optional[int] = None, cache: Optional[SolutionCache] = None) -> None:
+    """Lance le service (bloquant, jusqu'à Ctrl+C)"""
+    server = SolveServer(jobs, cache)
+    
+    def ready(address: str):
+        print(f"Service de résolution à l'écoute sur {address}", flush=True)
+    
+    asyncio.run(server.serve(host, port, unix_path, ready))
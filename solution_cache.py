@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Cache des solutions indexé par configuration (n_disks, n_rods)
+Cache LRU borné en octets, avec un niveau optionnel sur disque pour conserver
+les solutions d'une session à l'autre
+"""
+
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from cache_dir import default_cache_dir
+from move_buffer import MAX_RODS, MoveBuffer
+from solve import HanoiSolution, calculate_min_moves, iter_solution_pairs, solve_hanoi
+
+# Budget mémoire par défaut (en octets)
+DEFAULT_MAX_BYTES = 64 << 20
+
+# Une solution empaquetée ne doit pas occuper plus de cette fraction du budget ;
+# au-delà, on garde une HanoiSolution paresseuse
+MAX_ENTRY_SHARE = 4
+
+# Taille comptée pour une solution paresseuse (quelques objets Python)
+LAZY_ENTRY_BYTES = 256
+
+Solution = Union[MoveBuffer, HanoiSolution]
+ConfigKey = Tuple[int, int]
+
+
+def default_solution_dir() -> Path:
+    """Répertoire par défaut du niveau disque"""
+    return default_cache_dir() / "solutions"
+
+
+def packed_size(n_disks: int, n_rods: int) -> int:
+    """Taille en octets de la solution empaquetée (voir MoveBuffer)"""
+    n_moves = calculate_min_moves(n_disks, n_rods)
+    return (n_moves + 1) // 2 if n_rods <= 4 else n_moves
+
+
+def iter_pairs(solution: Solution) -> Iterator[Tuple[int, int]]:
+    """Itère les mouvements (source, destination) d'une solution du cache"""
+    if isinstance(solution, MoveBuffer):
+        return solution.iter_pairs()
+    return iter_solution_pairs(solution.n_disks, solution.n_rods)
+
+
+class SolutionCache:
+    """
+    Cache LRU (n_disks, n_rods) -> solution, borné par max_bytes
+    
+    Les solutions sont gardées empaquetées (MoveBuffer, 4 bits par mouvement)
+    si elles tiennent dans max_bytes / MAX_ENTRY_SHARE, sinon sous forme de
+    HanoiSolution paresseuse (taille constante). Si directory est défini, les
+    solutions empaquetées y sont aussi écrites et relues lors d'un défaut en mémoire.
+    """
+    
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, directory: Optional[Path] = None):
+        if max_bytes < 0:
+            raise ValueError("La taille du cache doit être positive")
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory is not None else None
+        self._entries: "OrderedDict[ConfigKey, Solution]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        
+        # Compteurs pour le réglage
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def _entry_bytes(solution: Solution) -> int:
+        return solution.nbytes if isinstance(solution, MoveBuffer) else LAZY_ENTRY_BYTES
+    
+    def _path(self, key: ConfigKey) -> Path:
+        return self.directory / f"solution_{key[0]}x{key[1]}.bin"
+    
+    def _store(self, key: ConfigKey, solution: Solution) -> None:
+        # Appelé avec le verrou
+        if key in self._entries:
+            self._bytes -= self._entry_bytes(self._entries.pop(key))
+        self._entries[key] = solution
+        self._bytes += self._entry_bytes(solution)
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= self._entry_bytes(evicted)
+            self.evictions += 1
+    
+    def _load(self, key: ConfigKey) -> Optional[MoveBuffer]:
+        """Relit une solution du niveau disque ; None si elle n'y est pas ou est illisible"""
+        if self.directory is None or key[1] > MAX_RODS:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                solution = MoveBuffer.fromfile(f)
+        except (OSError, ValueError):
+            return None
+        if len(solution) != calculate_min_moves(*key) or solution.n_rods != key[1]:
+            return None
+        return solution
+    
+    def _save(self, key: ConfigKey, solution: MoveBuffer) -> None:
+        """Écrit une solution dans le niveau disque (écriture atomique) ; un échec n'est qu'averti"""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    solution.tofile(f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            print(f"Cache des solutions: écriture impossible dans {path.parent}: {e}")
+    
+    def get(self, n_disks: int, n_rods: int = 3) -> Solution:
+        """
+        Retourne la solution d'une configuration, depuis la mémoire, le disque ou en la calculant
+        
+        Returns:
+            MoveBuffer, ou HanoiSolution si la solution empaquetée serait trop grande
+        """
+        key = (n_disks, n_rods)
+        with self._lock:
+            solution = self._entries.get(key)
+            if solution is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return solution
+        
+        if not self.fits(n_disks, n_rods):
+            solution = solve_hanoi(n_disks, n_rods, verbose=False, mode="lazy")
+            from_disk = False
+        else:
+            solution = self._load(key)
+            from_disk = solution is not None
+            if solution is None:
+                solution = solve_hanoi(n_disks, n_rods, verbose=False, mode="packed")
+                if self.directory is not None:
+                    self._save(key, solution)
+        
+        with self._lock:
+            if from_disk:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+            self._store(key, solution)
+        return solution
+    
+    def peek(self, n_disks: int, n_rods: int = 3) -> Optional[Solution]:
+        """Retourne la solution si elle est en mémoire ou sur disque, sans la calculer"""
+        key = (n_disks, n_rods)
+        with self._lock:
+            solution = self._entries.get(key)
+            if solution is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return solution
+        
+        # Pas de fits() ici : il calcule le nombre de mouvements, coûteux au-delà de 3 bâtonnets
+        solution = self._load(key)
+        if solution is not None:
+            with self._lock:
+                self.disk_hits += 1
+                self._store(key, solution)
+        return solution
+    
+    def fits(self, n_disks: int, n_rods: int = 3) -> bool:
+        """Indique si la solution serait gardée empaquetée (sinon, sous forme paresseuse)"""
+        # Au-delà de MAX_RODS bâtonnets, MoveBuffer ne sait pas coder les mouvements
+        if n_rods > MAX_RODS:
+            return False
+        return packed_size(n_disks, n_rods) <= self.max_bytes // MAX_ENTRY_SHARE
+    
+    def put(self, n_disks: int, n_rods: int, solution: Solution) -> None:
+        """Enregistre une solution calculée ailleurs (par exemple dans un autre processus)"""
+        key = (n_disks, n_rods)
+        if self.directory is not None and isinstance(solution, MoveBuffer):
+            self._save(key, solution)
+        with self._lock:
+            self.misses += 1
+            self._store(key, solution)
+    
+    def clear(self) -> None:
+        """Vide le niveau mémoire (le niveau disque est conservé)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, float]:
+        """Retourne les compteurs du cache"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "directory": str(self.directory) if self.directory is not None else None,
+            }
+    
+    def format_stats(self) -> str:
+        """Statistiques du cache sous forme de texte lisible"""
+        stats = self.stats()
+        lines = [
+            "Cache des solutions:",
+            f"- Entrées: {stats['size']} ({stats['bytes'] / (1 << 20):.1f} Mo "
+            f"sur {stats['max_bytes'] / (1 << 20):.1f} Mo)",
+            f"- Succès: {stats['hits']} en mémoire, {stats['disk_hits']} sur disque "
+            f"({stats['hit_rate']:.0%} des requêtes)",
+            f"- Calculs: {stats['misses']}",
+            f"- Évictions: {stats['evictions']}",
+        ]
+        if stats["directory"] is not None:
+            lines.append(f"- Répertoire: {stats['directory']}")
+        return "\n".join(lines)
+
+
+# Cache partagé par le processus (voir get_solution_cache)
+_default_cache: Optional[SolutionCache] = None
+
+
+def configure_solution_cache(max_bytes: int = DEFAULT_MAX_BYTES,
+                             directory: Optional[Path] = None) -> SolutionCache:
+    """Remplace le cache partagé du processus par un cache de ces paramètres"""
+    global _default_cache
+    _default_cache = SolutionCache(max_bytes, directory)
+    return _default_cache
+
+
+def get_solution_cache() -> SolutionCache:
+    """Retourne le cache partagé du processus (créé avec les paramètres par défaut)"""
+    if _default_cache is None:
+        return configure_solution_cache()
+    return _default_cache
@@ -5,7 +5,12 @@ Implémente l'algorithme récursif pour résoudre le puzzle
 """
 
 import sys
-from typing import List, Tuple
+from collections.abc import Sequence
+from typing import Iterator, List, Optional, Tuple, Union
+
+from frame_stewart import DEFAULT_TABLE as FRAME_STEWART_TABLE
+from move_buffer import MoveBuffer
+from output import write_moves
 
 
 def hanoi_recursive(n: int, source: int, destination: int, auxiliary: int, moves: List[str], verbose: bool = True) -> None: 
@@ -29,51 +34,405 @@ def hanoi_recursive(n: int, source: int, destination: int, auxiliary: int, moves
     hanoi_recursive(n-1, auxiliary, destination, source, moves, verbose)
 
 
-def solve_hanoi(n_disks: int, n_rods: int = 3, verbose: bool = True) -> List[str]:
+def iter_hanoi_pairs(n: int, source: int, destination: int, auxiliary: int) -> Iterator[Tuple[int, int]]:
+    """
+    Itère les mouvements (source, destination) de la solution classique sans récursion
+
+    Le mouvement m (1-indexé) déplace le disque d'indice (bits de poids faible nuls de m),
+    ses bâtonnets se déduisent directement des bits de m.
+    """
+    # Le sens de rotation du petit disque dépend de la parité du nombre de disques
+    pegs = (source, destination, auxiliary) if n % 2 == 0 else (source, auxiliary, destination)
+    for m in range(1, 1 << n):
+        yield pegs[(m & (m - 1)) % 3], pegs[((m | (m - 1)) + 1) % 3]
+
+
+def _peg_table(permutation: Sequence[int]) -> bytes:
+    """Table pour bytes.translate qui renomme les bâtonnets des deux mouvements (4 bits) de chaque octet"""
+    nibbles = list(range(16))
+    for source in range(3):
+        for destination in range(3):
+            nibbles[(source << 2) | destination] = (permutation[source] << 2) | permutation[destination]
+    return bytes((nibbles[byte >> 4] << 4) | nibbles[byte & 0x0F] for byte in range(256))
+
+
+# Solution canonique 1 -> 3 (codes 0-indexés) : S(n+1) = S(n) renommée 1 -> 2,
+# puis 1->3, puis S(n) renommée 2 -> 3
+_FIRST_HALF = _peg_table((0, 2, 1))
+_SECOND_HALF = _peg_table((1, 0, 2))
+_MIDDLE_MOVE = 0x2
+
+
+def hanoi_doubling(n_disks: int, source: int = 1, destination: int = 3, auxiliary: int = 2) -> MoveBuffer:
+    """
+    Construit la solution classique empaquetée (4 bits par mouvement) par doublements
+    
+    Chaque niveau est formé du bloc précédent renommé deux fois (bytes.translate
+    sur tout le bloc) au lieu d'une récursion par mouvement. Un mouvement de
+    bourrage garde les blocs de 2^n mouvements alignés sur l'octet ; il devient
+    le mouvement du plus grand disque au niveau suivant.
+    
+    Args:
+        n_disks: Nombre de disques
+        source: Bâtonnet de départ
+        destination: Bâtonnet d'arrivée
+        auxiliary: Bâtonnet intermédiaire
+    
+    Returns:
+        MoveBuffer à 3 bâtonnets contenant les 2^n - 1 mouvements
+    """
+    if sorted((source, destination, auxiliary)) != [1, 2, 3]:
+        raise ValueError(f"Bâtonnets invalides: {source}, {destination}, {auxiliary}")
+    if n_disks <= 0:
+        return MoveBuffer(3)
+    
+    block = bytearray([_MIDDLE_MOVE << 4])
+    for _ in range(n_disks - 1):
+        half = len(block)
+        block = block.translate(_FIRST_HALF) + block.translate(_SECOND_HALF)
+        block[half - 1] = (block[half - 1] & 0xF0) | _MIDDLE_MOVE
+    
+    if (source, destination, auxiliary) != (1, 3, 2):
+        block = block.translate(_peg_table((source - 1, auxiliary - 1, destination - 1)))
+    block[-1] &= 0xF0  # Retirer le mouvement de bourrage
+    return MoveBuffer(3, block, (1 << n_disks) - 1)
+
+
+def iter_solution_pairs(n_disks: int, n_rods: int = 3) -> Iterator[Tuple[int, int]]:
+    """Itère les mouvements (source, destination) de la solution 1 -> 3 pour n_rods bâtonnets"""
+    if n_rods < 3:
+        raise ValueError("Il faut au moins 3 bâtonnets pour résoudre la Tour de Hanoï")
+    if n_disks <= 0:
+        return iter(())
+    if n_rods == 3:
+        return iter_hanoi_pairs(n_disks, 1, 3, 2)
+    # Au-delà de 3 bâtonnets : algorithme de Frame-Stewart
+    return FRAME_STEWART_TABLE.iter_moves(n_disks, 1, 3, range(1, n_rods + 1))
+
+
+def iter_hanoi(n_disks: int, n_rods: int = 3) -> Iterator[str]:
+    """
+    Génère les mouvements de la solution un par un, en mémoire constante
+    
+    Args:
+        n_disks: Nombre de disques
+        n_rods: Nombre de bâtonnets (par défaut 3)
+    
+    Returns:
+        Itérateur sur les mouvements sous forme de chaînes "source->destination"
+    """
+    if n_rods < 3:
+        raise ValueError("Il faut au moins 3 bâtonnets pour résoudre la Tour de Hanoï")
+    
+    if n_disks <= 0:
+        return iter(())
+    
+    return (f"{source}->{destination}" for source, destination in iter_solution_pairs(n_disks, n_rods))
+
+
+class HanoiSolution(Sequence):
+    """
+    Séquence paresseuse des mouvements de la solution (1 -> 3)
+    
+    Aucun mouvement n'est stocké : chaque accès est calculé directement à partir
+    des bits de l'indice, en O(n). À 3 bâtonnets, le mouvement k (0-indexé)
+    déplace le disque d tel que k+1 = (2j+1)·2^(d-1), et c'est le j-ème
+    déplacement de ce disque. Au-delà, on descend d'abord dans la décomposition
+    de Frame-Stewart jusqu'au sous-problème à 3 bâtonnets qui contient k.
+    """
+    
+    def __init__(self, n_disks: int, n_rods: int = 3):
+        self.n_disks = max(n_disks, 0)
+        self.n_rods = n_rods
+        self.n_moves = calculate_min_moves(self.n_disks, n_rods)
+    
+    @staticmethod
+    def _step(n_disks: int, disk: int) -> int:
+        """Sens de rotation du disque (2 pour le plus grand, puis alternance)"""
+        return 2 if (n_disks - disk) % 2 == 0 else 1
+    
+    def _normalize_index(self, k: int) -> int:
+        if k < 0:
+            k += self.n_moves
+        if not 0 <= k < self.n_moves:
+            raise IndexError("Indice de mouvement hors limites")
+        return k
+    
+    def _descend(self, k: int, positions: Optional[List[int]] = None):
+        """
+        Réduit le mouvement k au sous-problème à 3 bâtonnets qui le contient
+        
+        Si positions est fourni, y enregistre le bâtonnet des disques qui ne
+        bougent plus dans ce sous-problème.
+        
+        Returns:
+            Tuple (k, n, offset, labels) : indice local, nombre de disques, disques
+            plus petits ignorés, et bâtonnets (source, auxiliaire, destination)
+        """
+        n, offset = self.n_disks, 0
+        source, destination = 1, 3
+        pegs = tuple(range(1, self.n_rods + 1))
+        
+        while len(pegs) > 3 and n > 1:
+            n_pegs = len(pegs)
+            t = FRAME_STEWART_TABLE.split(n, n_pegs)
+            inter = next(p for p in pegs if p != source and p != destination)
+            first = FRAME_STEWART_TABLE.cost(t, n_pegs)
+            middle = FRAME_STEWART_TABLE.cost(n - t, n_pegs - 1)
+            
+            if k < first:
+                # Les n-t grands disques attendent sur la source
+                fixed, n, destination = (range(offset + t + 1, offset + n + 1), source), t, inter
+            elif k < first + middle:
+                # Les t petits disques sont rangés sur le bâtonnet intermédiaire
+                fixed = (range(offset + 1, offset + t + 1), inter)
+                k -= first
+                n, offset = n - t, offset + t
+                pegs = tuple(p for p in pegs if p != inter)
+            else:
+                # Les n-t grands disques sont arrivés à destination
+                fixed, n, source = (range(offset + t + 1, offset + n + 1), destination), t, inter
+                k -= first + middle
+            
+            if positions is not None:
+                disks, rod = fixed
+                for disk in disks:
+                    positions[disk] = rod
+        
+        auxiliary = next(p for p in pegs if p != source and p != destination)
+        return k, n, offset, (source, auxiliary, destination)
+    
+    def move_pair(self, k: int) -> Tuple[int, int]:
+        """Retourne le mouvement k sous forme de tuple (source, destination)"""
+        k, n, _, labels = self._descend(self._normalize_index(k))
+        m = k + 1
+        disk = (m & -m).bit_length()
+        j = m >> disk
+        step = self._step(n, disk)
+        return labels[(j * step) % 3], labels[((j + 1) * step) % 3]
+    
+    def __len__(self) -> int:
+        return self.n_moves
+    
+    def __getitem__(self, key: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(self.n_moves))]
+        source, destination = self.move_pair(key)
+        return f"{source}->{destination}"
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter_hanoi(self.n_disks, self.n_rods)
+    
+    def __contains__(self, value) -> bool:
+        try:
+            self.index(value)
+        except ValueError:
+            return False
+        return True
+    
+    def index(self, value: str, start: int = 0, stop: Optional[int] = None) -> int:
+        """
+        Retourne l'indice de la première occurrence du mouvement, en O(n) à 3 bâtonnets
+        
+        Args:
+            value: Mouvement au format "source->destination"
+            start: Indice à partir duquel chercher
+            stop: Indice (exclu) où arrêter la recherche
+        
+        Returns:
+            Indice du premier mouvement égal à value dans [start, stop)
+        """
+        if self.n_rods > 3:
+            return super().index(value, start, self.n_moves if stop is None else stop)
+        
+        start, stop, _ = slice(start, stop).indices(self.n_moves)
+        labels = (1, 2, 3)
+        try:
+            source, destination = (labels.index(int(rod)) for rod in str(value).split('->'))
+        except ValueError:
+            raise ValueError(f"{value!r} n'est pas un mouvement de la solution")
+        
+        best = None
+        for disk in range(1, self.n_disks + 1):
+            step = self._step(self.n_disks, disk)
+            if (destination - source) % 3 != step:
+                continue
+            # Premier déplacement j du disque d'indice >= start, puis j ≡ source·step (mod 3)
+            period = 1 << (disk - 1)
+            j = -(-(start + 1) // period) // 2
+            j += (source * step - j) % 3
+            if j >= 1 << (self.n_disks - disk):
+                continue
+            k = (2 * j + 1) * period - 1
+            if k < stop and (best is None or k < best):
+                best = k
+        
+        if best is None:
+            raise ValueError(f"{value!r} n'est pas dans la solution")
+        return best
+    
+    def state_at(self, k: int) -> List[List[int]]:
+        """
+        Retourne la disposition des bâtonnets après les k premiers mouvements
+        
+        Args:
+            k: Nombre de mouvements effectués (0 pour l'état initial)
+        
+        Returns:
+            Liste des disques de chaque bâtonnet (du bas vers le haut), dans l'ordre des numéros de bâtonnets
+        """
+        if not 0 <= k <= self.n_moves:
+            raise IndexError("Nombre de mouvements hors limites")
+        
+        positions = [0] * (self.n_disks + 1)
+        k, n, offset, labels = self._descend(k, positions)
+        for disk in range(1, n + 1):
+            # Nombre de déplacements du disque parmi les k premiers mouvements du sous-problème
+            count = (k + (1 << (disk - 1))) >> disk
+            positions[offset + disk] = labels[(count * self._step(n, disk)) % 3]
+        
+        rods = [[] for _ in range(max(self.n_rods, 3))]
+        for disk in range(self.n_disks, 0, -1):
+            rods[positions[disk] - 1].append(disk)
+        return rods
+    
+    def __repr__(self) -> str:
+        return f"HanoiSolution(n_disks={self.n_disks}, n_rods={self.n_rods}, n_moves={self.n_moves})"
+
+
+def solve_hanoi(n_disks: int, n_rods: int = 3, verbose: bool = True,
+                mode: str = "list", backend: str = "python") -> Union[List[str], HanoiSolution, MoveBuffer]:
     """
     Résout le problème de la Tour de Hanoï et retourne la liste des mouvements
     
     Args:
         n_disks: Nombre de disques
         n_rods: Nombre de bâtonnets (par défaut 3)
-        verbose: Si True, affiche les mouvements
+        verbose: Si True, affiche les mouvements (mode "list" uniquement)
+        mode: "list" pour une liste de chaînes, "lazy" pour une HanoiSolution paresseuse,
+              "packed" pour un MoveBuffer compact (4 bits par mouvement)
+        backend: "python" (récursion / itérateurs) ou "numpy" (génération vectorisée
+                 par blocs, voir numpy_backend) pour les modes "list" et "packed"
     
     Returns:
         Liste des mouvements sous forme de chaînes "source->destination"
     """
+    if mode not in ("list", "lazy", "packed"):
+        raise ValueError(f"Mode de résolution inconnu: {mode}")
+    if backend not in ("python", "numpy"):
+        raise ValueError(f"Moteur de résolution inconnu: {backend}")
+    
     if n_disks <= 0:
-        return []
+        if mode == "lazy":
+            return HanoiSolution(0, max(n_rods, 3))
+        return MoveBuffer(max(n_rods, 3)) if mode == "packed" else []
     
     if n_rods < 3:
         raise ValueError("Il faut au moins 3 bâtonnets pour résoudre la Tour de Hanoï")
     
-    moves = []
+    if mode == "lazy":
+        return HanoiSolution(n_disks, n_rods)
+    
+    if backend == "numpy":
+        return _solve_hanoi_numpy(n_disks, n_rods, verbose, mode)
     
-    # Pour l'instant, on implémente seulement le cas classique à 3 bâtonnets
     if n_rods == 3:
-        hanoi_recursive(n_disks, 1, 3, 2, moves, verbose)
-    else:
-        # Pour plus de 3 bâtonnets, on utilise l'algorithme de Frame-Stewart
-        # (implémentation simplifiée pour le moment)
+        # Construction par doublements, puis décodage des chaînes par table
+        packed = hanoi_doubling(n_disks)
+        if mode == "packed":
+            return packed
+        moves = list(packed)
         if verbose:
-            print(f"Résolution avec {n_rods} bâtonnets non encore implémentée")
-            print("Utilisation de l'algorithme classique à 3 bâtonnets")
-        hanoi_recursive(n_disks, 1, 3, 2, moves, verbose)
+            sys.stdout.write("\n".join(moves) + "\n")
+        return moves
+    
+    if mode == "packed":
+        return MoveBuffer.from_pairs(iter_solution_pairs(n_disks, n_rods), n_rods)
     
+    # Pour plus de 3 bâtonnets, on utilise l'algorithme de Frame-Stewart
+    moves = []
+    for source, destination in iter_solution_pairs(n_disks, n_rods):
+        move = f"{source}->{destination}"
+        moves.append(move)
+        if verbose:
+            print(move)
     return moves
 
 
-def calculate_min_moves(n_disks: int) -> int:
+def _solve_hanoi_numpy(n_disks: int, n_rods: int, verbose: bool, mode: str) -> Union[List[str], MoveBuffer]:
+    """solve_hanoi avec le moteur NumPy : les mouvements sont produits par blocs vectorisés"""
+    try:
+        from numpy_backend import format_chunk, iter_solution_chunks, move_names
+    except ImportError as e:
+        raise ValueError(f"Le moteur numpy nécessite NumPy: {e}")
+    
+    if mode == "packed":
+        return MoveBuffer.from_arrays(iter_solution_chunks(n_disks, n_rods), n_rods)
+    
+    names = move_names(n_rods)
+    moves = []
+    for sources, destinations in iter_solution_chunks(n_disks, n_rods):
+        chunk = format_chunk(sources, destinations, names)
+        moves.extend(chunk)
+        if verbose:
+            sys.stdout.write("\n".join(chunk) + "\n")
+    return moves
+
+
+def calculate_min_moves(n_disks: int, n_rods: int = 3) -> int:
     """
     Calcule le nombre minimum de mouvements pour n disques
     
     Args:
         n_disks: Nombre de disques
+        n_rods: Nombre de bâtonnets (par défaut 3)
     
     Returns:
-        Nombre minimum de mouvements (2^n - 1)
+        Nombre minimum de mouvements (2^n - 1 à 3 bâtonnets, Frame-Stewart au-delà)
     """
-    return (2 ** n_disks) - 1
+    if n_rods == 3:
+        return (2 ** n_disks) - 1
+    return FRAME_STEWART_TABLE.cost(n_disks, n_rods)
+
+
+def distance(state: List[List[int]], goal_rod: Optional[int] = None) -> int:
+    """
+    Calcule le nombre minimum de mouvements entre un état et l'état final
+    
+    À 3 bâtonnets, la distance se calcule directement en O(n) ; au-delà, elle vient
+    de la table des distances (distance_table.py) quand NumPy est disponible,
+    sinon d'une recherche en largeur.
+    
+    Args:
+        state: Disques de chaque bâtonnet, du bas vers le haut
+        goal_rod: Bâtonnet d'arrivée (0-indexé, le dernier par défaut)
+    
+    Returns:
+        Distance exacte à l'état final
+    """
+    n_rods = len(state)
+    n_disks = sum(len(rod) for rod in state)
+    if n_rods < 3:
+        raise ValueError("Il faut au moins 3 bâtonnets pour résoudre la Tour de Hanoï")
+    if goal_rod is None:
+        goal_rod = n_rods - 1
+    
+    # Imports locaux : ces modules dépendent eux-mêmes de solve
+    if n_rods == 3:
+        from state_solver import distance_to_goal
+        return distance_to_goal(state, goal_rod)
+    
+    try:
+        from distance_table import MAX_TABLE_STATES, get_distance_table
+    except ImportError:
+        get_distance_table = None
+    
+    if get_distance_table is not None and n_rods ** n_disks <= MAX_TABLE_STATES:
+        return get_distance_table(n_disks, n_rods, goal_rod).distance(state)
+    
+    from state_space import StateSpace
+    space = StateSpace(n_disks, n_rods)
+    return len(space.bfs(space.encode(state), space.goal_code(goal_rod)))
 
 
 def parse_input(input_str: str) -> Tuple[int, int]:
@@ -120,12 +479,15 @@ def main():
         print(f"Résolution de la Tour de Hanoï:")
         print(f"- Nombre de disques: {n_disks}")
         print(f"- Nombre de bâtonnets: {n_rods}")
-        print(f"- Nombre minimum de mouvements: {calculate_min_moves(n_disks)}")
+        print(f"- Nombre minimum de mouvements: {calculate_min_moves(n_disks, n_rods)}")
         print("\nSéquence de mouvements:")
         
-        moves = solve_hanoi(n_disks, n_rods)
+        # Écriture par gros blocs : print() par mouvement coûterait plus que le calcul
+        sys.stdout.flush()
+        n_moves = write_moves(sys.stdout.buffer, iter_solution_pairs(n_disks, n_rods), n_rods)
+        sys.stdout.buffer.flush()
         
-        print(f"\nRésolution terminée en {len(moves)} mouvements.")
+        print(f"\nRésolution terminée en {n_moves} mouvements.")
         
     except ValueError as e:
         print(f"Erreur: {e}")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Thread de calcul pour l'interface graphique
+Les calculs lourds (conseils, solutions) sont exécutés hors du thread Tk ; les
+résultats reviennent par une file lue avec master.after, et les demandes
+devenues obsolètes (l'état du jeu a changé entre-temps) sont annulées
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from state_space import SearchCancelled
+
+# Intervalle (en ms) entre deux lectures de la file des résultats
+POLL_INTERVAL = 20
+
+
+class SolverJob:
+    """
+    Demande de calcul adressée au thread de calcul
+    
+    func(cancel) effectue le calcul ; cancel est un threading.Event que les
+    recherches longues consultent régulièrement (voir StateSpace.bfs).
+    """
+    
+    def __init__(self, kind: str, version: int, func: Callable[[threading.Event], Any],
+                 callback: Callable[[Any], None], on_error: Optional[Callable[[Exception], None]] = None):
+        self.kind = kind
+        self.version = version
+        self.func = func
+        self.callback = callback
+        self.on_error = on_error
+        self.cancel = threading.Event()
+
+
+class SolverWorker:
+    """
+    Exécute les calculs de l'interface dans un thread dédié
+    
+    Chaque demande porte un type ("hint", "solve"...) et la version de l'état du
+    jeu pour laquelle elle a été faite. Seule la dernière demande de chaque type
+    est conservée ; une demande plus récente annule celle en cours du même type.
+    Les callbacks sont toujours appelés dans le thread Tk.
+    """
+    
+    def __init__(self, master, poll_interval: int = POLL_INTERVAL):
+        self.master = master
+        self.poll_interval = poll_interval
+        
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending: Dict[str, SolverJob] = {}
+        self._running: Optional[SolverJob] = None
+        self._results: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._poll_id = None
+    
+    def submit(self, kind: str, version: int, func: Callable[[threading.Event], Any],
+               callback: Callable[[Any], None], on_error: Optional[Callable[[Exception], None]] = None) -> SolverJob:
+        """
+        Demande un calcul en arrière-plan (remplace la demande en attente du même type)
+        
+        Args:
+            kind: Type de la demande
+            version: Version de l'état du jeu au moment de la demande
+            func: Calcul à effectuer, appelé avec l'événement d'annulation
+            callback: Appelé avec le résultat dans le thread Tk
+            on_error: Appelé avec l'exception si le calcul échoue
+        
+        Returns:
+            La demande créée
+        """
+        job = SolverJob(kind, version, func, callback, on_error)
+        with self._lock:
+            previous = self._pending.pop(kind, None)
+            if previous is not None:
+                previous.cancel.set()
+            if self._running is not None and self._running.kind == kind:
+                self._running.cancel.set()
+            self._pending[kind] = job
+            
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._wakeup.notify()
+        
+        self._schedule_poll()
+        return job
+    
+    def cancel_older(self, version: int) -> None:
+        """Annule les demandes faites pour une version de l'état antérieure à version"""
+        with self._lock:
+            for kind, job in list(self._pending.items()):
+                if job.version < version:
+                    job.cancel.set()
+                    del self._pending[kind]
+            if self._running is not None and self._running.version < version:
+                self._running.cancel.set()
+    
+    def cancel(self, kind: Optional[str] = None) -> None:
+        """Annule les demandes en attente ou en cours (du type donné, ou toutes)"""
+        with self._lock:
+            for pending_kind, job in list(self._pending.items()):
+                if kind is None or pending_kind == kind:
+                    job.cancel.set()
+                    del self._pending[pending_kind]
+            if self._running is not None and (kind is None or self._running.kind == kind):
+                self._running.cancel.set()
+    
+    def is_busy(self, kind: Optional[str] = None) -> bool:
+        """Indique si une demande (du type donné, ou de n'importe quel type) est en attente ou en cours"""
+        with self._lock:
+            jobs = list(self._pending.values())
+            if self._running is not None:
+                jobs.append(self._running)
+            return any(not job.cancel.is_set() and (kind is None or job.kind == kind) for job in jobs)
+    
+    def _run(self) -> None:
+        """Boucle du thread de calcul : traite les demandes dans leur ordre d'arrivée"""
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._wakeup.wait()
+                kind = next(iter(self._pending))
+                job = self._running = self._pending.pop(kind)
+            
+            try:
+                if not job.cancel.is_set():
+                    self._results.put((job, job.func(job.cancel), None))
+            except SearchCancelled:
+                pass
+            except Exception as e:
+                self._results.put((job, None, e))
+            finally:
+                with self._lock:
+                    self._running = None
+    
+    def _schedule_poll(self) -> None:
+        if self._poll_id is None:
+            self._poll_id = self.master.after(self.poll_interval, self._poll)
+    
+    def _poll(self) -> None:
+        """Transmet les résultats au thread Tk (appelé par master.after)"""
+        self._poll_id = None
+        while True:
+            try:
+                job, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            # Un résultat calculé pour un état dépassé est ignoré
+            if job.cancel.is_set():
+                continue
+            if error is None:
+                job.callback(result)
+            elif job.on_error is not None:
+                job.on_error(error)
+            else:
+                print(f"Erreur lors d'un calcul en arrière-plan: {error}")
+        
+        with self._lock:
+            busy = bool(self._pending) or self._running is not None
+        if busy or not self._results.empty():
+            self._schedule_poll()
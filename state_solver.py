@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Solveur optimal à 3 bâtonnets depuis un état quelconque
+Stratégie du plus grand disque d'abord : distance exacte et coup recommandé en O(n),
+séquence complète en temps linéaire en nombre de mouvements, vers une tour ou
+vers un état d'arrivée quelconque
+"""
+
+from typing import Iterator, List, Optional, Tuple
+
+from solve import iter_hanoi_pairs
+
+Pair = Tuple[int, int]
+
+
+def disk_positions(rods: List[List[int]]) -> List[int]:
+    """
+    Retourne le bâtonnet (0-indexé) de chaque disque
+    
+    Args:
+        rods: Disques de chaque bâtonnet, du bas vers le haut
+    
+    Returns:
+        Liste indexée par numéro de disque (l'indice 0 est inutilisé)
+    """
+    n_disks = sum(len(rod) for rod in rods)
+    positions = [-1] * (n_disks + 1)
+    for rod_idx, rod in enumerate(rods):
+        for below, disk in zip([None] + rod, rod):
+            if not 1 <= disk <= n_disks or positions[disk] != -1:
+                raise ValueError(f"État invalide: disque {disk} inattendu")
+            if below is not None and below < disk:
+                raise ValueError(f"État invalide: disque {disk} posé sur le disque {below}")
+            positions[disk] = rod_idx
+    return positions
+
+
+def parse_state(text: str) -> List[List[int]]:
+    """
+    Lit un état écrit bâtonnet par bâtonnet, par exemple "3,2,1||" ou "3|2,1|"
+    
+    Les bâtonnets sont séparés par "|" et leurs disques listés du bas vers le haut.
+    
+    Returns:
+        Disques de chaque bâtonnet (l'état est validé, voir disk_positions)
+    """
+    try:
+        rods = [[int(disk) for disk in part.split(",")] if part.strip() else [] for part in text.split("|")]
+    except ValueError:
+        raise ValueError(f"État invalide: {text!r} (exemple: '3,2,1||')")
+    if len(rods) < 3:
+        raise ValueError("Il faut au moins 3 bâtonnets")
+    disk_positions(rods)
+    if not any(rods):
+        raise ValueError("L'état ne contient aucun disque")
+    return rods
+
+
+def parse_start_goal(input_str: str) -> Tuple[List[List[int]], List[List[int]]]:
+    """
+    Lit un couple d'états "départ>arrivée", par exemple "3,2,1||>|3,2,1|"
+    
+    Returns:
+        États de départ et d'arrivée, avec les mêmes disques et bâtonnets
+    """
+    parts = input_str.split(">")
+    if len(parts) != 2:
+        raise ValueError("Format invalide. Utilisez: 'départ>arrivée' (exemple: '3,2,1||>|3,2,1|')")
+    start, goal = parse_state(parts[0].strip()), parse_state(parts[1].strip())
+    if len(start) != len(goal):
+        raise ValueError("Les états de départ et d'arrivée n'ont pas le même nombre de bâtonnets")
+    if sum(len(rod) for rod in start) != sum(len(rod) for rod in goal):
+        raise ValueError("Les états de départ et d'arrivée n'ont pas le même nombre de disques")
+    return start, goal
+
+
+def format_state(rods: List[List[int]]) -> str:
+    """Écrit un état dans la syntaxe de parse_state"""
+    return "|".join(",".join(map(str, rod)) for rod in rods)
+
+
+def _mismatches(rods: List[List[int]], goal_rod: int) -> List[Tuple[int, int, int, int]]:
+    """
+    Parcourt les disques du plus grand au plus petit en suivant la cible de chacun
+    
+    Returns:
+        Disques mal placés sous forme (disque, bâtonnet actuel, cible, bâtonnet auxiliaire),
+        du plus grand au plus petit
+    """
+    if len(rods) != 3:
+        raise ValueError("Le solveur direct ne gère que 3 bâtonnets")
+    
+    positions = disk_positions(rods)
+    target = goal_rod
+    mismatches = []
+    for disk in range(len(positions) - 1, 0, -1):
+        rod = positions[disk]
+        if rod != target:
+            # Les disques plus petits doivent d'abord libérer le passage sur le troisième bâtonnet
+            auxiliary = 3 - rod - target
+            mismatches.append((disk, rod, target, auxiliary))
+            target = auxiliary
+    return mismatches
+
+
+def distance_to_goal(rods: List[List[int]], goal_rod: int = 2) -> int:
+    """
+    Calcule le nombre minimum de mouvements pour rassembler les disques sur goal_rod
+    
+    Args:
+        rods: Disques de chaque bâtonnet, du bas vers le haut
+        goal_rod: Bâtonnet d'arrivée (0-indexé, le dernier par défaut)
+    
+    Returns:
+        Distance exacte à l'état final
+    """
+    return sum(1 << (disk - 1) for disk, _, _, _ in _mismatches(rods, goal_rod))
+
+
+def recommended_move(rods: List[List[int]], goal_rod: int = 2) -> Optional[str]:
+    """
+    Retourne le premier coup d'une solution optimale, ou None si le jeu est terminé
+    
+    Args:
+        rods: Disques de chaque bâtonnet, du bas vers le haut
+        goal_rod: Bâtonnet d'arrivée (0-indexé, le dernier par défaut)
+    
+    Returns:
+        Mouvement au format "source->destination" (bâtonnets numérotés à partir de 1)
+    """
+    mismatches = _mismatches(rods, goal_rod)
+    if not mismatches:
+        return None
+    # Le plus petit disque mal placé est libre : tous les plus petits sont sur son auxiliaire
+    _, rod, target, _ = mismatches[-1]
+    return f"{rod + 1}->{target + 1}"
+
+
+def iter_solution_from_state(rods: List[List[int]], goal_rod: int = 2) -> Iterator[str]:
+    """
+    Génère la séquence optimale de mouvements depuis un état quelconque
+    
+    Args:
+        rods: Disques de chaque bâtonnet, du bas vers le haut
+        goal_rod: Bâtonnet d'arrivée (0-indexé, le dernier par défaut)
+    
+    Returns:
+        Itérateur sur les mouvements au format "source->destination"
+    """
+    mismatches = _mismatches(rods, goal_rod)
+    
+    def generate() -> Iterator[str]:
+        for disk, rod, target, auxiliary in reversed(mismatches):
+            # Déplacer le disque, puis ramener la tour des disques plus petits par-dessus
+            yield f"{rod + 1}->{target + 1}"
+            for source, destination in iter_hanoi_pairs(disk - 1, auxiliary + 1, target + 1, rod + 1):
+                yield f"{source}->{destination}"
+    
+    return generate()
+
+
+def solve_from_state(rods: List[List[int]], goal_rod: int = 2) -> List[str]:
+    """
+    Calcule la séquence optimale de mouvements depuis un état quelconque
+    
+    Args:
+        rods: Disques de chaque bâtonnet, du bas vers le haut
+        goal_rod: Bâtonnet d'arrivée (0-indexé, le dernier par défaut)
+    
+    Returns:
+        Liste des mouvements au format "source->destination"
+    """
+    return list(iter_solution_from_state(rods, goal_rod))
+
+
+def _tower_distance(positions: List[int], n_disks: int, rod: int) -> int:
+    """Distance entre les disques 1..n_disks placés selon positions et leur tour sur rod"""
+    distance = 0
+    for disk in range(n_disks, 0, -1):
+        if positions[disk] != rod:
+            distance += 1 << (disk - 1)
+            rod = 3 - positions[disk] - rod
+    return distance
+
+
+def _iter_to_tower(positions: List[int], n_disks: int, rod: int) -> Iterator[Pair]:
+    """Mouvements (0-indexés) qui rassemblent les disques 1..n_disks en tour sur rod"""
+    mismatches = []
+    for disk in range(n_disks, 0, -1):
+        if positions[disk] != rod:
+            auxiliary = 3 - positions[disk] - rod
+            mismatches.append((disk, positions[disk], rod, auxiliary))
+            rod = auxiliary
+    for disk, source, target, auxiliary in reversed(mismatches):
+        yield source, target
+        for pair in iter_hanoi_pairs(disk - 1, auxiliary, target, source):
+            yield pair
+
+
+def _iter_from_tower(positions: List[int], n_disks: int, rod: int) -> Iterator[Pair]:
+    """Mouvements (0-indexés) qui dispersent la tour des disques 1..n_disks de rod selon positions"""
+    for disk in range(n_disks, 0, -1):
+        target = positions[disk]
+        if target != rod:
+            # Les plus petits libèrent le passage, puis forment la nouvelle tour à compléter
+            auxiliary = 3 - rod - target
+            yield from iter_hanoi_pairs(disk - 1, rod, auxiliary, target)
+            yield rod, target
+            rod = auxiliary
+
+
+def _plan_between(start: List[List[int]], goal: List[List[int]]) -> Tuple[int, int, List[int], List[int], bool]:
+    """
+    Choisit le trajet optimal entre deux états à 3 bâtonnets
+    
+    Les disques plus grands que le plus grand disque mal placé k ne bougent pas.
+    Le disque k va soit directement à sa place (les plus petits passent par le
+    troisième bâtonnet), soit en deux fois par le troisième bâtonnet ; le plus
+    court des deux trajets est optimal.
+    
+    Returns:
+        (distance, k, positions de départ, positions d'arrivée, True si k bouge deux fois)
+    """
+    if len(start) != 3 or len(goal) != 3:
+        raise ValueError("Le solveur direct ne gère que 3 bâtonnets")
+    source_positions = disk_positions(start)
+    target_positions = disk_positions(goal)
+    if len(source_positions) != len(target_positions):
+        raise ValueError("Les états de départ et d'arrivée n'ont pas le même nombre de disques")
+    
+    disk = len(source_positions) - 1
+    while disk > 0 and source_positions[disk] == target_positions[disk]:
+        disk -= 1
+    if disk == 0:
+        return 0, 0, source_positions, target_positions, False
+    
+    source, target = source_positions[disk], target_positions[disk]
+    other = 3 - source - target
+    direct = (_tower_distance(source_positions, disk - 1, other) + 1
+              + _tower_distance(target_positions, disk - 1, other))
+    # Détour : k passe par other pendant que la tour des plus petits va de target à source
+    detour = (_tower_distance(source_positions, disk - 1, target) + (1 << (disk - 1)) + 1
+              + _tower_distance(target_positions, disk - 1, source))
+    if detour < direct:
+        return detour, disk, source_positions, target_positions, True
+    return direct, disk, source_positions, target_positions, False
+
+
+def distance_between(start: List[List[int]], goal: List[List[int]]) -> int:
+    """
+    Calcule en O(n) le nombre minimum de mouvements entre deux états à 3 bâtonnets
+    
+    Args:
+        start: État de départ (disques de chaque bâtonnet, du bas vers le haut)
+        goal: État d'arrivée, avec les mêmes disques
+    
+    Returns:
+        Distance exacte entre les deux états
+    """
+    return _plan_between(start, goal)[0]
+
+
+def iter_pairs_between(start: List[List[int]], goal: List[List[int]]) -> Iterator[Pair]:
+    """
+    Génère une séquence optimale entre deux états à 3 bâtonnets, en temps linéaire
+    
+    Returns:
+        Itérateur sur les mouvements (source, destination), bâtonnets numérotés à partir de 1
+    """
+    _, disk, source_positions, target_positions, detour = _plan_between(start, goal)
+    
+    def generate() -> Iterator[Pair]:
+        if disk == 0:
+            return
+        source, target = source_positions[disk], target_positions[disk]
+        other = 3 - source - target
+        if detour:
+            moves = [_iter_to_tower(source_positions, disk - 1, target), iter(((source, other),)),
+                     iter_hanoi_pairs(disk - 1, target, source, other), iter(((other, target),)),
+                     _iter_from_tower(target_positions, disk - 1, source)]
+        else:
+            moves = [_iter_to_tower(source_positions, disk - 1, other), iter(((source, target),)),
+                     _iter_from_tower(target_positions, disk - 1, other)]
+        for part in moves:
+            for from_rod, to_rod in part:
+                yield from_rod + 1, to_rod + 1
+    
+    return generate()
+
+
+def solve_between(start: List[List[int]], goal: List[List[int]]) -> List[str]:
+    """
+    Calcule une séquence optimale entre deux états quelconques
+    
+    À 3 bâtonnets, calcul direct (voir iter_pairs_between) ; au-delà, recherche
+    en largeur dans l'espace des états.
+    
+    Args:
+        start: État de départ (disques de chaque bâtonnet, du bas vers le haut)
+        goal: État d'arrivée, avec les mêmes disques et le même nombre de bâtonnets
+    
+    Returns:
+        Liste des mouvements au format "source->destination"
+    """
+    if len(start) != len(goal):
+        raise ValueError("Les états de départ et d'arrivée n'ont pas le même nombre de bâtonnets")
+    if len(start) == 3:
+        return [f"{source}->{destination}" for source, destination in iter_pairs_between(start, goal)]
+    
+    from state_space import StateSpace  # Seulement au-delà de 3 bâtonnets
+    # disk_positions valide les deux états (disques 1 à n, chacun une fois)
+    if len(disk_positions(start)) != len(disk_positions(goal)):
+        raise ValueError("Les états de départ et d'arrivée n'ont pas le même nombre de disques")
+    space = StateSpace(sum(len(rod) for rod in start), len(start))
+    return space.bfs(space.encode(start), space.encode(goal))
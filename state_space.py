@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Espace des états de la Tour de Hanoï codés en entiers
+Chaque état est le tableau disque -> bâtonnet écrit en base k (un chiffre par disque),
+ce qui permet des recherches sans copier de listes
+"""
+
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from stats import SolverStats
+
+# Au-delà, le bitset préalloué des états visités ne tient plus raisonnablement en mémoire
+MAX_DENSE_STATES = 1 << 31
+
+# Au-delà, les mouvements d'arrivée sont gardés dans un dict (états atteints seulement)
+# plutôt que dans un tableau préalloué d'un octet par état
+MAX_DENSE_PARENT_STATES = 1 << 24
+
+# Nombre d'états développés entre deux vérifications de l'annulation
+CANCEL_CHECK_INTERVAL = 1024
+
+
+class SearchCancelled(Exception):
+    """Levée quand une recherche est annulée avant d'avoir abouti"""
+
+
+class StateSpace:
+    """
+    Espace des états pour n_disks disques et n_rods bâtonnets
+    
+    Le chiffre d'indice d-1 (en base n_rods) du code est le bâtonnet (0-indexé)
+    du disque d ; le disque 1, le plus petit, est le chiffre de poids faible.
+    Les codes vont de 0 à n_rods^n_disks - 1 et servent d'indices de tableaux.
+    """
+    
+    def __init__(self, n_disks: int, n_rods: int = 3):
+        if n_rods < 3 or n_rods > 16:
+            raise ValueError("Le nombre de bâtonnets doit être entre 3 et 16")
+        self.n_disks = n_disks
+        self.n_rods = n_rods
+        self.powers = [n_rods ** i for i in range(n_disks)]
+        self.size = n_rods ** n_disks
+    
+    def encode(self, rods: List[List[int]]) -> int:
+        """Convertit une liste de bâtonnets (du bas vers le haut) en code d'état"""
+        code = 0
+        for rod_idx, rod in enumerate(rods):
+            for disk in rod:
+                code += rod_idx * self.powers[disk - 1]
+        return code
+    
+    def decode(self, code: int) -> List[List[int]]:
+        """Convertit un code d'état en liste de bâtonnets (du bas vers le haut)"""
+        rods = [[] for _ in range(self.n_rods)]
+        for disk in range(self.n_disks, 0, -1):
+            rods[(code // self.powers[disk - 1]) % self.n_rods].append(disk)
+        return rods
+    
+    def goal_code(self, goal_rod: Optional[int] = None) -> int:
+        """Code de l'état où tous les disques sont sur goal_rod (le dernier par défaut)"""
+        if goal_rod is None:
+            goal_rod = self.n_rods - 1
+        return goal_rod * (self.size - 1) // (self.n_rods - 1)
+    
+    def rod_masks(self, code: int) -> List[int]:
+        """
+        Retourne, pour chaque bâtonnet, le masque de bits des disques qu'il porte
+        
+        Le bit d-1 est à 1 si le disque d est sur le bâtonnet ; le disque du dessus
+        est donc le bit de poids faible (mask & -mask).
+        """
+        masks = [0] * self.n_rods
+        n_rods = self.n_rods
+        bit = 1
+        for _ in range(self.n_disks):
+            code, rod = divmod(code, n_rods)
+            masks[rod] |= bit
+            bit <<= 1
+        return masks
+    
+    def successors(self, code: int) -> Iterator[Tuple[int, int, int]]:
+        """
+        Génère les états voisins sous forme (code, bâtonnet source, bâtonnet destination)
+        
+        Les bâtonnets sont 0-indexés ; le nouveau code est obtenu par une simple
+        addition, sans construire de liste intermédiaire.
+        """
+        masks = self.rod_masks(code)
+        tops = [mask & -mask for mask in masks]
+        for from_rod, top in enumerate(tops):
+            if not top:
+                continue
+            shift = self.powers[top.bit_length() - 1]
+            for to_rod, other in enumerate(tops):
+                if to_rod != from_rod and (not other or top < other):
+                    yield code + (to_rod - from_rod) * shift, from_rod, to_rod
+    
+    def bfs(self, start: int, goal: int, cancel=None, stats: Optional[SolverStats] = None) -> List[str]:
+        """
+        Recherche en largeur d'un plus court chemin entre deux codes d'état
+        
+        Les états visités sont marqués dans un bitset préalloué indexé par le code,
+        et le mouvement qui a mené à chaque état est gardé dans un tableau d'octets
+        (au lieu d'une liste de mouvements par nœud), ou dans un dict quand l'espace
+        dépasse MAX_DENSE_PARENT_STATES : la recherche n'en atteint alors qu'une petite partie.
+        
+        Args:
+            start: Code de l'état de départ
+            goal: Code de l'état d'arrivée
+            cancel: threading.Event optionnel ; la recherche lève SearchCancelled quand il est activé
+            stats: Statistiques à compléter (états développés, frontière maximale, visités)
+        
+        Returns:
+            Liste des mouvements au format "source->destination"
+        """
+        if start == goal:
+            return []
+        if self.size > MAX_DENSE_STATES:
+            raise ValueError(f"Espace d'états trop grand pour une recherche en mémoire ({self.size} états)")
+        
+        n_rods = self.n_rods
+        visited = bytearray((self.size + 7) >> 3)
+        # Mouvement d'arrivée de chaque état : from_rod * n_rods + to_rod
+        parent_moves = bytearray(self.size) if self.size <= MAX_DENSE_PARENT_STATES else {}
+        visited[start >> 3] |= 1 << (start & 7)
+        
+        queue = deque([start])
+        expanded = 0
+        n_visited = 1
+        peak_frontier = 1
+        found = False
+        while queue and not found:
+            code = queue.popleft()
+            expanded += 1
+            if cancel is not None and expanded % CANCEL_CHECK_INTERVAL == 0 and cancel.is_set():
+                raise SearchCancelled()
+            for next_code, from_rod, to_rod in self.successors(code):
+                byte, bit = next_code >> 3, 1 << (next_code & 7)
+                if visited[byte] & bit:
+                    continue
+                visited[byte] |= bit
+                n_visited += 1
+                parent_moves[next_code] = from_rod * n_rods + to_rod
+                if next_code == goal:
+                    found = True
+                    break
+                queue.append(next_code)
+            if len(queue) > peak_frontier:
+                peak_frontier = len(queue)
+        
+        # Liste vide si aucune solution trouvée (ne devrait pas arriver)
+        path = self._path_to(start, goal, parent_moves) if found else []
+        if stats is not None:
+            stats.states_expanded += expanded
+            stats.visited += n_visited
+            stats.peak_frontier = max(stats.peak_frontier, peak_frontier)
+            stats.moves_generated += len(path)
+        return path
+    
+    def _path_to(self, start: int, goal: int, parent_moves: Union[bytearray, Dict[int, int]]) -> List[str]:
+        """Reconstruit le chemin en remontant les mouvements d'arrivée depuis goal"""
+        moves = []
+        code = goal
+        while code != start:
+            from_rod, to_rod = divmod(parent_moves[code], self.n_rods)
+            # Le disque déplacé est maintenant au sommet du bâtonnet de destination
+            mask = self.rod_masks(code)[to_rod]
+            disk_idx = (mask & -mask).bit_length() - 1
+            code -= (to_rod - from_rod) * self.powers[disk_idx]
+            moves.append(f"{from_rod + 1}->{to_rod + 1}")
+        moves.reverse()
+        return moves
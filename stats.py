@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Statistiques d'exécution des solveurs
+Mouvements générés, états développés, taille maximale de la frontière,
+taille de l'ensemble des états visités, durée et pic mémoire (tracemalloc)
+"""
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Union
+
+
+class SolverStats:
+    """
+    Compteurs remplis par les solveurs qui reçoivent un paramètre stats
+    
+    Les solveurs n'incrémentent que les compteurs qui les concernent ; la durée
+    et le pic mémoire sont mesurés par measure().
+    """
+    
+    def __init__(self, solver: str = ""):
+        self.solver = solver
+        self.moves_generated = 0
+        self.states_expanded = 0
+        self.peak_frontier = 0
+        self.visited = 0
+        self.wall_time = 0.0
+        self.peak_memory: Optional[int] = None
+    
+    @contextmanager
+    def measure(self, trace_memory: bool = False) -> Iterator["SolverStats"]:
+        """
+        Mesure la durée (et le pic mémoire) du bloc
+        
+        Args:
+            trace_memory: Mesurer le pic d'allocation avec tracemalloc (ralentit nettement le calcul)
+        """
+        started = False
+        if trace_memory:
+            if tracemalloc.is_tracing():
+                if hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+                    tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                started = True
+        
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.wall_time += time.perf_counter() - start
+            if trace_memory:
+                self.peak_memory = tracemalloc.get_traced_memory()[1]
+                if started:
+                    tracemalloc.stop()
+    
+    def to_dict(self) -> Dict[str, Union[str, int, float, None]]:
+        """Retourne les compteurs sous forme de dictionnaire"""
+        return {
+            "solver": self.solver,
+            "moves_generated": self.moves_generated,
+            "states_expanded": self.states_expanded,
+            "peak_frontier": self.peak_frontier,
+            "visited": self.visited,
+            "wall_time": self.wall_time,
+            "peak_memory": self.peak_memory,
+        }
+    
+    def to_json(self) -> str:
+        """Retourne les compteurs au format JSON"""
+        return json.dumps(self.to_dict(), indent=2)
+    
+    def format(self) -> str:
+        """Résumé lisible sur une ligne par compteur"""
+        lines = [f"Statistiques ({self.solver}):" if self.solver else "Statistiques:"]
+        lines.append(f"- Mouvements générés: {self.moves_generated}")
+        if self.states_expanded:
+            lines.append(f"- États développés: {self.states_expanded}")
+            lines.append(f"- Frontière maximale: {self.peak_frontier}")
+            lines.append(f"- États visités: {self.visited}")
+        lines.append(f"- Durée: {self.wall_time * 1000:.2f} ms")
+        if self.peak_memory is not None:
+            lines.append(f"- Pic mémoire: {self.peak_memory / 1024:.1f} Kio")
+        return "\n".join(lines)
+    
+    def summary(self) -> str:
+        """Résumé court sur une ligne (journal de l'interface)"""
+        parts = [f"{self.wall_time * 1000:.1f} ms"]
+        if self.states_expanded:
+            parts.append(f"{self.states_expanded} états développés")
+            parts.append(f"frontière max {self.peak_frontier}")
+        if self.moves_generated:
+            parts.append(f"{self.moves_generated} mouvements")
+        return ", ".join(parts)
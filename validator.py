@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Validation et notation de parties enregistrées
+Les mouvements "a->b" sont convertis en tableaux d'entiers ; les règles sont
+vérifiées sur des lots de parties à la fois (une opération NumPy par coup pour
+tout le lot), avec la distance à l'état final après chaque mouvement
+"""
+
+import sys
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from distance_table import MAX_TABLE_STATES, get_distance_table
+from solve import parse_input
+
+# Nombre maximal de parties d'un lot
+CHUNK_GAMES = 8192
+
+# Nombre maximal de coups (parties × longueur) d'un lot
+CHUNK_CELLS = 1 << 22
+
+# Les masques des bâtonnets tiennent dans un int64
+MAX_DISKS = 62
+
+Moves = Tuple[np.ndarray, np.ndarray]
+
+
+def parse_moves(moves: Sequence[str]) -> Moves:
+    """
+    Convertit des mouvements "source->destination" en tableaux d'entiers
+    
+    Returns:
+        Tableaux uint8 des bâtonnets de départ et d'arrivée (numérotés à partir de 1)
+    """
+    if not moves:
+        return np.empty(0, dtype=np.uint8), np.empty(0, dtype=np.uint8)
+    
+    # Cas courant (bâtonnets 1 à 9) : lecture directe des octets, 4 par mouvement
+    text = "".join(moves)
+    if len(text) == 4 * len(moves) and text.isascii():
+        raw = np.frombuffer(text.encode("ascii"), dtype=np.uint8).reshape(-1, 4)
+        sources = raw[:, 0] - ord("0")
+        destinations = raw[:, 3] - ord("0")
+        well_formed = (raw[:, 1] == ord("-")) & (raw[:, 2] == ord(">")) & (sources <= 9) & (destinations <= 9)
+        if well_formed.all():
+            return sources, destinations
+        bad = int(np.flatnonzero(~well_formed)[0])
+        raise ValueError(f"Mouvement {bad + 1} mal formé: {moves[bad]!r}")
+    
+    sources = np.empty(len(moves), dtype=np.uint8)
+    destinations = np.empty(len(moves), dtype=np.uint8)
+    for i, move in enumerate(moves):
+        try:
+            source, destination = move.split("->")
+            sources[i], destinations[i] = int(source), int(destination)
+        except (ValueError, OverflowError):
+            raise ValueError(f"Mouvement {i + 1} mal formé: {move!r}")
+    return sources, destinations
+
+
+def read_log(lines: Iterable[str]) -> Iterator[Moves]:
+    """
+    Lit un journal de parties : une partie par ligne, mouvements séparés par des espaces ou des virgules
+    
+    Les lignes vides et les commentaires (#) sont ignorés.
+    """
+    for line_number, line in enumerate(lines, 1):
+        line = line.split("#", 1)[0]
+        tokens = line.replace(",", " ").split()
+        if not tokens:
+            continue
+        try:
+            yield parse_moves(tokens)
+        except ValueError as e:
+            raise ValueError(f"ligne {line_number}: {e}")
+
+
+class GameReport:
+    """
+    Bilan d'une partie
+    
+    Attributes:
+        n_moves: Nombre de mouvements enregistrés
+        first_illegal: Indice (0-indexé) du premier mouvement interdit, None si tous sont légaux
+        initial_distance: Distance à l'état final au départ
+        distances: Distance à l'état final après chaque mouvement joué (jusqu'au premier interdit exclu)
+        wasted: Mouvements joués qui n'ont pas rapproché de l'état final
+    """
+    
+    def __init__(self, n_moves: int, first_illegal: Optional[int], initial_distance: int,
+                 distances: np.ndarray, wasted: int):
+        self.n_moves = n_moves
+        self.first_illegal = first_illegal
+        self.initial_distance = initial_distance
+        self.distances = distances
+        self.wasted = wasted
+    
+    @property
+    def legal(self) -> bool:
+        return self.first_illegal is None
+    
+    @property
+    def solved(self) -> bool:
+        """Partie légale qui se termine sur l'état final"""
+        final = self.distances[-1] if self.distances.size else self.initial_distance
+        return self.legal and final == 0
+    
+    @property
+    def optimal(self) -> bool:
+        return self.solved and self.wasted == 0
+    
+    def __repr__(self) -> str:
+        return (f"GameReport(n_moves={self.n_moves}, first_illegal={self.first_illegal}, "
+                f"wasted={self.wasted}, solved={self.solved})")
+
+
+class GameValidator:
+    """
+    Rejoue des parties de n_disks disques depuis le premier bâtonnet, vers goal_rod
+    (0-indexé, le dernier bâtonnet par défaut ; solve_hanoi vise le bâtonnet 3)
+    
+    L'état de chaque partie est un masque de bits par bâtonnet (bit d-1 : disque d),
+    comme StateSpace.rod_masks : le disque du dessus est mask & -mask. La distance
+    vient de la formule du plus grand disque mal placé à 3 bâtonnets, de la table
+    des distances au-delà.
+    """
+    
+    def __init__(self, n_disks: int, n_rods: int = 3, goal_rod: Optional[int] = None,
+                 chunk_games: int = CHUNK_GAMES):
+        if n_rods < 3:
+            raise ValueError("Il faut au moins 3 bâtonnets pour résoudre la Tour de Hanoï")
+        if not 1 <= n_disks <= MAX_DISKS:
+            raise ValueError(f"Le nombre de disques doit être entre 1 et {MAX_DISKS}")
+        self.n_disks = n_disks
+        self.n_rods = n_rods
+        self.goal_rod = n_rods - 1 if goal_rod is None else goal_rod
+        if not 0 <= self.goal_rod < n_rods:
+            raise ValueError(f"Bâtonnet d'arrivée invalide: {self.goal_rod + 1}")
+        self.chunk_games = chunk_games
+        
+        # À 3 bâtonnets, la formule directe évite de construire (et d'écrire) une table
+        self.table = None
+        if n_rods != 3:
+            if n_rods ** n_disks > MAX_TABLE_STATES:
+                raise ValueError(f"Distances indisponibles pour {n_disks} disques et {n_rods} bâtonnets "
+                                 f"(table limitée à {MAX_TABLE_STATES} états)")
+            self.table = np.asarray(get_distance_table(n_disks, n_rods, self.goal_rod).distances)
+        self.powers = n_rods ** np.arange(n_disks, dtype=np.int64)
+    
+    def validate(self, games: Sequence[Moves]) -> List[GameReport]:
+        """
+        Valide et note des parties
+        
+        Les parties sont triées par longueur puis traitées par lots de longueurs
+        voisines (au plus chunk_games parties et CHUNK_CELLS coups en tout).
+        
+        Args:
+            games: Parties sous forme (sources, destinations), voir parse_moves
+        
+        Returns:
+            Un bilan par partie, dans l'ordre de games
+        """
+        reports: List[Optional[GameReport]] = [None] * len(games)
+        order = sorted(range(len(games)), key=lambda i: games[i][0].size)
+        start = 0
+        while start < len(order):
+            stop = start + 1
+            while (stop < len(order) and stop - start < self.chunk_games
+                   and (stop - start + 1) * games[order[stop]][0].size <= CHUNK_CELLS):
+                stop += 1
+            batch = order[start:stop]
+            for index, report in zip(batch, self._validate_batch([games[i] for i in batch])):
+                reports[index] = report
+            start = stop
+        return reports
+    
+    def _replay_one(self, sources: np.ndarray, destinations: np.ndarray) -> Tuple[np.ndarray, int]:
+        """
+        Rejoue une partie seule avec des entiers Python (plus rapide qu'un lot d'une partie)
+        
+        Returns:
+            Disque déplacé (0-indexé) à chaque coup joué, et indice du premier coup interdit (-1 sinon)
+        """
+        n_rods = self.n_rods
+        masks = [0] * n_rods
+        masks[0] = (1 << self.n_disks) - 1
+        disks = []
+        for step, (source, destination) in enumerate(zip(sources.tolist(), destinations.tolist())):
+            source -= 1
+            destination -= 1
+            if not (0 <= source < n_rods and 0 <= destination < n_rods) or source == destination:
+                return np.array(disks, dtype=np.int64), step
+            source_mask = masks[source]
+            destination_mask = masks[destination]
+            top = source_mask & -source_mask
+            if not source_mask or (destination_mask and destination_mask & -destination_mask < top):
+                return np.array(disks, dtype=np.int64), step
+            masks[source] = source_mask ^ top
+            masks[destination] = destination_mask | top
+            disks.append(top.bit_length() - 1)
+        return np.array(disks, dtype=np.int64), -1
+    
+    def _replay_batch(self, sources: np.ndarray, destinations: np.ndarray,
+                      lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rejoue un lot de parties, un coup de toutes les parties à la fois
+        
+        Returns:
+            Disque déplacé à chaque coup (-1 si le coup n'est pas joué) et indice
+            du premier coup interdit de chaque partie (-1 sinon)
+        """
+        n_games, n_steps = sources.shape
+        rows = np.arange(n_games)
+        masks = np.zeros((n_games, self.n_rods), dtype=np.int64)
+        masks[:, 0] = (1 << self.n_disks) - 1
+        disks = np.full((n_games, n_steps), -1, dtype=np.int64)
+        first_illegal = np.full(n_games, -1, dtype=np.int64)
+        alive = np.ones(n_games, dtype=bool)
+        
+        for step in range(n_steps):
+            active = alive & (step < lengths)
+            if not active.any():
+                break
+            source = sources[:, step] - 1
+            destination = destinations[:, step] - 1
+            in_range = (source >= 0) & (source < self.n_rods) & (destination >= 0) & (destination < self.n_rods)
+            source = np.where(in_range, source, 0)
+            destination = np.where(in_range, destination, 0)
+            
+            source_mask = masks[rows, source]
+            destination_mask = masks[rows, destination]
+            top = source_mask & -source_mask
+            destination_top = destination_mask & -destination_mask
+            legal = (in_range & (source != destination) & (source_mask != 0)
+                     & ((destination_mask == 0) | (top < destination_top)))
+            
+            illegal = active & ~legal
+            first_illegal[illegal] = step
+            alive &= ~illegal
+            played = np.flatnonzero(active & legal)
+            
+            # Déplacer le disque du dessus (bit isolé : log2 exact)
+            top = top[played]
+            masks[played, source[played]] ^= top
+            masks[played, destination[played]] |= top
+            disks[played, step] = np.log2(top.astype(np.float64)).astype(np.int64)
+        
+        return disks, first_illegal
+    
+    def _trajectory_distances(self, disks: np.ndarray, sources: np.ndarray,
+                              destinations: np.ndarray) -> np.ndarray:
+        """
+        Distance à l'état final après chaque coup joué, calculée pour tout le lot à la fois
+        
+        Args:
+            disks: Disque déplacé à chaque coup (-1 si le coup n'est pas joué)
+            sources: Bâtonnets de départ (numérotés à partir de 1)
+            destinations: Bâtonnets d'arrivée
+        """
+        played = disks >= 0
+        destinations = destinations - 1
+        if self.table is not None:
+            # Le code d'état change de (arrivée - départ) * n_rods^disque à chaque coup
+            delta = np.where(played, (destinations - (sources - 1)) * self.powers[np.maximum(disks, 0)], 0)
+            return self.table[np.cumsum(delta, axis=1)].astype(np.int64)
+        
+        # 3 bâtonnets : du plus grand au plus petit disque, chaque disque mal placé
+        # coûte 2^(d-1) et fixe la cible des plus petits sur le troisième bâtonnet.
+        # La position d'un disque est l'arrivée de son dernier déplacement.
+        steps = np.arange(disks.shape[1])
+        distances = np.zeros(disks.shape, dtype=np.int64)
+        target = np.full(disks.shape, self.goal_rod, dtype=np.int64)
+        for disk in range(self.n_disks - 1, -1, -1):
+            last = np.maximum.accumulate(np.where(disks == disk, steps, -1), axis=1)
+            rod = np.where(last >= 0, np.take_along_axis(destinations, np.maximum(last, 0), axis=1), 0)
+            mismatch = rod != target
+            distances += mismatch.astype(np.int64) << disk
+            target = np.where(mismatch, 3 - rod - target, target)
+        return distances
+    
+    def _validate_batch(self, games: List[Moves]) -> List[GameReport]:
+        n_games = len(games)
+        lengths = np.array([sources.size for sources, _ in games], dtype=np.int64)
+        n_steps = int(lengths.max())
+        
+        # Mouvements complétés par des zéros (bâtonnet invalide) au-delà de la fin de chaque partie
+        sources = np.zeros((n_games, n_steps), dtype=np.int64)
+        destinations = np.zeros((n_games, n_steps), dtype=np.int64)
+        for row, (game_sources, game_destinations) in enumerate(games):
+            sources[row, :game_sources.size] = game_sources
+            destinations[row, :game_destinations.size] = game_destinations
+        
+        if n_games == 1:
+            played_disks, illegal_at = self._replay_one(games[0][0], games[0][1])
+            disks = np.full((1, n_steps), -1, dtype=np.int64)
+            disks[0, :played_disks.size] = played_disks
+            first_illegal = np.array([illegal_at])
+        else:
+            disks, first_illegal = self._replay_batch(sources, destinations, lengths)
+        
+        initial = int(self._initial_distance())
+        distances = self._trajectory_distances(disks, sources, destinations)
+        previous = np.concatenate([np.full((n_games, 1), initial, dtype=np.int64), distances[:, :-1]], axis=1)
+        wasted = ((disks >= 0) & (distances >= previous)).sum(axis=1)
+        
+        reports = []
+        for row in range(n_games):
+            illegal_at = int(first_illegal[row]) if first_illegal[row] >= 0 else None
+            played = illegal_at if illegal_at is not None else int(lengths[row])
+            reports.append(GameReport(int(lengths[row]), illegal_at, initial,
+                                      distances[row, :played].copy(), int(wasted[row])))
+        return reports
+    
+    def _initial_distance(self) -> int:
+        """Distance de l'état de départ (tous les disques sur le premier bâtonnet)"""
+        no_move = np.full((1, 1), -1, dtype=np.int64)
+        return int(self._trajectory_distances(no_move, np.ones_like(no_move), np.ones_like(no_move))[0, 0])
+
+
+def validate_moves(moves: Sequence[str], n_disks: int, n_rods: int = 3,
+                   goal_rod: Optional[int] = None) -> GameReport:
+    """Valide et note une seule partie donnée sous forme de mouvements "a->b" (voir GameValidator)"""
+    return GameValidator(n_disks, n_rods, goal_rod).validate([parse_moves(moves)])[0]
+
+
+def main():
+    """
+    Valide un journal de parties en ligne de commande
+    """
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python validator.py 'n_disks,n_rods' journal.txt [bâtonnet d'arrivée]")
+        print("Le journal contient une partie par ligne (mouvements a->b séparés par des espaces) ;")
+        print("le bâtonnet d'arrivée est le dernier par défaut")
+        sys.exit(1)
+    
+    try:
+        n_disks, n_rods = parse_input(sys.argv[1])
+        goal_rod = int(sys.argv[3]) - 1 if len(sys.argv) == 4 else None
+        if sys.argv[2] == "-":
+            games = list(read_log(sys.stdin))
+        else:
+            with open(sys.argv[2], encoding="utf-8") as f:
+                games = list(read_log(f))
+        
+        reports = GameValidator(n_disks, n_rods, goal_rod).validate(games)
+        for number, report in enumerate(reports, 1):
+            if not report.legal:
+                sources, destinations = games[number - 1]
+                move = f"{sources[report.first_illegal]}->{destinations[report.first_illegal]}"
+                print(f"Partie {number}: mouvement {report.first_illegal + 1} interdit ({move})")
+            else:
+                final = int(report.distances[-1]) if report.distances.size else report.initial_distance
+                status = "optimale" if report.optimal else ("résolue" if report.solved else f"à {final} du but")
+                print(f"Partie {number}: {report.n_moves} mouvements, {report.wasted} inutiles ({status})")
+        
+        n_illegal = sum(not report.legal for report in reports)
+        print(f"\n{len(reports)} parties, {n_illegal} avec un mouvement interdit, "
+              f"{sum(report.solved for report in reports)} résolues, "
+              f"{sum(report.optimal for report in reports)} optimales")
+        if n_illegal:
+            sys.exit(2)
+    
+    except (ValueError, OSError) as e:
+        print(f"Erreur: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()